@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Runs the pipeline benchmarks and writes the results as JSON.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --benchmark voice_agent --compare results.json
+
+When comparing with previous results (e.g. from the previous release), the
+exit status is 1 if any metric got worse by more than `--threshold`.
+
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+from loguru import logger
+
+from benchmarks.pipelines import BENCHMARKS, BenchmarkParams
+
+HIGHER_IS_BETTER = {"frames_per_second", "max_sessions_per_core", "realtime_factor"}
+LOWER_IS_BETTER = {"latency_p50_ms", "latency_p90_ms", "latency_p99_ms", "memory_per_session_kb"}
+
+
+def pipecat_version() -> str:
+    try:
+        return version("pipecat-ai")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+async def run_benchmarks(names, params: BenchmarkParams) -> dict:
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        result = asdict(await BENCHMARKS[name](params))
+        result.update(result.pop("extra"))
+        results[name] = result
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Prints the change of every metric and returns whether any of them
+    regressed more than `threshold`.
+
+    """
+    regressed = False
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            if not old or value is None or metric not in HIGHER_IS_BETTER | LOWER_IS_BETTER:
+                continue
+            change = (value - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            mark = "REGRESSION" if worse > threshold else ""
+            regressed = regressed or worse > threshold
+            print(f"{name:<24} {metric:<24} {old:>12.3f} {value:>12.3f} {change:>+8.1%} {mark}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline throughput and latency benchmarks")
+    parser.add_argument("--benchmark", action="append", choices=BENCHMARKS.keys())
+    parser.add_argument("--frames", type=int, default=BenchmarkParams.frames)
+    parser.add_argument("--duration", type=float, default=BenchmarkParams.duration)
+    parser.add_argument("--sessions", type=int, default=BenchmarkParams.sessions)
+    parser.add_argument("--output", help="JSON file to write results to (default: stdout)")
+    parser.add_argument("--compare", help="JSON file with previous results")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    # Logging would be most of what we measure.
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    params = BenchmarkParams(frames=args.frames, duration=args.duration, sessions=args.sessions)
+    results = {
+        "pipecat_version": pipecat_version(),
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "params": asdict(params),
+        "benchmarks": asyncio.run(run_benchmarks(args.benchmark or BENCHMARKS.keys(), params)),
+    }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results["benchmarks"], baseline["benchmarks"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Frame allocation microbenchmark.
+
+Measures how many frames per second can be created and how much memory each
+frame uses, for the current (slotted, lazily named) frames and for a replica of
+the previous frame layout (regular dataclasses with an eagerly formatted name).
+
+    python benchmarks/frame_allocation.py
+
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from pipecat.frames.frames import (
+    BotSpeakingFrame,
+    InputAudioRawFrame,
+    TextFrame,
+    TTSAudioRawFrame,
+)
+from pipecat.utils.utils import obj_count, obj_id
+
+#
+# Replica of the previous frame layout.
+#
+
+
+@dataclass
+class LegacyFrame:
+    id: int = field(init=False)
+    name: str = field(init=False)
+    pts: Optional[int] = field(init=False)
+
+    def __post_init__(self):
+        self.id: int = obj_id()
+        self.name: str = f"{self.__class__.__name__}#{obj_count(self)}"
+        self.pts: Optional[int] = None
+
+
+@dataclass
+class LegacySystemFrame(LegacyFrame):
+    pass
+
+
+@dataclass
+class LegacyDataFrame(LegacyFrame):
+    pass
+
+
+@dataclass
+class LegacyAudioRawFrame:
+    audio: bytes
+    sample_rate: int
+    num_channels: int
+    num_frames: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+
+
+@dataclass
+class LegacyInputAudioRawFrame(LegacySystemFrame, LegacyAudioRawFrame):
+    def __post_init__(self):
+        super().__post_init__()
+        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+
+
+@dataclass
+class LegacyOutputAudioRawFrame(LegacyDataFrame, LegacyAudioRawFrame):
+    def __post_init__(self):
+        super().__post_init__()
+        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+
+
+@dataclass
+class LegacyTTSAudioRawFrame(LegacyOutputAudioRawFrame):
+    pass
+
+
+@dataclass
+class LegacyBotSpeakingFrame(LegacySystemFrame):
+    pass
+
+
+@dataclass
+class LegacyTextFrame(LegacyDataFrame):
+    text: str
+
+
+#
+# Benchmark
+#
+
+AUDIO_20MS = b"\x00" * 640
+
+
+def frames_per_second(factory: Callable, iterations: int) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        factory()
+    return iterations / (time.perf_counter() - start)
+
+
+def bytes_per_frame(factory: Callable, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+    frames = [factory() for _ in range(count)]
+    diff = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in diff)
+    # The list holding the frames is not part of the frame size.
+    size -= frames.__sizeof__()
+    return size / count
+
+
+CASES = {
+    "InputAudioRawFrame": (
+        lambda: LegacyInputAudioRawFrame(audio=AUDIO_20MS, sample_rate=16000, num_channels=1),
+        lambda: InputAudioRawFrame(audio=AUDIO_20MS, sample_rate=16000, num_channels=1),
+    ),
+    "TTSAudioRawFrame": (
+        lambda: LegacyTTSAudioRawFrame(audio=AUDIO_20MS, sample_rate=16000, num_channels=1),
+        lambda: TTSAudioRawFrame(audio=AUDIO_20MS, sample_rate=16000, num_channels=1),
+    ),
+    "BotSpeakingFrame": (LegacyBotSpeakingFrame, BotSpeakingFrame),
+    "TextFrame": (lambda: LegacyTextFrame(text="token"), lambda: TextFrame(text="token")),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame allocation microbenchmark")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--memory-frames", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'frame':<20} {'before (frames/s)':>18} {'after (frames/s)':>18} {'speedup':>8}", end=""
+    )
+    print(f" {'before (B/frame)':>17} {'after (B/frame)':>16}")
+    for name, (legacy, current) in CASES.items():
+        legacy_fps = frames_per_second(legacy, args.iterations)
+        current_fps = frames_per_second(current, args.iterations)
+        legacy_size = bytes_per_frame(legacy, args.memory_frames)
+        current_size = bytes_per_frame(current, args.memory_frames)
+        print(
+            f"{name:<20} {legacy_fps:>18,.0f} {current_fps:>18,.0f} "
+            f"{current_fps / legacy_fps:>7.2f}x {legacy_size:>17.1f} {current_size:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
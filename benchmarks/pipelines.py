@@ -0,0 +1,271 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Pipeline throughput and latency benchmarks.
+
+Every benchmark builds representative pipelines out of the stand-ins in
+`benchmarks.stand_ins` and reports:
+
+- frames_per_second: frames pushed into the pipeline per (wall clock) second.
+- latency_*_ms: time it takes frames to traverse the whole pipeline.
+- memory_per_session_kb: memory allocated by each running session.
+- max_sessions_per_core: how many real-time sessions a single core can run,
+  estimated from the CPU time needed to run a session. Only for pipelines
+  that run in real time.
+
+"""
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.stand_ins import (
+    FakeInputTransport,
+    FakeLLMService,
+    FakeOutputTransport,
+    FakeSTTService,
+    FakeTTSService,
+    LatencyCollector,
+    LatencyProbe,
+    PassthroughProcessor,
+)
+from pipecat.clocks.virtual_clock import VirtualClock
+from pipecat.frames.frames import EndFrame, TextFrame
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.sync_parallel_pipeline import SyncParallelPipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.aggregators.llm_response import LLMUserResponseAggregator
+from pipecat.processors.aggregators.sentence import SentenceAggregator
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.transports.base_transport import TransportParams
+
+
+@dataclass
+class BenchmarkParams:
+    # Frames pushed by each session of the text benchmarks.
+    frames: int = 20_000
+    # Seconds of conversation of each session of the voice benchmarks.
+    duration: float = 60.0
+    # Sessions running concurrently.
+    sessions: int = 10
+
+
+@dataclass
+class BenchmarkResult:
+    frames_per_second: float
+    latency_p50_ms: Optional[float] = None
+    latency_p90_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    latency_max_ms: Optional[float] = None
+    memory_per_session_kb: Optional[float] = None
+    max_sessions_per_core: Optional[float] = None
+    extra: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Session:
+    task: PipelineTask
+    probe: LatencyProbe
+
+
+#
+# Sessions
+#
+
+
+def _text_session(processors: List[FrameProcessor]) -> Session:
+    probe = LatencyProbe()
+    task = PipelineTask(Pipeline(processors + [LatencyCollector(probe)]))
+    return Session(task=task, probe=probe)
+
+
+def frame_processor_session() -> Session:
+    return _text_session([PassthroughProcessor() for _ in range(10)])
+
+
+def sentence_aggregator_session() -> Session:
+    return _text_session([PassthroughProcessor(), SentenceAggregator()])
+
+
+def parallel_pipeline_session() -> Session:
+    return _text_session(
+        [
+            ParallelPipeline(
+                [PassthroughProcessor() for _ in range(3)],
+                [PassthroughProcessor() for _ in range(3)],
+            )
+        ]
+    )
+
+
+def sync_parallel_pipeline_session() -> Session:
+    return _text_session(
+        [
+            SyncParallelPipeline(
+                [PassthroughProcessor() for _ in range(3)],
+                [PassthroughProcessor() for _ in range(3)],
+            )
+        ]
+    )
+
+
+def voice_agent_session(params: BenchmarkParams, clock: VirtualClock) -> Session:
+    probe = LatencyProbe()
+    transport_params = TransportParams(audio_in_enabled=True, audio_out_enabled=True)
+    pipeline = Pipeline(
+        [
+            FakeInputTransport(transport_params, probe=probe, duration=params.duration),
+            FakeSTTService(audio_passthrough=True),
+            LLMUserResponseAggregator(messages=[]),
+            FakeLLMService(),
+            FakeTTSService(),
+            FakeOutputTransport(transport_params),
+            LatencyCollector(probe),
+        ]
+    )
+    return Session(task=PipelineTask(pipeline, clock=clock), probe=probe)
+
+
+#
+# Measurements
+#
+
+
+def _percentile(sorted_values: List[int], percentile: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))
+    return sorted_values[index] / 1_000_000
+
+
+SENTENCE = "This is a sentence. "
+
+
+async def _push_all(session: Session, num_frames: int):
+    """Queues all the frames at once, to measure throughput."""
+    frames = []
+    for _ in range(num_frames):
+        frame = TextFrame(SENTENCE)
+        session.probe.stamp(frame)
+        frames.append(frame)
+    await session.task.queue_frames(frames + [EndFrame()])
+    await session.task.run()
+
+
+async def _push_one_by_one(session: Session, num_frames: int):
+    """Queues a frame only after the previous one has gone through the
+    pipeline, to measure latency without any queueing.
+
+    """
+
+    async def push_frames():
+        for _ in range(num_frames):
+            session.probe.arrival.clear()
+            start = time.perf_counter_ns()
+            await session.task.queue_frame(TextFrame(SENTENCE))
+            await session.probe.arrival.wait()
+            session.probe.latencies.append(time.perf_counter_ns() - start)
+        await session.task.queue_frame(EndFrame())
+
+    await asyncio.gather(session.task.run(), push_frames())
+
+
+async def _run_sessions(sessions: List[Session], run: Callable[[Session], Awaitable[None]]):
+    await asyncio.gather(*[run(s) for s in sessions])
+
+
+def _latency_result(result: BenchmarkResult, sessions: List[Session]):
+    latencies = sorted(latency for s in sessions for latency in s.probe.latencies)
+    if latencies:
+        result.latency_p50_ms = _percentile(latencies, 50)
+        result.latency_p90_ms = _percentile(latencies, 90)
+        result.latency_p99_ms = _percentile(latencies, 99)
+        result.latency_max_ms = latencies[-1] / 1_000_000
+
+
+async def _measure_memory(
+    create_session: Callable[[], Session],
+    num_sessions: int,
+    run: Callable[[Session], Awaitable[None]],
+) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        await _run_sessions([create_session() for _ in range(num_sessions)], run)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak - start) / num_sessions / 1024
+
+
+async def run_text_benchmark(
+    params: BenchmarkParams, create_session: Callable[[], Session]
+) -> BenchmarkResult:
+    sessions = [create_session() for _ in range(params.sessions)]
+    gc.collect()
+    start = time.perf_counter()
+    await _run_sessions(sessions, lambda s: _push_all(s, params.frames))
+    elapsed = time.perf_counter() - start
+    result = BenchmarkResult(
+        frames_per_second=sum(s.probe.input_frames for s in sessions) / elapsed
+    )
+
+    sessions = [create_session() for _ in range(params.sessions)]
+    await _run_sessions(sessions, lambda s: _push_one_by_one(s, params.frames // 10))
+    _latency_result(result, sessions)
+
+    # Memory is measured in a separate (and smaller) run because tracing
+    # allocations slows everything down.
+    result.memory_per_session_kb = await _measure_memory(
+        create_session, params.sessions, lambda s: _push_one_by_one(s, params.frames // 100)
+    )
+    return result
+
+
+async def run_voice_agent_benchmark(params: BenchmarkParams) -> BenchmarkResult:
+    # Sessions run on a virtual clock, so they only take the time the
+    # framework needs to process the conversation.
+    clock = VirtualClock()
+    sessions = [voice_agent_session(params, clock) for _ in range(params.sessions)]
+    gc.collect()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    await _run_sessions(sessions, lambda s: s.task.run())
+    cpu_time = time.process_time() - cpu_start
+    elapsed = time.perf_counter() - start
+
+    result = BenchmarkResult(
+        frames_per_second=sum(s.probe.input_frames for s in sessions) / elapsed,
+        max_sessions_per_core=params.duration / (cpu_time / params.sessions),
+    )
+    _latency_result(result, sessions)
+    result.extra["realtime_factor"] = params.duration * params.sessions / elapsed
+    result.extra["output_frames_per_session"] = (
+        sum(s.probe.output_frames for s in sessions) / params.sessions
+    )
+
+    memory_params = BenchmarkParams(duration=params.duration / 4)
+    memory_clock = VirtualClock()
+    result.memory_per_session_kb = await _measure_memory(
+        lambda: voice_agent_session(memory_params, memory_clock),
+        params.sessions,
+        lambda s: s.task.run(),
+    )
+    return result
+
+
+BENCHMARKS = {
+    "frame_processor": lambda params: run_text_benchmark(params, frame_processor_session),
+    "sentence_aggregator": lambda params: run_text_benchmark(params, sentence_aggregator_session),
+    "parallel_pipeline": lambda params: run_text_benchmark(params, parallel_pipeline_session),
+    "sync_parallel_pipeline": lambda params: run_text_benchmark(
+        params, sync_parallel_pipeline_session
+    ),
+    "voice_agent": run_voice_agent_benchmark,
+}
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Sentence segmentation microbenchmark.
+
+Measures the cost per LLM token of finding the end of sentences, for sentences
+of increasing length, with the previous approach (appending each token to a
+string and calling `match_endofsentence()` on all of it) and with
+`SentenceSegmenter`. The cost of the segmenter should not depend on the
+sentence length.
+
+    python benchmarks/sentence_segmentation.py
+
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from pipecat.utils.string import SentenceSegmenter, match_endofsentence
+
+# A run-on sentence, with things that look like sentence ends but aren't.
+WORDS = "so Mr. Smith said that at 3:00 a. on the 4. of July, the U.S.A. team and Prof. Jones"
+
+
+def tokens(sentence_length: int) -> List[str]:
+    """Tokens (of about 4 characters, like LLM tokens) of a sentence of
+    `sentence_length` characters, ending with a period.
+
+    """
+    text = (WORDS + ", ") * (sentence_length // (len(WORDS) + 2) + 1)
+    text = text[: max(0, sentence_length - 5)] + " end."
+    return [text[i : i + 4] for i in range(0, len(text), 4)]
+
+
+def legacy(sentence: List[str]) -> int:
+    sentences = 0
+    current = ""
+    for token in sentence:
+        current += token
+        end = match_endofsentence(current)
+        if end:
+            current = current[end:]
+            sentences += 1
+    return sentences
+
+
+def segmenter(sentence: List[str]) -> int:
+    sentences = 0
+    segmenter = SentenceSegmenter()
+    for token in sentence:
+        end = segmenter.append(token)
+        if end:
+            segmenter.pop(end)
+            sentences += 1
+    return sentences
+
+
+def microseconds_per_token(segment: Callable[[List[str]], int], sentence: List[str]) -> float:
+    # At least ~0.2s of work, so short sentences are measured precisely.
+    iterations = max(1, 50_000 // len(sentence))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            assert segment(sentence) == 1
+        best = min(best, (time.perf_counter() - start) / (iterations * len(sentence)))
+    return best * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentence segmentation microbenchmark")
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[100, 1_000, 5_000], metavar="CHARS"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'sentence (chars)':>16} {'before (us/token)':>18} {'after (us/token)':>17} {'speedup':>8}"
+    )
+    for length in args.lengths:
+        sentence = tokens(length)
+        before = microseconds_per_token(legacy, sentence)
+        after = microseconds_per_token(segmenter, sentence)
+        print(f"{length:>16,} {before:>18.2f} {after:>17.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
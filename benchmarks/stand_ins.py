@@ -0,0 +1,242 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Local stand-ins for transports and AI services.
+
+They don't do any real work, but they produce and consume frames at realistic
+rates through the regular base classes (`BaseInputTransport`, `STTService`,
+`LLMService`, `TTSService` and `BaseOutputTransport`). All the waiting is done
+on the pipeline clock, so with a `VirtualClock` a pipeline built with these
+stand-ins only spends the CPU time the framework itself needs.
+
+"""
+
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, List
+
+from pipecat.frames.frames import (
+    EndTaskFrame,
+    Frame,
+    InputAudioRawFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMMessagesFrame,
+    StartFrame,
+    TextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import LLMService, STTService, TTSService
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+from pipecat.transcriptions.language import Language
+from pipecat.utils.time import time_now_iso8601
+
+LLM_RESPONSE = (
+    "Sure, I can help you with that. The order was shipped yesterday and it should "
+    "arrive by Friday. Is there anything else you would like to know about it?"
+)
+
+
+class LatencyProbe:
+    """Measures how long frames take to traverse a pipeline.
+
+    Producers stamp the frames they create and a `LatencyCollector` at the end
+    of the pipeline records the elapsed (wall clock) time of every stamped
+    frame that reaches it. `arrival` is set every time a frame reaches the
+    collector.
+
+    """
+
+    def __init__(self):
+        self._created: Dict[int, int] = {}
+        self.latencies: List[int] = []
+        self.input_frames = 0
+        self.output_frames = 0
+        self.arrival = asyncio.Event()
+
+    def stamp(self, frame: Frame):
+        self.input_frames += 1
+        self._created[frame.id] = time.perf_counter_ns()
+
+    def arrived(self, frame: Frame):
+        self.output_frames += 1
+        self.arrival.set()
+        created = self._created.pop(frame.id, None)
+        if created is not None:
+            self.latencies.append(time.perf_counter_ns() - created)
+
+
+class LatencyCollector(FrameProcessor):
+    def __init__(self, probe: LatencyProbe, **kwargs):
+        super().__init__(**kwargs)
+        self._probe = probe
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM:
+            self._probe.arrived(frame)
+        await self.push_frame(frame, direction)
+
+
+class PassthroughProcessor(FrameProcessor):
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class FakeInputTransport(BaseInputTransport):
+    """Pushes `duration` seconds of silence in 20ms frames, paced by the
+    pipeline clock, and then asks the pipeline task to end.
+
+    """
+
+    def __init__(self, params: TransportParams, *, probe: LatencyProbe, duration: float, **kwargs):
+        super().__init__(params, **kwargs)
+        self._probe = probe
+        self._duration = duration
+        self._feeder_task = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        self._feeder_task = self.get_event_loop().create_task(self._feeder_task_handler())
+
+    async def stop(self, frame):
+        await self._cancel_feeder_task()
+        await super().stop(frame)
+
+    async def cancel(self, frame):
+        await self._cancel_feeder_task()
+        await super().cancel(frame)
+
+    async def _cancel_feeder_task(self):
+        if self._feeder_task:
+            self._feeder_task.cancel()
+            try:
+                await self._feeder_task
+            except asyncio.CancelledError:
+                pass
+            self._feeder_task = None
+
+    async def _feeder_task_handler(self):
+        sample_rate = self._params.audio_in_sample_rate
+        num_channels = self._params.audio_in_channels
+        audio = b"\x00" * (sample_rate // 50 * num_channels * 2)
+        for _ in range(int(self._duration * 50)):
+            frame = InputAudioRawFrame(
+                audio=audio, sample_rate=sample_rate, num_channels=num_channels
+            )
+            self._probe.stamp(frame)
+            await self.push_audio_frame(frame)
+            await self.get_clock().sleep(0.02)
+        await self.push_frame(EndTaskFrame(), FrameDirection.UPSTREAM)
+
+
+class FakeOutputTransport(BaseOutputTransport):
+    """Writing audio takes as long as playing it, like a real device."""
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        bytes_per_second = self._params.audio_out_sample_rate * self._params.audio_out_channels * 2
+        await self.get_clock().sleep(len(frames) / bytes_per_second)
+
+
+class FakeSTTService(STTService):
+    """Transcribes an utterance every `utterance_duration` seconds of audio.
+    Since there's no VAD, it also tells when the user starts and stops
+    speaking.
+
+    """
+
+    def __init__(self, *, utterance_duration: float = 4.0, sample_rate: int = 16000, **kwargs):
+        super().__init__(**kwargs)
+        self._utterance_bytes = int(utterance_duration * sample_rate) * 2
+        self._received_bytes = 0
+
+    async def set_model(self, model: str):
+        await super().set_model(model)
+
+    async def set_language(self, language: Language):
+        pass
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        self._received_bytes += len(audio)
+        if self._received_bytes >= self._utterance_bytes:
+            self._received_bytes = 0
+            yield UserStartedSpeakingFrame()
+            yield TranscriptionFrame("What's the status of my order?", "user", time_now_iso8601())
+            yield UserStoppedSpeakingFrame()
+
+
+class FakeLLMService(LLMService):
+    """Answers every `LLMMessagesFrame` by streaming a response word by word."""
+
+    def __init__(self, *, ttfb: float = 0.3, tokens_per_second: float = 50.0, **kwargs):
+        super().__init__(**kwargs)
+        self._ttfb = ttfb
+        self._token_interval = 1 / tokens_per_second
+        self._tokens = [f"{word} " for word in LLM_RESPONSE.split()]
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMMessagesFrame):
+            await self._generate()
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _generate(self):
+        await self.push_frame(LLMFullResponseStartFrame())
+        await self.get_clock().sleep(self._ttfb)
+        for token in self._tokens:
+            await self.push_frame(TextFrame(token))
+            await self.get_clock().sleep(self._token_interval)
+        await self.push_frame(LLMFullResponseEndFrame())
+
+
+class FakeTTSService(TTSService):
+    """Synthesizes `chars_per_second` characters per second of audio, in 40ms
+    chunks and `speed` times faster than real time.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        ttfb: float = 0.2,
+        chars_per_second: float = 15.0,
+        speed: float = 4.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._ttfb = ttfb
+        self._chars_per_second = chars_per_second
+        self._speed = speed
+
+    async def set_model(self, model: str):
+        await super().set_model(model)
+
+    def set_voice(self, voice: str):
+        super().set_voice(voice)
+
+    async def flush_audio(self):
+        pass
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await self.get_clock().sleep(self._ttfb)
+        yield TTSStartedFrame()
+        chunk = b"\x00" * (self.sample_rate // 25 * 2)
+        num_chunks = max(1, int(len(text) / self._chars_per_second * 25))
+        for _ in range(num_chunks):
+            yield TTSAudioRawFrame(audio=chunk, sample_rate=self.sample_rate, num_channels=1)
+            await self.get_clock().sleep(0.04 / self._speed)
+        yield TTSStoppedFrame()
@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from typing import Iterator
+
+
+class AudioChunker:
+    """Splits a stream of audio into chunks of `chunk_size` bytes. Each byte of
+    audio is copied once, into the chunk it belongs to, so the cost is linear
+    with the length of the audio no matter how big the incoming buffers are.
+    Audio that doesn't fill a whole chunk is kept until more audio arrives or
+    until `flush()` is called.
+
+    """
+
+    def __init__(self, chunk_size: int):
+        self._chunk_size = chunk_size
+        self._pending = bytearray()
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def chunks(self, audio: bytes) -> Iterator[bytes]:
+        """Adds `audio` to the stream and yields all the complete chunks."""
+        chunk_size = self._chunk_size
+        with memoryview(audio) as view:
+            offset = 0
+
+            # Complete the chunk we have pending, if any.
+            if self._pending:
+                offset = min(len(view), chunk_size - len(self._pending))
+                self._pending += view[:offset]
+                if len(self._pending) < chunk_size:
+                    return
+                chunk = bytes(self._pending)
+                self._pending.clear()
+                yield chunk
+
+            end = offset + (len(view) - offset) // chunk_size * chunk_size
+            for start in range(offset, end, chunk_size):
+                yield bytes(view[start : start + chunk_size])
+
+            self._pending += view[end:]
+
+    def flush(self, pad: bool = True) -> bytes:
+        """Returns the pending audio (padded with silence to a whole chunk if
+        `pad` is set) and starts a new stream.
+
+        """
+        if not self._pending:
+            return b""
+        if pad:
+            self._pending.extend(bytes(self._chunk_size - len(self._pending)))
+        chunk = bytes(self._pending)
+        self._pending.clear()
+        return chunk
+
+    def clear(self):
+        """Discards the pending audio."""
+        self._pending.clear()
@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import numpy as np
+
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
+
+
+class AGCFilter(SyncAudioFilter):
+    """Automatic gain control. Brings the level of the audio towards
+    `target_db` (RMS, in dBFS) with a gain of at most `max_gain_db`. Chunks
+    quieter than `gate_db` are considered silence and don't change the gain,
+    so background noise is not amplified between utterances.
+
+    The gain goes down quickly (`attack_secs`) and up slowly (`release_secs`),
+    and it's ramped linearly within each chunk to avoid clicks.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        target_db: float = -20.0,
+        max_gain_db: float = 20.0,
+        gate_db: float = -50.0,
+        attack_secs: float = 0.02,
+        release_secs: float = 0.5,
+    ):
+        super().__init__()
+        self._target_db = target_db
+        self._max_gain_db = max_gain_db
+        self._gate_db = gate_db
+        self._attack_secs = attack_secs
+        self._release_secs = release_secs
+        self._gain = 1.0
+        self._ramp = np.zeros(0, dtype=np.float32)
+        self._gains = np.zeros(0, dtype=np.float32)
+
+    @property
+    def gain(self) -> float:
+        return self._gain
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        count = len(samples)
+        if count == 0:
+            return samples
+
+        mean_square = float(np.dot(samples, samples)) / count
+        level_db = 10 * np.log10(mean_square / (32768.0 * 32768.0) + 1e-12)
+
+        gain = self._gain
+        if level_db > self._gate_db:
+            desired_db = min(self._target_db - level_db, self._max_gain_db)
+            desired = 10 ** (desired_db / 20)
+            time_constant = self._attack_secs if desired < gain else self._release_secs
+            alpha = 1 - np.exp(-count / (self._sample_rate * time_constant))
+            gain += alpha * (desired - gain)
+
+        if len(self._ramp) != count:
+            self._ramp = np.arange(1, count + 1, dtype=np.float32) / count
+            self._gains = np.zeros(count, dtype=np.float32)
+
+        # Gains from the previous chunk gain to the new one.
+        np.multiply(self._ramp, gain - self._gain, out=self._gains)
+        np.add(self._gains, self._gain, out=self._gains)
+        np.multiply(samples, self._gains, out=samples)
+
+        self._gain = gain
+        return samples
@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+from loguru import logger
+
+from pipecat.audio.filters.base_audio_filter import BaseAudioFilter
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
+from pipecat.frames.frames import FilterControlFrame, FilterEnableFrame
+
+
+@dataclass
+class AudioFilterStats:
+    """Processing time of one of the filters of an `AudioFilterChain`."""
+
+    name: str
+    chunks: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.chunks if self.chunks else 0.0
+
+
+class AudioFilterChain(BaseAudioFilter):
+    """This is an audio filter that runs other filters in sequence (e.g. a
+    `HighPassFilter`, a noise suppression filter and an `AGCFilter`). The
+    filters run in a thread owned by the chain, so the event loop is free
+    while audio is being filtered, and always in the same thread so the
+    filters can keep their state without locking.
+
+    Audio is converted to float once for the whole chain, into a buffer that is
+    reused for every chunk. The processing time of every filter is measured,
+    see `stats`.
+
+    A `FilterEnableFrame` enables or disables the whole chain and other
+    filter control frames are given to every filter, in the chain's thread (see
+    `SyncAudioFilter.process_control_frame()`), so they never change a filter
+    while it's processing audio.
+
+    """
+
+    def __init__(self, filters: Sequence[SyncAudioFilter]):
+        self._filters = list(filters)
+        self._filtering = True
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats = [AudioFilterStats(name=f.name) for f in self._filters]
+        self._samples = np.zeros(0, dtype=np.float32)
+        self._output = np.zeros(0, dtype=np.int16)
+
+    @property
+    def filters(self) -> List[SyncAudioFilter]:
+        return self._filters
+
+    @property
+    def stats(self) -> List[AudioFilterStats]:
+        """Processing time of each filter, in the same order as the filters."""
+        return self._stats
+
+    async def start(self, sample_rate: int):
+        for f in self._filters:
+            await f.start(sample_rate)
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-filter")
+
+    async def stop(self):
+        if self._executor:
+            # Wait for the chunk being filtered, if any.
+            await asyncio.to_thread(self._executor.shutdown)
+            self._executor = None
+        for f in self._filters:
+            await f.stop()
+        for stats in self._stats:
+            logger.debug(
+                f"Audio filter {stats.name}: {stats.chunks} chunks, "
+                f"average {stats.average_time * 1000:.3f}ms, max {stats.max_time * 1000:.3f}ms"
+            )
+
+    async def process_frame(self, frame: FilterControlFrame):
+        if isinstance(frame, FilterEnableFrame):
+            self._filtering = frame.enable
+        elif self._executor:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self._process_control_frame, frame)
+        else:
+            self._process_control_frame(frame)
+
+    async def filter(self, audio: bytes) -> bytes:
+        if not self._filtering or not self._filters or not self._executor:
+            return audio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._filter, audio)
+
+    def _process_control_frame(self, frame: FilterControlFrame):
+        for f in self._filters:
+            f.process_control_frame(frame)
+
+    def _filter(self, audio: bytes) -> bytes:
+        count = len(audio) // 2
+        if len(self._samples) < count:
+            self._samples = np.zeros(count, dtype=np.float32)
+            self._output = np.zeros(count, dtype=np.int16)
+
+        samples = self._samples[:count]
+        np.copyto(samples, np.frombuffer(audio, dtype=np.int16, count=count))
+
+        for f, stats in zip(self._filters, self._stats):
+            if not f.filtering:
+                continue
+            start = time.perf_counter()
+            samples = f.process(samples)
+            elapsed = time.perf_counter() - start
+            stats.chunks += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+        # Back to 16-bit, without allocating intermediate arrays.
+        if not samples.flags.writeable:
+            samples = samples.copy()
+        np.rint(samples, out=samples)
+        np.clip(samples, -32768, 32767, out=samples)
+        output = self._output[:count]
+        np.copyto(output, samples, casting="unsafe")
+        return output.tobytes()
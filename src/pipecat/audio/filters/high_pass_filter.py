@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import numpy as np
+from scipy.signal import butter, sosfilt
+
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
+
+
+class HighPassFilter(SyncAudioFilter):
+    """Butterworth high-pass filter, useful to remove DC offset and low
+    frequency rumble (e.g. from microphones or handling noise) before noise
+    suppression and VAD. The filter state is carried from one chunk to the
+    next.
+
+    """
+
+    def __init__(self, *, cutoff_hz: float = 80.0, order: int = 2):
+        super().__init__()
+        self._cutoff_hz = cutoff_hz
+        self._order = order
+        self._sos = None
+        self._zi = None
+
+    async def start(self, sample_rate: int):
+        await super().start(sample_rate)
+        self._sos = butter(
+            self._order, self._cutoff_hz, btype="highpass", fs=sample_rate, output="sos"
+        )
+        self._zi = np.zeros((self._sos.shape[0], 2))
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        filtered, self._zi = sosfilt(self._sos, samples, zi=self._zi)
+        return filtered
@@ -7,9 +7,8 @@
 import numpy as np
 import os
 
-from pipecat.audio.filters.base_audio_filter import BaseAudioFilter
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
 from loguru import logger
-from pipecat.frames.frames import FilterControlFrame, FilterEnableFrame
 
 try:
     from pipecat_ai_krisp.audio.krisp_processor import KrispAudioProcessor
@@ -19,7 +18,7 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module: {e}")
 
 
-class KrispFilter(BaseAudioFilter):
+class KrispFilter(SyncAudioFilter):
     def __init__(
         self, sample_type: str = "PCM_16", channels: int = 1, model_path: str = None
     ) -> None:
@@ -42,12 +41,10 @@ class KrispFilter(BaseAudioFilter):
 
         self._sample_type = sample_type
         self._channels = channels
-        self._sample_rate = 0
-        self._filtering = True
         self._krisp_processor = None
 
     async def start(self, sample_rate: int):
-        self._sample_rate = sample_rate
+        await super().start(sample_rate)
         self._krisp_processor = KrispAudioProcessor(
             self._sample_rate, self._sample_type, self._channels, self._model_path
         )
@@ -55,24 +52,10 @@ class KrispFilter(BaseAudioFilter):
     async def stop(self):
         self._krisp_processor = None
 
-    async def process_frame(self, frame: FilterControlFrame):
-        if isinstance(frame, FilterEnableFrame):
-            self._filtering = frame.enable
-
-    async def filter(self, audio: bytes) -> bytes:
-        if not self._filtering:
-            return audio
-
-        data = np.frombuffer(audio, dtype=np.int16)
-
+    def process(self, samples: np.ndarray) -> np.ndarray:
         # Add a small epsilon to avoid division by zero.
         epsilon = 1e-10
-        data = data.astype(np.float32) + epsilon
+        samples = samples + epsilon
 
         # Process the audio chunk to reduce noise
-        reduced_noise = self._krisp_processor.process(data)
-
-        # Clip and set processed audio back to frame
-        audio = np.clip(reduced_noise, -32768, 32767).astype(np.int16).tobytes()
-
-        return audio
+        return self._krisp_processor.process(samples)
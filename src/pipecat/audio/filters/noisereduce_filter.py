@@ -6,12 +6,10 @@
 
 import numpy as np
 
-from pipecat.audio.filters.base_audio_filter import BaseAudioFilter
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
 
 from loguru import logger
 
-from pipecat.frames.frames import FilterControlFrame, FilterEnableFrame
-
 try:
     import noisereduce as nr
 except ModuleNotFoundError as e:
@@ -22,33 +20,38 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module: {e}")
 
 
-class NoisereduceFilter(BaseAudioFilter):
-    def __init__(self) -> None:
-        self._filtering = True
-        self._sample_rate = 0
+class NoisereduceFilter(SyncAudioFilter):
+    """Noise reduction filter using the noisereduce library.
 
-    async def start(self, sample_rate: int):
-        self._sample_rate = sample_rate
+    Chunks are too short for a good noise estimate on their own. With
+    `context_secs`, each chunk is filtered together with the audio that
+    precedes it and only the part that corresponds to the chunk is returned.
+    This costs `context_secs` worth of extra samples per chunk (e.g. 0.25s of
+    context is about 13 times the work of a 20ms chunk), so it's off by default
+    and is best used inside an `AudioFilterChain`, which runs filters off the
+    event loop.
 
-    async def stop(self):
-        pass
+    """
 
-    async def process_frame(self, frame: FilterControlFrame):
-        if isinstance(frame, FilterEnableFrame):
-            self._filtering = frame.enable
+    def __init__(self, *, context_secs: float = 0.0) -> None:
+        super().__init__()
+        self._context_secs = context_secs
+        self._history = np.zeros(0, dtype=np.float32)
 
-    async def filter(self, audio: bytes) -> bytes:
-        if not self._filtering:
-            return audio
+    async def start(self, sample_rate: int):
+        await super().start(sample_rate)
+        self._history = np.zeros(int(sample_rate * self._context_secs), dtype=np.float32)
 
-        data = np.frombuffer(audio, dtype=np.int16)
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        count = len(samples)
+        data = np.concatenate((self._history, samples))
+        if len(self._history) > 0:
+            self._history = data[-len(self._history) :]
 
         # Add a small epsilon to avoid division by zero.
         epsilon = 1e-10
-        data = data.astype(np.float32) + epsilon
+        data = data + epsilon
 
         # Noise reduction
         reduced_noise = nr.reduce_noise(y=data, sr=self._sample_rate)
-        audio = np.clip(reduced_noise, -32768, 32767).astype(np.int16).tobytes()
-
-        return audio
+        return reduced_noise[-count:] if count > 0 else samples
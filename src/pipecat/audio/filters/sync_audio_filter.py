@@ -0,0 +1,74 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from abc import abstractmethod
+
+import numpy as np
+
+from pipecat.audio.filters.base_audio_filter import BaseAudioFilter
+from pipecat.frames.frames import FilterControlFrame, FilterEnableFrame
+
+
+class SyncAudioFilter(BaseAudioFilter):
+    """This is a base class for audio filters that do their work synchronously
+    in `process()`, on a numpy buffer, so they can be run in an
+    `AudioFilterChain` thread. Filters keep the state they need from one chunk
+    to the next, because each filter instance processes a single stream.
+
+    These filters can also be used on their own, as any other `BaseAudioFilter`,
+    in which case they run on the event loop.
+
+    Filter control frames are handled synchronously too, in
+    `process_control_frame()`, so a chain can run them in the same thread as
+    `process()`.
+
+    """
+
+    def __init__(self):
+        self._sample_rate = 0
+        self._filtering = True
+
+    @property
+    def name(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def filtering(self) -> bool:
+        return self._filtering
+
+    async def start(self, sample_rate: int):
+        self._sample_rate = sample_rate
+
+    async def stop(self):
+        pass
+
+    async def process_frame(self, frame: FilterControlFrame):
+        self.process_control_frame(frame)
+
+    def process_control_frame(self, frame: FilterControlFrame):
+        if isinstance(frame, FilterEnableFrame):
+            self._filtering = frame.enable
+
+    async def filter(self, audio: bytes) -> bytes:
+        if not self._filtering:
+            return audio
+
+        samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+        samples = self.process(samples)
+        return np.clip(np.rint(samples), -32768, 32767).astype(np.int16).tobytes()
+
+    @abstractmethod
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Filters `samples` (float32 samples in the 16-bit range). The filter
+        can modify `samples` in place and return it, or return a new array,
+        with the same number of samples.
+
+        """
+        pass
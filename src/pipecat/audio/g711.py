@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+# G.711 μ-law and A-law codecs for 16-bit PCM audio. Encoding and decoding are
+# a single lookup in a precomputed table, so they are vectorized and don't
+# depend on `audioop` (which was removed in Python 3.13). The tables give the
+# same results as `audioop`.
+
+from functools import lru_cache
+
+import numpy as np
+
+# Upper end of each of the 8 segments (in 14-bit values for μ-law, 13-bit for
+# A-law).
+_ULAW_SEG_END = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+_ALAW_SEG_END = np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF])
+
+_ULAW_BIAS = 0x84
+_ULAW_CLIP = 8159
+
+
+def _all_pcm_values() -> np.ndarray:
+    """All the 16-bit values, ordered so that indexing with the unsigned
+    representation of a sample gives the sample.
+
+    """
+    return np.arange(1 << 16, dtype=np.uint16).view(np.int16).astype(np.int32)
+
+
+@lru_cache(maxsize=None)
+def _ulaw_encode_table() -> np.ndarray:
+    pcm = _all_pcm_values() >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    pcm = np.minimum(np.abs(pcm), _ULAW_CLIP) + (_ULAW_BIAS >> 2)
+    seg = np.searchsorted(_ULAW_SEG_END, pcm)
+    ulaw = (seg << 4) | ((pcm >> (seg + 1)) & 0xF)
+    ulaw = np.where(seg >= 8, 0x7F, ulaw)
+    return (ulaw ^ mask).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _ulaw_decode_table() -> np.ndarray:
+    ulaw = ~np.arange(256, dtype=np.int32) & 0xFF
+    t = ((ulaw & 0x0F) << 3) + _ULAW_BIAS
+    t <<= (ulaw & 0x70) >> 4
+    return np.where(ulaw & 0x80, _ULAW_BIAS - t, t - _ULAW_BIAS).astype(np.int16)
+
+
+@lru_cache(maxsize=None)
+def _alaw_encode_table() -> np.ndarray:
+    pcm = _all_pcm_values() >> 3
+    mask = np.where(pcm >= 0, 0xD5, 0x55)
+    pcm = np.where(pcm >= 0, pcm, -pcm - 1)
+    seg = np.searchsorted(_ALAW_SEG_END, pcm)
+    alaw = (seg << 4) | ((pcm >> np.maximum(seg, 1)) & 0xF)
+    alaw = np.where(seg >= 8, 0x7F, alaw)
+    return (alaw ^ mask).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _alaw_decode_table() -> np.ndarray:
+    alaw = np.arange(256, dtype=np.int32) ^ 0x55
+    seg = (alaw & 0x70) >> 4
+    t = (alaw & 0x0F) << 4
+    t = np.where(seg == 0, t + 8, (t + 0x108) << np.maximum(seg - 1, 0))
+    return np.where(alaw & 0x80, t, -t).astype(np.int16)
+
+
+def _encode(pcm_bytes: bytes, table: np.ndarray) -> bytes:
+    pcm = np.frombuffer(pcm_bytes, dtype=np.uint16)
+    # `take()` is faster than indexing for small chunks.
+    return table.take(pcm).tobytes()
+
+
+def _decode(encoded_bytes: bytes, table: np.ndarray) -> bytes:
+    encoded = np.frombuffer(encoded_bytes, dtype=np.uint8)
+    return table.take(encoded).tobytes()
+
+
+def pcm_to_ulaw(pcm_bytes: bytes) -> bytes:
+    return _encode(pcm_bytes, _ulaw_encode_table())
+
+
+def ulaw_to_pcm(ulaw_bytes: bytes) -> bytes:
+    return _decode(ulaw_bytes, _ulaw_decode_table())
+
+
+def pcm_to_alaw(pcm_bytes: bytes) -> bytes:
+    return _encode(pcm_bytes, _alaw_encode_table())
+
+
+def alaw_to_pcm(alaw_bytes: bytes) -> bytes:
+    return _decode(alaw_bytes, _alaw_decode_table())
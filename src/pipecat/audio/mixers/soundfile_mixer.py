@@ -5,12 +5,17 @@
 #
 
 import asyncio
-from typing import Any, Dict, Mapping
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, Mapping, Set
 
 import numpy as np
 from loguru import logger
 
 from pipecat.audio.mixers.base_audio_mixer import BaseAudioMixer
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
 from pipecat.frames.frames import MixerControlFrame, MixerEnableFrame, MixerUpdateSettingsFrame
 
 try:
@@ -23,11 +28,106 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module: {e}")
 
 
+# Sounds already decoded in this process, by cache file.
+_sounds: Dict[str, np.ndarray] = {}
+_sounds_lock = threading.Lock()
+
+# Cache directories already checked in this process.
+_cache_dirs: Set[str] = set()
+
+# Volume is applied as a fixed-point (Q15) gain.
+GAIN_SHIFT = 15
+
+# Frames decoded at a time when caching a sound file.
+DECODE_BLOCK_FRAMES = 65536
+
+
+def default_cache_dir() -> str:
+    """A per-user cache directory (`$XDG_CACHE_HOME/pipecat/mixer` or
+    `~/.cache/pipecat/mixer`).
+
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "pipecat", "mixer")
+
+
+def _check_cache_dir(cache_dir: str):
+    """Creates `cache_dir` if needed, only readable by us. Cached sounds are
+    played as they are, so we refuse a directory that another user could
+    have created or could write to.
+
+    """
+    if cache_dir in _cache_dirs:
+        return
+    os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    stat = os.stat(cache_dir)
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        raise Exception(f"Mixer cache directory {cache_dir} is not owned by the current user")
+    if stat.st_mode & 0o022:
+        raise Exception(f"Mixer cache directory {cache_dir} is writable by other users")
+    _cache_dirs.add(cache_dir)
+
+
+def load_sound(file_name: str, sample_rate: int, cache_dir: str) -> np.ndarray:
+    """Returns the sound in `file_name` as 16-bit mono audio at `sample_rate`.
+    The file is decoded (and resampled if necessary) only the first time,
+    into a raw audio file in `cache_dir`. The result is a read-only memory map
+    of that file, so the sound is not held in memory and is shared by all the
+    mixers (and processes) playing it.
+
+    """
+    stat = os.stat(file_name)
+    key = f"{os.path.abspath(file_name)}:{stat.st_size}:{stat.st_mtime_ns}:{sample_rate}"
+    cache_file = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".pcm")
+
+    with _sounds_lock:
+        if cache_file in _sounds:
+            return _sounds[cache_file]
+
+        _check_cache_dir(cache_dir)
+        if not os.path.exists(cache_file):
+            _decode_sound(file_name, sample_rate, cache_file)
+
+        if os.path.getsize(cache_file) > 0:
+            # A plain array view is faster to slice than a `np.memmap`.
+            sound = np.memmap(cache_file, dtype=np.int16, mode="r").view(np.ndarray)
+        else:
+            sound = np.zeros(0, dtype=np.int16)
+        _sounds[cache_file] = sound
+        return sound
+
+
+def _decode_sound(file_name: str, sample_rate: int, cache_file: str):
+    resampler = StreamResampler()
+    # Write to a temporary file first, other processes might be reading the
+    # cache file.
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file))
+    try:
+        with os.fdopen(fd, "wb") as f, sf.SoundFile(file_name) as sound_file:
+            if sound_file.channels != 1:
+                logger.warning(f"Sound file {file_name} is not mono, mixing its channels")
+            for block in sound_file.blocks(
+                blocksize=DECODE_BLOCK_FRAMES, dtype="int16", always_2d=True
+            ):
+                mono = block.mean(axis=1).astype(np.int16) if block.shape[1] > 1 else block[:, 0]
+                f.write(resampler.resample(mono.tobytes(), sound_file.samplerate, sample_rate))
+            f.write(resampler.flush())
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+
 class SoundfileMixer(BaseAudioMixer):
     """This is an audio mixer that mixes incoming audio with audio from a
     file. It uses the soundfile library to load files so it supports multiple
-    formats. The audio files need to only have one channel (mono) and it needs
-    to match the sample rate of the output transport.
+    formats. Files with more than one channel are mixed down to mono and files
+    with a different sample rate than the output transport are resampled.
+
+    Sound files are decoded once (per sample rate) into a cache directory
+    (`cache_dir`, a per-user directory by default, see `default_cache_dir()`)
+    and played from a memory map, so many mixers playing the same sounds don't
+    need more memory.
 
     Multiple files can be loaded, each with a different name. The
     `MixerUpdateSettingsFrame` has the following settings available: `sound`
@@ -42,18 +142,24 @@ class SoundfileMixer(BaseAudioMixer):
         default_sound: str,
         volume: float = 0.4,
         loop: bool = True,
+        cache_dir: str | None = None,
         **kwargs,
     ):
         super().__init__(**kwargs)
         self._sound_files = sound_files
-        self._volume = volume
+        self._cache_dir = cache_dir or default_cache_dir()
         self._sample_rate = 0
 
         self._sound_pos = 0
-        self._sounds: Dict[str, Any] = {}
+        self._sounds: Dict[str, np.ndarray] = {}
         self._current_sound = default_sound
         self._mixing = True
         self._loop = loop
+        self._set_volume(volume)
+
+        # Reused on every chunk to avoid allocations.
+        self._mix_buffer = np.zeros(0, dtype=np.int32)
+        self._sound_buffer = np.zeros(0, dtype=np.int16)
 
     async def start(self, sample_rate: int):
         self._sample_rate = sample_rate
@@ -94,24 +200,20 @@ class SoundfileMixer(BaseAudioMixer):
             logger.error(f"Sound {sound} is not available")
 
     async def _update_volume(self, volume: float):
-        self._volume = volume
+        self._set_volume(volume)
 
     async def _update_loop(self, loop: bool):
         self._loop = loop
 
+    def _set_volume(self, volume: float):
+        # Mixing is done in 32 bits, which leaves room for volumes up to 2.
+        self._volume = max(0.0, min(volume, 2.0))
+        self._gain = round(self._volume * (1 << GAIN_SHIFT))
+
     def _load_sound_file(self, sound_name: str, file_name: str):
         try:
             logger.debug(f"Loading mixer sound from {file_name}")
-            sound, sample_rate = sf.read(file_name, dtype="int16")
-
-            if sample_rate == self._sample_rate:
-                audio = sound.tobytes()
-                # Convert from np to bytes again.
-                self._sounds[sound_name] = np.frombuffer(audio, dtype=np.int16)
-            else:
-                logger.warning(
-                    f"Sound file {file_name} has incorrect sample rate {sample_rate} (should be {self._sample_rate})"
-                )
+            self._sounds[sound_name] = load_sound(file_name, self._sample_rate, self._cache_dir)
         except Exception as e:
             logger.error(f"Unable to open file {file_name}: {e}")
 
@@ -123,24 +225,57 @@ class SoundfileMixer(BaseAudioMixer):
         if not self._mixing or not self._current_sound in self._sounds:
             return audio
 
-        audio_np = np.frombuffer(audio, dtype=np.int16)
-        chunk_size = len(audio_np)
-
         # Sound currently playing.
         sound = self._sounds[self._current_sound]
+        if len(sound) == 0:
+            return audio
 
-        # Go back to the beginning if we don't have enough data.
-        if self._sound_pos + chunk_size > len(sound):
-            if not self._loop:
+        audio_np = np.frombuffer(audio, dtype=np.int16)
+        chunk_size = len(audio_np)
+
+        if self._sound_pos + chunk_size <= len(sound):
+            sound_np = sound[self._sound_pos : self._sound_pos + chunk_size]
+            self._sound_pos += chunk_size
+        else:
+            sound_np = self._wrap_sound(sound, chunk_size)
+            if sound_np is None:
                 return audio
-            self._sound_pos = 0
 
-        start_pos = self._sound_pos
-        end_pos = self._sound_pos + chunk_size
-        self._sound_pos = end_pos
+        if len(self._mix_buffer) != chunk_size:
+            self._mix_buffer = np.zeros(chunk_size, dtype=np.int32)
+        mixed = self._mix_buffer
+        np.multiply(sound_np, self._gain, out=mixed, dtype=np.int32)
+        np.right_shift(mixed, GAIN_SHIFT, out=mixed)
+        np.add(mixed, audio_np, out=mixed)
+        # np.clip() is slower than this for small arrays.
+        np.minimum(mixed, 32767, out=mixed)
+        np.maximum(mixed, -32768, out=mixed)
+
+        return mixed.astype(np.int16).tobytes()
 
-        sound_np = sound[start_pos:end_pos]
+    def _wrap_sound(self, sound: np.ndarray, chunk_size: int) -> np.ndarray | None:
+        """Returns the next chunk of the sound when it goes past the end of the
+        sound. If we are looping it continues at the beginning, otherwise it's
+        padded with silence (or None if the sound is over).
+
+        """
+        if len(self._sound_buffer) != chunk_size:
+            self._sound_buffer = np.zeros(chunk_size, dtype=np.int16)
 
-        mixed_audio = np.clip(audio_np + sound_np * self._volume, -32768, 32767).astype(np.int16)
+        filled = 0
+        while filled < chunk_size:
+            if self._sound_pos >= len(sound):
+                if not self._loop:
+                    break
+                self._sound_pos = 0
+            size = min(chunk_size - filled, len(sound) - self._sound_pos)
+            self._sound_buffer[filled : filled + size] = sound[
+                self._sound_pos : self._sound_pos + size
+            ]
+            self._sound_pos += size
+            filled += size
 
-        return mixed_audio.astype(np.int16).tobytes()
+        if filled == 0:
+            return None
+        self._sound_buffer[filled:] = 0
+        return self._sound_buffer
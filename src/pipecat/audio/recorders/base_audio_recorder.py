@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from abc import ABC, abstractmethod
+
+
+class BaseAudioRecorder(ABC):
+    """This is a base class for audio recorders. Recorders are given to the
+    `AudioBufferProcessor`, which writes the conversation audio to them in
+    blocks while the conversation is happening, so the audio doesn't need to
+    be kept in memory.
+
+    """
+
+    @abstractmethod
+    async def start(self, sample_rate: int, num_channels: int):
+        """This will be called before any audio is written. Audio will be
+        16-bit, with the given sample rate and number of channels (interleaved
+        if there's more than one).
+
+        """
+        pass
+
+    @abstractmethod
+    async def write(self, audio: bytes):
+        pass
+
+    @abstractmethod
+    async def stop(self):
+        """This will be called after the last block of audio has been
+        written. It can be called more than once.
+
+        """
+        pass
@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+import wave
+from typing import Any
+
+from loguru import logger
+
+from pipecat.audio.recorders.base_audio_recorder import BaseAudioRecorder
+
+
+class FileAudioRecorder(BaseAudioRecorder):
+    """This is an audio recorder that writes audio to a WAV or FLAC file. The
+    format is chosen from the file extension unless `format` is given. FLAC
+    files are written with the soundfile library.
+
+    The file is written incrementally, one block at a time, and file access
+    happens in a separate thread so the event loop is not blocked.
+
+    """
+
+    def __init__(self, file_name: str, *, format: str | None = None):
+        self._file_name = file_name
+        if not format:
+            format = "FLAC" if file_name.lower().endswith(".flac") else "WAV"
+        self._format = format.upper()
+        if self._format not in ("WAV", "FLAC"):
+            raise ValueError(f"Unsupported audio recording format {format}")
+
+        self._file: Any = None
+        self._num_channels = 0
+        self._num_frames = 0
+
+    @property
+    def file_name(self) -> str:
+        return self._file_name
+
+    @property
+    def num_frames(self) -> int:
+        """Number of audio frames (samples per channel) written so far."""
+        return self._num_frames
+
+    async def start(self, sample_rate: int, num_channels: int):
+        if self._file:
+            return
+        logger.debug(f"Recording audio to {self._file_name}")
+        self._num_channels = num_channels
+        self._num_frames = 0
+        self._file = await asyncio.to_thread(self._open, sample_rate, num_channels)
+
+    async def write(self, audio: bytes):
+        if not self._file or not audio:
+            return
+        await asyncio.to_thread(self._write, self._file, audio)
+        self._num_frames += len(audio) // (2 * self._num_channels)
+
+    async def stop(self):
+        if not self._file:
+            return
+        file = self._file
+        self._file = None
+        await asyncio.to_thread(file.close)
+
+    def _open(self, sample_rate: int, num_channels: int):
+        dir_name = os.path.dirname(self._file_name)
+        if dir_name:
+            os.makedirs(dir_name, exist_ok=True)
+
+        if self._format == "FLAC":
+            import soundfile as sf
+
+            return sf.SoundFile(
+                self._file_name,
+                "w",
+                samplerate=sample_rate,
+                channels=num_channels,
+                format="FLAC",
+                subtype="PCM_16",
+            )
+
+        wf = wave.open(self._file_name, "wb")
+        wf.setsampwidth(2)
+        wf.setnchannels(num_channels)
+        wf.setframerate(sample_rate)
+        return wf
+
+    def _write(self, file: Any, audio: bytes):
+        if self._format == "FLAC":
+            file.buffer_write(audio, dtype="int16")
+        else:
+            # The WAV header is updated when the file is closed.
+            file.writeframesraw(audio)
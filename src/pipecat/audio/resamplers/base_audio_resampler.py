@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from abc import ABC, abstractmethod
+
+
+class BaseAudioResampler(ABC):
+    """This is a base class for audio resamplers. A resampler converts a single
+    stream of 16-bit mono audio, one chunk at a time, so the resampler can keep
+    whatever state it needs between chunks. Use a different resampler for each
+    stream.
+
+    """
+
+    @abstractmethod
+    def resample(self, audio: bytes, in_rate: int, out_rate: int) -> bytes:
+        """Resamples the next chunk of the stream. If the sample rates are
+        different from the ones of the previous chunk the resampler starts a new
+        stream.
+
+        """
+        pass
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Returns any audio the resampler is still holding, and starts a new
+        stream. This should be called at the end of a stream.
+
+        """
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Discards any audio the resampler is holding and starts a new stream."""
+        pass
@@ -0,0 +1,154 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+from pipecat.audio.resamplers.base_audio_resampler import BaseAudioResampler
+
+# Zero crossings of the (windowed) sinc on each side of the filter center.
+ZERO_CROSSINGS = 16
+# Filter cutoff, relative to the lowest of the two Nyquist frequencies.
+ROLLOFF = 0.9
+# Kaiser window shape. Gives ~80dB of stopband attenuation.
+KAISER_BETA = 8.0
+# When downsampling by up to this factor after upsampling, it's faster to
+# compute every phase of the filter than to pick one for each output sample.
+MAX_DOWN_ALL_PHASES = 4
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(in_rate: int, out_rate: int) -> Tuple[np.ndarray, int, int]:
+    """Designs the low-pass filter to convert from `in_rate` to `out_rate`. The
+    filter is returned split in phases: row `p` holds the taps (reversed, so
+    they can be multiplied with the input samples in order) used to compute an
+    output sample that falls on phase `p` between two input samples. It also
+    returns the upsampling and downsampling factors.
+
+    """
+    divisor = gcd(in_rate, out_rate)
+    up = out_rate // divisor
+    down = in_rate // divisor
+
+    # Input samples needed for every output sample. Downsampling needs a
+    # longer filter because the cutoff frequency is lower.
+    taps = 2 * ZERO_CROSSINGS * max(1, -(-down // up))
+    length = taps * up
+
+    # The last tap is left at zero, so the filter has an odd length and its
+    # delay is a whole number of upsampled samples.
+    cutoff = ROLLOFF * 0.5 / max(up, down)
+    n = np.arange(length - 1) - (length - 2) / 2
+    h = np.zeros(length)
+    h[:-1] = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length - 1, KAISER_BETA) * up
+
+    phases = np.ascontiguousarray(h.reshape(taps, up).T[:, ::-1], dtype=np.float32)
+    phases.setflags(write=False)
+
+    return (phases, up, down)
+
+
+class StreamResampler(BaseAudioResampler):
+    """This is a streaming resampler for 16-bit mono audio. It's a polyphase
+    windowed-sinc resampler that carries the filter state from one chunk to
+    the next, so the output is the same no matter how the stream is split in
+    chunks. Filters are designed once per pair of sample rates and shared by
+    all the resamplers.
+
+    The filter delay is compensated, so the output is aligned with the input,
+    but this means the last few milliseconds of the stream are only returned by
+    `flush()`.
+
+    """
+
+    def __init__(self):
+        self._rates: Tuple[int, int] | None = None
+        self.reset()
+
+    def resample(self, audio: bytes, in_rate: int, out_rate: int) -> bytes:
+        if in_rate == out_rate:
+            return audio
+
+        if self._rates != (in_rate, out_rate):
+            self.reset()
+            self._setup(in_rate, out_rate)
+
+        samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+        self._in_samples += len(samples)
+        return self._to_bytes(self._process(samples))
+
+    def flush(self) -> bytes:
+        if not self._rates:
+            return b""
+
+        # Every input sample should result in `up / down` output samples, the
+        # ones we haven't returned are still in the filter.
+        missing = -(-self._in_samples * self._up // self._down) - self._out_samples
+        zeros = np.zeros(-(-(self._next + missing * self._down) // self._up) + 1, dtype=np.float32)
+        output = self._process(zeros)[: max(0, missing)]
+        self.reset()
+        return self._to_bytes(output)
+
+    def reset(self):
+        self._rates = None
+        self._in_samples = 0
+        self._out_samples = 0
+
+    def _setup(self, in_rate: int, out_rate: int):
+        self._rates = (in_rate, out_rate)
+        self._phases, self._up, self._down = polyphase_filter(in_rate, out_rate)
+        taps = self._phases.shape[1]
+        self._history = np.zeros(taps - 1, dtype=np.float32)
+        # Position (in upsampled samples from the beginning of the next chunk)
+        # of the end of the filter window for the next output sample. Starting
+        # at the filter delay, instead of zero, compensates it.
+        self._next = (taps * self._up - 2) // 2
+
+    def _process(self, samples: np.ndarray) -> np.ndarray:
+        taps = self._phases.shape[1]
+        up = self._up
+        down = self._down
+        buffer = np.concatenate((self._history, samples))
+        end = len(samples) * up
+
+        count = max(0, -(-(end - self._next) // down))
+        if count > 0:
+            # `windows[i]` holds the `taps` input samples that end with input
+            # sample `i`. This is a view, nothing is copied. (We don't use
+            # `sliding_window_view()`, it's slow for small chunks.)
+            windows = np.ndarray((len(buffer) - taps + 1, taps), np.float32, buffer, 0, (4, 4))
+            first = self._next // up
+            last = (self._next + down * (count - 1)) // up
+            if up == 1:
+                # Integer downsampling, every output sample uses the same phase.
+                output = np.einsum("ij,j->i", windows[first : last + 1 : down], self._phases[0])
+            elif down <= MAX_DOWN_ALL_PHASES:
+                # Compute all the phases and keep the ones we need. This is
+                # faster than picking the phase of each output sample unless
+                # most of them are discarded.
+                output = np.dot(windows[first : last + 1], self._phases.T).ravel()
+                output = output[self._next - first * up :: down][:count]
+            else:
+                positions = self._next + down * np.arange(count)
+                output = np.einsum(
+                    "ij,ij->i", self._phases[positions % up], windows[positions // up]
+                )
+        else:
+            output = np.zeros(0, dtype=np.float32)
+
+        self._next += down * count - end
+        self._history = buffer[len(buffer) - (taps - 1) :]
+
+        self._out_samples += len(output)
+        return output
+
+    def _to_bytes(self, output: np.ndarray) -> bytes:
+        # Faster than `np.clip()` for small chunks.
+        output = np.minimum(np.maximum(np.rint(output), -32768), 32767)
+        return output.astype(np.int16).tobytes()
@@ -4,21 +4,30 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-import audioop
-import numpy as np
-import pyloudnorm as pyln
-import resampy
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from pipecat.audio.resamplers.base_audio_resampler import BaseAudioResampler
+
+# Heavy dependencies (numpy, resampy and pyloudnorm) are imported on first use,
+# so importing pipecat doesn't pay for them unless they are needed.
 
 
 def resample_audio(audio: bytes, original_rate: int, target_rate: int) -> bytes:
     if original_rate == target_rate:
         return audio
+
+    import numpy as np
+    import resampy
+
     audio_data = np.frombuffer(audio, dtype=np.int16)
     resampled_audio = resampy.resample(audio_data, original_rate, target_rate)
     return resampled_audio.astype(np.int16).tobytes()
 
 
 def mix_audio(audio1: bytes, audio2: bytes) -> bytes:
+    import numpy as np
+
     data1 = np.frombuffer(audio1, dtype=np.int16)
     data2 = np.frombuffer(audio2, dtype=np.int16)
 
@@ -37,6 +46,8 @@ def mix_audio(audio1: bytes, audio2: bytes) -> bytes:
 
 
 def interleave_stereo_audio(left_audio: bytes, right_audio: bytes) -> bytes:
+    import numpy as np
+
     left = np.frombuffer(left_audio, dtype=np.int16)
     right = np.frombuffer(right_audio, dtype=np.int16)
 
@@ -56,6 +67,9 @@ def normalize_value(value, min_value, max_value):
 
 
 def calculate_audio_volume(audio: bytes, sample_rate: int) -> float:
+    import numpy as np
+    import pyloudnorm as pyln
+
     audio_np = np.frombuffer(audio, dtype=np.int16)
     audio_float = audio_np.astype(np.float64)
 
@@ -74,21 +88,71 @@ def exp_smoothing(value: float, prev_value: float, factor: float) -> float:
     return prev_value + factor * (value - prev_value)
 
 
-def ulaw_to_pcm(ulaw_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
-    # Convert μ-law to PCM
-    in_pcm_bytes = audioop.ulaw2lin(ulaw_bytes, 2)
+def ulaw_to_pcm(
+    ulaw_bytes: bytes,
+    in_sample_rate: int,
+    out_sample_rate: int,
+    resampler: Optional["BaseAudioResampler"] = None,
+) -> bytes:
+    """Decodes μ-law audio and resamples it. When converting a stream of audio
+    (e.g. telephony packets) pass the same `resampler` for all the chunks, so
+    there are no discontinuities between chunks.
+
+    """
+    from pipecat.audio.g711 import ulaw_to_pcm as decode
+
+    return _resample_chunk(decode(ulaw_bytes), in_sample_rate, out_sample_rate, resampler)
 
-    # Resample
-    out_pcm_bytes = audioop.ratecv(in_pcm_bytes, 2, 1, in_sample_rate, out_sample_rate, None)[0]
 
-    return out_pcm_bytes
+def pcm_to_ulaw(
+    pcm_bytes: bytes,
+    in_sample_rate: int,
+    out_sample_rate: int,
+    resampler: Optional["BaseAudioResampler"] = None,
+) -> bytes:
+    """Resamples audio and encodes it to μ-law. See `ulaw_to_pcm()`."""
+    from pipecat.audio.g711 import pcm_to_ulaw as encode
 
+    return encode(_resample_chunk(pcm_bytes, in_sample_rate, out_sample_rate, resampler))
 
-def pcm_to_ulaw(pcm_bytes: bytes, in_sample_rate: int, out_sample_rate: int):
-    # Resample
-    in_pcm_bytes = audioop.ratecv(pcm_bytes, 2, 1, in_sample_rate, out_sample_rate, None)[0]
 
-    # Convert PCM to μ-law
-    ulaw_bytes = audioop.lin2ulaw(in_pcm_bytes, 2)
+def alaw_to_pcm(
+    alaw_bytes: bytes,
+    in_sample_rate: int,
+    out_sample_rate: int,
+    resampler: Optional["BaseAudioResampler"] = None,
+) -> bytes:
+    """Decodes A-law audio and resamples it. See `ulaw_to_pcm()`."""
+    from pipecat.audio.g711 import alaw_to_pcm as decode
+
+    return _resample_chunk(decode(alaw_bytes), in_sample_rate, out_sample_rate, resampler)
+
+
+def pcm_to_alaw(
+    pcm_bytes: bytes,
+    in_sample_rate: int,
+    out_sample_rate: int,
+    resampler: Optional["BaseAudioResampler"] = None,
+) -> bytes:
+    """Resamples audio and encodes it to A-law. See `ulaw_to_pcm()`."""
+    from pipecat.audio.g711 import pcm_to_alaw as encode
+
+    return encode(_resample_chunk(pcm_bytes, in_sample_rate, out_sample_rate, resampler))
+
+
+def _resample_chunk(
+    audio: bytes,
+    in_sample_rate: int,
+    out_sample_rate: int,
+    resampler: Optional["BaseAudioResampler"],
+) -> bytes:
+    if in_sample_rate == out_sample_rate:
+        return audio
+    if resampler:
+        return resampler.resample(audio, in_sample_rate, out_sample_rate)
+
+    # A single chunk, so we also need the resampler tail.
+    from pipecat.audio.resamplers.stream_resampler import StreamResampler
 
-    return ulaw_bytes
+    resampler = StreamResampler()
+    return resampler.resample(audio, in_sample_rate, out_sample_rate) + resampler.flush()
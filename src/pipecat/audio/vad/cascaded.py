@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import numpy as np
+from pydantic import BaseModel
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+
+class EnergyGateParams(BaseModel):
+    # Windows at least this loud (in dBFS) always go to the model.
+    open_threshold_db: float = -45.0
+    # Windows quieter than this are silence. Windows in between go to the
+    # model unless they look like noise (many zero crossings).
+    close_threshold_db: float = -60.0
+    # Fraction of samples where the signal changes sign. Voiced speech stays
+    # well below this, broadband noise above.
+    zcr_threshold: float = 0.3
+    # Keep running the model for this long after the last window that wasn't
+    # silence, so we don't miss quiet speech and the end of utterances.
+    hangover_secs: float = 0.3
+
+
+class CascadedVADAnalyzer(VADAnalyzer):
+    """This is a VAD analyzer that puts a cheap energy and zero-crossing gate
+    in front of another (more expensive) analyzer, e.g. `SileroVADAnalyzer`.
+    Windows that are clearly silence are not given to the wrapped analyzer,
+    they just get a confidence of 0. The gate opens as soon as a window is not
+    silence, so speech onset is never delayed, and it stays open for
+    `hangover_secs` after that.
+
+    The wrapped analyzer is only used to compute voice confidences, the VAD
+    parameters and state are the ones of this analyzer.
+
+    """
+
+    def __init__(
+        self,
+        analyzer: VADAnalyzer,
+        *,
+        params: VADParams | None = None,
+        gate_params: EnergyGateParams = EnergyGateParams(),
+    ):
+        self._analyzer = analyzer
+        super().__init__(
+            sample_rate=analyzer.sample_rate,
+            num_channels=analyzer.num_channels,
+            params=params or analyzer.params,
+        )
+
+        window_secs = self.num_frames_required() / self.sample_rate
+        self._gate_params = gate_params
+        self._hangover_windows = round(gate_params.hangover_secs / window_secs)
+        self._hangover = 0
+        self._analyzed_windows = 0
+        self._skipped_windows = 0
+
+    @property
+    def analyzed_windows(self) -> int:
+        """Windows given to the wrapped analyzer."""
+        return self._analyzed_windows
+
+    @property
+    def skipped_windows(self) -> int:
+        """Windows considered silence by the gate."""
+        return self._skipped_windows
+
+    def num_frames_required(self) -> int:
+        return self._analyzer.num_frames_required()
+
+    def voice_confidence(self, buffer) -> float:
+        if self._gate_open(buffer):
+            self._analyzed_windows += 1
+            return self._analyzer.voice_confidence(buffer)
+        else:
+            self._skipped_windows += 1
+            return 0.0
+
+    def _gate_open(self, buffer) -> bool:
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        mean_square = np.dot(samples, samples) / max(1, samples.size)
+        # dBFS, 0 is a full scale square wave.
+        level = 10 * np.log10(mean_square / (32768.0 * 32768.0) + 1e-12)
+
+        if level >= self._gate_params.open_threshold_db:
+            active = True
+        elif level >= self._gate_params.close_threshold_db:
+            signs = np.signbit(samples)
+            crossings = np.count_nonzero(signs[1:] != signs[:-1]) / max(1, samples.size - 1)
+            active = crossings < self._gate_params.zcr_threshold
+        else:
+            active = False
+
+        if active:
+            self._hangover = self._hangover_windows
+            return True
+        elif self._hangover > 0:
+            self._hangover -= 1
+            return True
+        return False
@@ -4,7 +4,10 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import threading
 import time
+from concurrent.futures import Future
+from typing import List, Tuple
 
 import numpy as np
 
@@ -104,36 +107,234 @@ class SileroOnnxModel:
         return out
 
 
-class SileroVADAnalyzer(VADAnalyzer):
-    def __init__(self, *, sample_rate: int = 16000, params: VADParams = VADParams()):
-        super().__init__(sample_rate=sample_rate, num_channels=1, params=params)
+def silero_model_file_path() -> str:
+    model_name = "silero_vad.onnx"
+    package_path = "pipecat.audio.vad.data"
+
+    try:
+        import importlib_resources as impresources
+
+        model_file_path = str(impresources.files(package_path).joinpath(model_name))
+    except BaseException:
+        from importlib import resources as impresources
+
+        try:
+            with impresources.path(package_path, model_name) as f:
+                model_file_path = f
+        except BaseException:
+            model_file_path = str(impresources.files(package_path).joinpath(model_name))
+
+    return model_file_path
+
+
+class SileroVADStream:
+    """Model state of a single audio stream. This is all an analyzer needs of
+    its own, the model itself is shared (see `SileroVADModel`).
+
+    """
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._context_size = 64 if sample_rate == 16000 else 32
+        self.reset_states()
 
+    def reset_states(self):
+        self.state = np.zeros((2, 128), dtype="float32")
+        self.context = np.zeros(self._context_size, dtype="float32")
+
+
+class SileroVADModel:
+    """The Silero VAD model, loaded once per process and shared by all the
+    analyzers (ONNX runtime sessions can run from multiple threads at once).
+    Per-stream state is kept in `SileroVADStream` objects. Use `shared()` to
+    get the process-wide instance, e.g. when a worker starts, to avoid loading
+    the model when the first session starts.
+
+    """
+
+    _shared: "SileroVADModel | None" = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str | None = None, force_onnx_cpu: bool = True):
+        logger.debug("Loading Silero VAD model...")
+
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+
+        path = path or silero_model_file_path()
+        if force_onnx_cpu and "CPUExecutionProvider" in onnxruntime.get_available_providers():
+            self._session = onnxruntime.InferenceSession(
+                path, providers=["CPUExecutionProvider"], sess_options=opts
+            )
+        else:
+            self._session = onnxruntime.InferenceSession(path, sess_options=opts)
+
+        logger.debug("Loaded Silero VAD")
+
+    @classmethod
+    def shared(cls) -> "SileroVADModel":
+        with cls._shared_lock:
+            if not cls._shared:
+                cls._shared = cls()
+            return cls._shared
+
+    def run(
+        self, x: np.ndarray, state: np.ndarray, sample_rate: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Runs the model for a batch of windows (with their context already
+        prepended) and their states. Returns the confidences and new states.
+
+        """
+        ort_inputs = {"input": x, "state": state, "sr": np.array(sample_rate, dtype="int64")}
+        out, state = self._session.run(None, ort_inputs)
+        return (out, state)
+
+    def voice_confidence(self, stream: SileroVADStream, audio: np.ndarray) -> float:
+        """Analyzes the next window (float32 samples) of the given stream."""
+        x = np.concatenate((stream.context, audio))[np.newaxis]
+        out, state = self.run(x, stream.state[:, np.newaxis], stream.sample_rate)
+        stream.state = state[:, 0]
+        stream.context = x[0, len(x[0]) - len(stream.context) :]
+        return float(out[0][0])
+
+
+class SileroVADEngine:
+    """Runs Silero VAD for many audio streams (e.g. all the sessions of a
+    process) in batches, using the shared `SileroVADModel`. Windows submitted by different streams within
+    `max_delay` seconds of each other are analyzed in a single ONNX call, each
+    one with the model state of its own stream, which is much cheaper than one
+    call per window.
+
+    The engine is meant to be shared by `SileroVADAnalyzer` instances, which
+    call `voice_confidence()` from the transports' executor threads. Batches
+    run in the engine's own thread.
+
+    """
+
+    def __init__(
+        self, *, sample_rate: int = 16000, max_batch_size: int = 64, max_delay: float = 0.005
+    ):
         if sample_rate != 16000 and sample_rate != 8000:
             raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
 
-        logger.debug("Loading Silero VAD model...")
+        self._sample_rate = sample_rate
+        self._num_samples = 512 if sample_rate == 16000 else 256
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+
+        self._model = SileroVADModel.shared()
 
-        model_name = "silero_vad.onnx"
-        package_path = "pipecat.audio.vad.data"
+        self._pending: List[Tuple[SileroVADStream, np.ndarray, Future]] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
 
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    def voice_confidence(self, stream: SileroVADStream, audio: np.ndarray) -> float:
+        """Analyzes the next window (float32 samples) of the given stream and
+        returns its voice confidence. Blocks until the window's batch has run.
+
+        """
+        if len(audio) != self._num_samples:
+            raise ValueError(
+                f"Provided number of samples is {len(audio)} (Supported values: 256 for 8000 sample rate, 512 for 16000)"
+            )
+
+        future = Future()
+        with self._condition:
+            if not self._running:
+                self._start()
+            self._pending.append((stream, audio, future))
+            self._condition.notify()
+        return future.result()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._thread_handler, daemon=True)
+        self._thread.start()
+
+    def _thread_handler(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    batch = self._pending
+                    self._pending = []
+                    for _, _, future in batch:
+                        future.set_exception(RuntimeError("Silero VAD engine stopped"))
+                    return
+
+                # Give other streams a chance to submit their windows.
+                deadline = time.monotonic() + self._max_delay
+                while self._running and len(self._pending) < self._max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending[: self._max_batch_size]
+                del self._pending[: self._max_batch_size]
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[SileroVADStream, np.ndarray, Future]]):
         try:
-            import importlib_resources as impresources
+            x = np.stack([np.concatenate((stream.context, audio)) for stream, audio, _ in batch])
+            state = np.stack([stream.state for stream, _, _ in batch], axis=1)
+            out, state = self._model.run(x, state, self._sample_rate)
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
 
-            model_file_path = str(impresources.files(package_path).joinpath(model_name))
-        except BaseException:
-            from importlib import resources as impresources
+        for i, (stream, _, future) in enumerate(batch):
+            stream.state = state[:, i]
+            stream.context = x[i, x.shape[1] - len(stream.context) :]
+            future.set_result(float(out[i][0]))
 
-            try:
-                with impresources.path(package_path, model_name) as f:
-                    model_file_path = f
-            except BaseException:
-                model_file_path = str(impresources.files(package_path).joinpath(model_name))
 
-        self._model = SileroOnnxModel(model_file_path, force_onnx_cpu=True)
+class SileroVADAnalyzer(VADAnalyzer):
+    """Voice activity detection with Silero VAD. All the analyzers share the
+    same model (see `SileroVADModel`), each analyzer only keeps the model state
+    of its stream. If a `SileroVADEngine` is given, windows are analyzed in
+    batches with the ones from other analyzers using the same engine.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        params: VADParams = VADParams(),
+        engine: SileroVADEngine | None = None,
+    ):
+        super().__init__(sample_rate=sample_rate, num_channels=1, params=params)
 
-        self._last_reset_time = 0
+        if sample_rate != 16000 and sample_rate != 8000:
+            raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
 
-        logger.debug("Loaded Silero VAD")
+        if engine and engine.sample_rate != sample_rate:
+            raise ValueError(
+                f"Silero VAD engine sample rate ({engine.sample_rate}) doesn't match analyzer sample rate ({sample_rate})"
+            )
+
+        self._model = engine or SileroVADModel.shared()
+        self._stream = SileroVADStream(sample_rate)
+
+        self._last_reset_time = 0
 
     #
     # VADAnalyzer
@@ -147,14 +348,14 @@ class SileroVADAnalyzer(VADAnalyzer):
             audio_int16 = np.frombuffer(buffer, np.int16)
             # Divide by 32768 because we have signed 16-bit data.
             audio_float32 = np.frombuffer(audio_int16, dtype=np.int16).astype(np.float32) / 32768.0
-            new_confidence = self._model(audio_float32, self.sample_rate)[0]
+            new_confidence = self._model.voice_confidence(self._stream, audio_float32)
 
             # We need to reset the model from time to time because it doesn't
             # really need all the data and memory will keep growing otherwise.
             curr_time = time.time()
             diff_time = curr_time - self._last_reset_time
             if diff_time >= _MODEL_RESET_STATES_TIME:
-                self._model.reset_states()
+                self._stream.reset_states()
                 self._last_reset_time = curr_time
 
             return new_confidence
@@ -5,12 +5,15 @@
 #
 
 from abc import abstractmethod
+from dataclasses import dataclass
 from enum import Enum
+from typing import List
 
 from loguru import logger
 from pydantic import BaseModel
 
-from pipecat.audio.utils import calculate_audio_volume, exp_smoothing
+from pipecat.audio.utils import exp_smoothing
+from pipecat.audio.volume_meter import VolumeMeter
 
 VAD_CONFIDENCE = 0.7
 VAD_START_SECS = 0.2
@@ -25,6 +28,17 @@ class VADState(Enum):
     STOPPING = 4
 
 
+@dataclass
+class VADAnalysis:
+    """Result of analyzing a chunk of audio: the VAD state after the last
+    complete window and the voice confidence of every window analyzed.
+
+    """
+
+    state: VADState
+    confidences: List[float]
+
+
 class VADParams(BaseModel):
     confidence: float = VAD_CONFIDENCE
     start_secs: float = VAD_START_SECS
@@ -39,9 +53,15 @@ class VADAnalyzer:
 
         self.set_params(params)
 
-        self._vad_buffer = b""
+        # Incoming audio is copied into a preallocated buffer and analyzed in
+        # place, window by window. Whatever is left (less than a window) is
+        # moved to the beginning of the buffer when we run out of space.
+        self._vad_buffer = bytearray(self._vad_frames_num_bytes * 8)
+        self._vad_buffer_start = 0
+        self._vad_buffer_end = 0
 
         # Volume exponential smoothing
+        self._volume_meter = VolumeMeter()
         self._smoothing_factor = 0.2
         self._prev_volume = 0
 
@@ -80,26 +100,61 @@ class VADAnalyzer:
         self._vad_state: VADState = VADState.QUIET
 
     def _get_smoothed_volume(self, audio: bytes) -> float:
-        volume = calculate_audio_volume(audio, self._sample_rate)
+        volume = self._volume_meter.volume(audio, self._sample_rate)
         return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
 
     def analyze_audio(self, buffer) -> VADState:
-        self._vad_buffer += buffer
-
-        num_required_bytes = self._vad_frames_num_bytes
-        if len(self._vad_buffer) < num_required_bytes:
-            return self._vad_state
-
-        audio_frames = self._vad_buffer[:num_required_bytes]
-        self._vad_buffer = self._vad_buffer[num_required_bytes:]
-
-        confidence = self.voice_confidence(audio_frames)
-
-        volume = self._get_smoothed_volume(audio_frames)
-        self._prev_volume = volume
-
-        speaking = confidence >= self._params.confidence and volume >= self._params.min_volume
-
+        return self.analyze_audio_windows(buffer).state
+
+    def analyze_audio_windows(self, buffer) -> VADAnalysis:
+        """Analyzes all the complete windows available after adding `buffer`
+        and returns the resulting state and the confidence of each window.
+
+        """
+        self._append_to_vad_buffer(buffer)
+
+        window_size = self._vad_frames_num_bytes
+        view = memoryview(self._vad_buffer)
+        confidences = []
+        while self._vad_buffer_end - self._vad_buffer_start >= window_size:
+            # Windows are passed as memory views, to avoid copying them.
+            audio_frames = view[self._vad_buffer_start : self._vad_buffer_start + window_size]
+            self._vad_buffer_start += window_size
+
+            confidence = self.voice_confidence(audio_frames)
+            confidences.append(confidence)
+
+            volume = self._get_smoothed_volume(audio_frames)
+            self._prev_volume = volume
+
+            speaking = confidence >= self._params.confidence and volume >= self._params.min_volume
+            self._update_state(speaking)
+
+        return VADAnalysis(state=self._vad_state, confidences=confidences)
+
+    def _append_to_vad_buffer(self, buffer):
+        size = len(buffer)
+        pending = self._vad_buffer_end - self._vad_buffer_start
+
+        if self._vad_buffer_end + size > len(self._vad_buffer):
+            # Move the pending audio to the beginning (and grow the buffer if
+            # it's still not big enough, which only happens with chunks much
+            # bigger than a window).
+            if pending + size > len(self._vad_buffer):
+                grown = bytearray(max(pending + size, 2 * len(self._vad_buffer)))
+                grown[:pending] = self._vad_buffer[self._vad_buffer_start : self._vad_buffer_end]
+                self._vad_buffer = grown
+            else:
+                self._vad_buffer[:pending] = self._vad_buffer[
+                    self._vad_buffer_start : self._vad_buffer_end
+                ]
+            self._vad_buffer_start = 0
+            self._vad_buffer_end = pending
+
+        self._vad_buffer[self._vad_buffer_end : self._vad_buffer_end + size] = buffer
+        self._vad_buffer_end += size
+
+    def _update_state(self, speaking: bool):
         if speaking:
             match self._vad_state:
                 case VADState.QUIET:
@@ -134,5 +189,3 @@ class VADAnalyzer:
         ):
             self._vad_state = VADState.QUIET
             self._vad_stopping_count = 0
-
-        return self._vad_state
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import itertools
+import queue
+import threading
+from typing import Callable, List
+
+from loguru import logger
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+
+class VADWorkerStream:
+    """Audio stream analyzed by a `VADWorker`. Audio is queued with
+    `analyze_audio()`, which never blocks, and `callback` is called (from the
+    worker thread) with the new state every time the stream goes from
+    `VADState.QUIET` to `VADState.SPEAKING` or vice versa.
+
+    """
+
+    def __init__(
+        self,
+        analyzer: VADAnalyzer,
+        callback: Callable[[VADState], None],
+        work_queue: queue.SimpleQueue,
+    ):
+        self._analyzer = analyzer
+        self._callback = callback
+        self._queue = work_queue
+        self._state = VADState.QUIET
+        self._closed = False
+
+    @property
+    def analyzer(self) -> VADAnalyzer:
+        return self._analyzer
+
+    def analyze_audio(self, audio: bytes):
+        self._queue.put((self, audio))
+
+    def set_params(self, params: VADParams):
+        """Updates the analyzer parameters, in order with the queued audio."""
+        self._queue.put((self, params))
+
+    def close(self):
+        """Stops analyzing audio. Audio that is still queued is discarded and
+        the callback won't be called anymore.
+
+        """
+        self._closed = True
+
+    def _process(self, item: bytes | VADParams):
+        if self._closed:
+            return
+
+        if isinstance(item, VADParams):
+            self._analyzer.set_params(item)
+            return
+
+        state = self._analyzer.analyze_audio(item)
+        # We just care about changes from QUIET to SPEAKING and vice versa.
+        if state != self._state and state != VADState.STARTING and state != VADState.STOPPING:
+            self._state = state
+            self._callback(state)
+
+
+class VADWorker:
+    """Runs voice activity detection for one or more audio streams (e.g. all
+    the sessions of a process) in long-lived threads. Each stream is assigned
+    to one of the threads and its audio is analyzed in order there.
+
+    Transports using a worker (see `TransportParams.vad_worker`) don't wait for
+    the result of every audio frame, they queue the audio and only hear back
+    when the user starts or stops speaking. This avoids a thread handoff (and
+    an event loop wakeup) per frame, and VAD keeps up with the audio even if
+    the event loop is busy.
+
+    When using a `SileroVADEngine`, use a thread per stream you expect to be
+    speaking at the same time (or more), because a window is analyzed only
+    when its whole batch has run.
+
+    """
+
+    def __init__(self, *, num_threads: int = 1):
+        self._queues: List[queue.SimpleQueue] = [queue.SimpleQueue() for _ in range(num_threads)]
+        self._next_queue = itertools.cycle(self._queues)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def create_stream(
+        self, analyzer: VADAnalyzer, callback: Callable[[VADState], None]
+    ) -> VADWorkerStream:
+        with self._lock:
+            if not self._threads:
+                self._start()
+            return VADWorkerStream(analyzer, callback, next(self._next_queue))
+
+    def stop(self):
+        with self._lock:
+            for q in self._queues:
+                q.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def _start(self):
+        for q in self._queues:
+            thread = threading.Thread(target=self._thread_handler, args=(q,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _thread_handler(self, q: queue.SimpleQueue):
+        while True:
+            item = q.get()
+            if item is None:
+                break
+
+            stream, audio = item
+            try:
+                stream._process(audio)
+            except Exception as e:
+                logger.exception(f"Error analyzing audio in VAD worker: {e}")
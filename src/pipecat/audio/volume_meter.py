@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from functools import lru_cache
+
+from pipecat.audio.utils import normalize_value
+
+# numpy, scipy and pyloudnorm are imported on first use, like in
+# `pipecat.audio.utils`, because the VAD analyzer (and therefore the frames
+# module) depends on this module.
+
+# Blocks quieter than this are silence (ITU-R BS.1770 absolute gate).
+ABSOLUTE_GATE = -70.0
+
+
+@lru_cache(maxsize=8)
+def k_weighting_filter(sample_rate: int):
+    """Returns the K-weighting filter (ITU-R BS.1770) for the given sample rate
+    as second-order sections. These are the same filters `pyloudnorm` uses.
+
+    """
+    import numpy as np
+    import pyloudnorm as pyln
+
+    high_shelf = pyln.IIRfilter(4.0, 1 / np.sqrt(2), 1500.0, sample_rate, "high_shelf")
+    high_pass = pyln.IIRfilter(0.0, 0.5, 38.0, sample_rate, "high_pass")
+    sos = np.array(
+        [
+            np.concatenate((high_shelf.b * high_shelf.passband_gain, high_shelf.a)),
+            np.concatenate((high_pass.b * high_pass.passband_gain, high_pass.a)),
+        ]
+    )
+    return sos
+
+
+class VolumeMeter:
+    """Measures the volume of a stream of 16-bit mono audio, one chunk at a
+    time. It returns the same values as `calculate_audio_volume()`, but the
+    K-weighting filter is only designed once per sample rate and its state is
+    carried from one chunk to the next (so each chunk is not filtered as if it
+    was preceded by silence).
+
+    """
+
+    def __init__(self):
+        self._sample_rate = 0
+        self._sos = None
+        self._zi = None
+
+    def loudness(self, audio: bytes, sample_rate: int) -> float:
+        """Returns the loudness of the next chunk of the stream (in LUFS, with
+        16-bit samples used as is, not scaled to [-1, 1]).
+
+        """
+        import numpy as np
+        from scipy.signal import sosfilt
+
+        if sample_rate != self._sample_rate:
+            self._sample_rate = sample_rate
+            self._sos = k_weighting_filter(sample_rate)
+            self._zi = np.zeros((self._sos.shape[0], 2))
+
+        samples = np.frombuffer(audio, dtype=np.int16)
+        if samples.size == 0:
+            return float("-inf")
+
+        filtered, self._zi = sosfilt(self._sos, samples, zi=self._zi)
+        mean_square = np.dot(filtered, filtered) / filtered.size
+        if mean_square == 0:
+            return float("-inf")
+
+        loudness = -0.691 + 10.0 * np.log10(mean_square)
+        return loudness if loudness >= ABSOLUTE_GATE else float("-inf")
+
+    def volume(self, audio: bytes, sample_rate: int) -> float:
+        """Returns the volume of the next chunk of the stream, from 0 (quiet)
+        to 1 (loud).
+
+        """
+        # Loudness goes from -20 to 80 (more or less), where -20 is quiet and 80
+        # is loud.
+        return normalize_value(self.loudness(audio, sample_rate), -20, 80)
+
+    def reset(self):
+        """Forgets the filter state, e.g. when a new stream starts."""
+        self._sample_rate = 0
@@ -4,7 +4,11 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Awaitable, TypeVar
+
+T = TypeVar("T")
 
 
 class BaseClock(ABC):
@@ -15,3 +19,18 @@ class BaseClock(ABC):
     @abstractmethod
     def start(self):
         pass
+
+    async def sleep(self, seconds: float):
+        """Sleeps for the given number of seconds of this clock's time. Anything
+        that paces output (e.g. audio playback) should sleep through the clock
+        so it can run faster than real time with a virtual clock.
+
+        """
+        await asyncio.sleep(seconds)
+
+    async def wait_for(self, aw: Awaitable[T], timeout: float | None) -> T:
+        """The same as `asyncio.wait_for()` but with a timeout in this clock's
+        time.
+
+        """
+        return await asyncio.wait_for(aw, timeout)
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import heapq
+import itertools
+from typing import Awaitable, List, Tuple, TypeVar
+
+from pipecat.clocks.base_clock import BaseClock
+from pipecat.utils.time import seconds_to_nanoseconds
+
+T = TypeVar("T")
+
+
+class VirtualClock(BaseClock):
+    """A simulated clock for running pipelines faster than real time.
+
+    Time doesn't pass on its own: it only moves forward when every task that
+    needs time to pass is sleeping on the clock (see `sleep()` and
+    `wait_for()`). The clock then jumps to the earliest wake up time and wakes
+    up the tasks sleeping until then, in order. Relative timing, presentation
+    timestamps and interruptions behave as with a real clock, but a pipeline
+    that is only waiting runs as fast as the CPU allows.
+
+    The clock considers the event loop idle when it has gone through
+    `settle_iterations` iterations without any new sleeper. This is meant for
+    offline pipelines (e.g. replaying recorded conversations), any task
+    waiting on real I/O will see virtual time pass faster.
+
+    """
+
+    def __init__(self, *, settle_iterations: int = 10):
+        self._settle_iterations = settle_iterations
+        self._time = 0
+        self._sleepers: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._idle_iterations = 0
+        self._advancing = False
+
+    def get_time(self) -> int:
+        return self._time
+
+    def start(self):
+        # Time starts at 0 and only moves forward, there's nothing to do.
+        pass
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        wake_time = self._time + seconds_to_nanoseconds(seconds)
+        heapq.heappush(self._sleepers, (wake_time, next(self._counter), future))
+        self._idle_iterations = 0
+        if not self._advancing:
+            self._advancing = True
+            loop.call_soon(self._advance, loop)
+        # If we get cancelled the future is cancelled as well and it will be
+        # discarded when advancing.
+        await future
+
+    async def wait_for(self, aw: Awaitable[T], timeout: float | None) -> T:
+        if timeout is None:
+            return await aw
+
+        task = asyncio.ensure_future(aw)
+        timer = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            timer.cancel()
+            raise
+
+        if task.done():
+            timer.cancel()
+            return task.result()
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        raise asyncio.TimeoutError()
+
+    def _advance(self, loop: asyncio.AbstractEventLoop):
+        # Discard sleepers that have been cancelled.
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)
+
+        if not self._sleepers:
+            self._advancing = False
+            return
+
+        # Give other tasks the chance to run (and to sleep) before moving time
+        # forward.
+        if self._idle_iterations < self._settle_iterations:
+            self._idle_iterations += 1
+            loop.call_soon(self._advance, loop)
+            return
+
+        self._idle_iterations = 0
+        self._time = max(self._time, self._sleepers[0][0])
+        while self._sleepers and self._sleepers[0][0] <= self._time:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+
+        loop.call_soon(self._advance, loop)
@@ -19,24 +19,43 @@ def format_pts(pts: int | None):
     return nanoseconds_to_str(pts) if pts else None
 
 
-@dataclass
+@dataclass(slots=True)
 class Frame:
-    """Base frame class."""
+    """Base frame class.
+
+    Frames are slotted dataclasses, which makes them cheaper to create and
+    smaller in memory (many frames are created every second). Subclasses don't
+    need to be slotted, but note that zero-argument `super()` can't be used
+    inside slotted dataclasses (the class is re-created by `dataclass`).
+
+    """
 
     id: int = field(init=False)
-    name: str = field(init=False)
+    _name: Optional[str] = field(init=False, repr=False, compare=False)
     pts: Optional[int] = field(init=False)
 
     def __post_init__(self):
         self.id: int = obj_id()
-        self.name: str = f"{self.__class__.__name__}#{obj_count(self)}"
+        self._name: Optional[str] = None
         self.pts: Optional[int] = None
 
+    @property
+    def name(self) -> str:
+        # Names are only used for logging and debugging, so we only build them
+        # the first time they are needed.
+        if self._name is None:
+            self._name = f"{self.__class__.__name__}#{obj_count(self)}"
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+
     def __str__(self):
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemFrame(Frame):
     """System frames are frames that are not internally queued by any of the
     frame processors and should be processed immediately.
@@ -46,7 +65,7 @@ class SystemFrame(Frame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFrame(Frame):
     """Data frames are frames that will be processed in order and usually
     contain data such as LLM context, text, audio or images.
@@ -56,7 +75,7 @@ class DataFrame(Frame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ControlFrame(Frame):
     """Control frames are frames that, similar to data frames, will be processed
     in order and usually contain control information such as frames to update
@@ -76,6 +95,9 @@ class ControlFrame(Frame):
 class AudioRawFrame:
     """A chunk of audio."""
 
+    # This is a mixin, the actual storage is in the slotted frame classes.
+    __slots__ = ()
+
     audio: bytes
     sample_rate: int
     num_channels: int
@@ -89,6 +111,9 @@ class AudioRawFrame:
 class ImageRawFrame:
     """A raw image."""
 
+    # This is a mixin, the actual storage is in the slotted frame classes.
+    __slots__ = ()
+
     image: bytes
     size: Tuple[int, int]
     format: str | None
@@ -99,7 +124,7 @@ class ImageRawFrame:
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputAudioRawFrame(DataFrame, AudioRawFrame):
     """A chunk of audio. Will be played by the output transport if the
     transport's microphone has been enabled.
@@ -107,15 +132,15 @@ class OutputAudioRawFrame(DataFrame, AudioRawFrame):
     """
 
     def __post_init__(self):
-        super().__post_init__()
-        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+        DataFrame.__post_init__(self)
+        AudioRawFrame.__post_init__(self)
 
     def __str__(self):
         pts = format_pts(self.pts)
         return f"{self.name}(pts: {pts}, size: {len(self.audio)}, frames: {self.num_frames}, sample_rate: {self.sample_rate}, channels: {self.num_channels})"
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputImageRawFrame(DataFrame, ImageRawFrame):
     """An image that will be shown by the transport if the transport's camera is
     enabled.
@@ -127,14 +152,14 @@ class OutputImageRawFrame(DataFrame, ImageRawFrame):
         return f"{self.name}(pts: {pts}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSAudioRawFrame(OutputAudioRawFrame):
     """A chunk of output audio generated by a TTS service."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class URLImageRawFrame(OutputImageRawFrame):
     """An output image with an associated URL. These images are usually
     generated by third-party services that provide a URL to download the image.
@@ -148,7 +173,7 @@ class URLImageRawFrame(OutputImageRawFrame):
         return f"{self.name}(pts: {pts}, url: {self.url}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpriteFrame(DataFrame):
     """An animated sprite. Will be shown by the transport if the transport's
     camera is enabled. Will play at the framerate specified in the transport's
@@ -163,7 +188,7 @@ class SpriteFrame(DataFrame):
         return f"{self.name}(pts: {pts}, size: {len(self.images)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TextFrame(DataFrame):
     """A chunk of text. Emitted by LLM services, consumed by TTS services, can
     be used to send text through processors.
@@ -177,7 +202,7 @@ class TextFrame(DataFrame):
         return f"{self.name}(pts: {pts}, text: [{self.text}])"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessagesFrame(DataFrame):
     """A frame containing a list of LLM messages. Used to signal that an LLM
     service should run a chat completion and emit an LLMFullResponseStartFrame,
@@ -190,7 +215,7 @@ class LLMMessagesFrame(DataFrame):
     messages: List[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessagesAppendFrame(DataFrame):
     """A frame containing a list of LLM messages that need to be added to the
     current context.
@@ -200,7 +225,7 @@ class LLMMessagesAppendFrame(DataFrame):
     messages: List[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessagesUpdateFrame(DataFrame):
     """A frame containing a list of new LLM messages. These messages will
     replace the current context LLM messages and should generate a new
@@ -211,7 +236,7 @@ class LLMMessagesUpdateFrame(DataFrame):
     messages: List[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMSetToolsFrame(DataFrame):
     """A frame containing a list of tools for an LLM to use for function calling.
     The specific format depends on the LLM being used, but it should typically
@@ -221,14 +246,14 @@ class LLMSetToolsFrame(DataFrame):
     tools: List[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMEnablePromptCachingFrame(DataFrame):
     """A frame to enable/disable prompt caching in certain LLMs."""
 
     enable: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionCallResultFrame(DataFrame):
     """A frame containing the result of an LLM function (tool) call."""
 
@@ -239,7 +264,7 @@ class FunctionCallResultFrame(DataFrame):
     run_llm: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSSpeakFrame(DataFrame):
     """A frame that contains a text that should be spoken by the TTS in the
     pipeline (if any).
@@ -249,7 +274,7 @@ class TTSSpeakFrame(DataFrame):
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TransportMessageFrame(DataFrame):
     message: Any
 
@@ -262,7 +287,7 @@ class TransportMessageFrame(DataFrame):
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class StartFrame(SystemFrame):
     """This is the first frame that should be pushed down a pipeline."""
 
@@ -271,16 +296,18 @@ class StartFrame(SystemFrame):
     enable_metrics: bool = False
     enable_usage_metrics: bool = False
     report_only_initial_ttfb: bool = False
+    enable_instrumentation: bool = False
+    instrumentation_sample_interval: int = 16
 
 
-@dataclass
+@dataclass(slots=True)
 class CancelFrame(SystemFrame):
     """Indicates that a pipeline needs to stop right away."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorFrame(SystemFrame):
     """This is used notify upstream that an error has occurred downstream the
     pipeline. A fatal error indicates the error is unrecoverable and that the
@@ -295,7 +322,7 @@ class ErrorFrame(SystemFrame):
         return f"{self.name}(error: {self.error}, fatal: {self.fatal})"
 
 
-@dataclass
+@dataclass(slots=True)
 class FatalErrorFrame(ErrorFrame):
     """This is used notify upstream that an unrecoverable error has occurred and
     that the bot should exit.
@@ -305,7 +332,7 @@ class FatalErrorFrame(ErrorFrame):
     fatal: bool = field(default=True, init=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class EndTaskFrame(SystemFrame):
     """This is used to notify the pipeline task that the pipeline should be
     closed nicely (flushing all the queued frames) by pushing an EndFrame
@@ -316,7 +343,7 @@ class EndTaskFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class CancelTaskFrame(SystemFrame):
     """This is used to notify the pipeline task that the pipeline should be
     stopped immediately by pushing a CancelFrame downstream.
@@ -326,7 +353,7 @@ class CancelTaskFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StopTaskFrame(SystemFrame):
     """Indicates that a pipeline task should be stopped but that the pipeline
     processors should be kept in a running state. This is normally queued from
@@ -337,7 +364,7 @@ class StopTaskFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StartInterruptionFrame(SystemFrame):
     """Emitted by VAD to indicate that a user has started speaking (i.e. is
     interruption). This is similar to UserStartedSpeakingFrame except that it
@@ -349,7 +376,7 @@ class StartInterruptionFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StopInterruptionFrame(SystemFrame):
     """Emitted by VAD to indicate that a user has stopped speaking (i.e. no more
     interruptions). This is similar to UserStoppedSpeakingFrame except that it
@@ -361,7 +388,7 @@ class StopInterruptionFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStartedSpeakingFrame(SystemFrame):
     """Emitted by VAD to indicate that a user has started speaking. This can be
     used for interruptions or other times when detecting that someone is
@@ -373,14 +400,14 @@ class UserStartedSpeakingFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStoppedSpeakingFrame(SystemFrame):
     """Emitted by the VAD to indicate that a user stopped speaking."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BotInterruptionFrame(SystemFrame):
     """Emitted by when the bot should be interrupted. This will mainly cause the
     same actions as if the user interrupted except that the
@@ -391,21 +418,21 @@ class BotInterruptionFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BotStartedSpeakingFrame(SystemFrame):
     """Emitted upstream by transport outputs to indicate the bot started speaking."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BotStoppedSpeakingFrame(SystemFrame):
     """Emitted upstream by transport outputs to indicate the bot stopped speaking."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BotSpeakingFrame(SystemFrame):
     """Emitted upstream by transport outputs while the bot is still
     speaking. This can be used, for example, to detect when a user is idle. That
@@ -417,14 +444,14 @@ class BotSpeakingFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricsFrame(SystemFrame):
     """Emitted by processor that can compute metrics like latencies."""
 
     data: List[MetricsData]
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionCallInProgressFrame(SystemFrame):
     """A frame signaling that a function call is in progress."""
 
@@ -433,7 +460,7 @@ class FunctionCallInProgressFrame(SystemFrame):
     arguments: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TransportMessageUrgentFrame(SystemFrame):
     message: Any
 
@@ -441,7 +468,7 @@ class TransportMessageUrgentFrame(SystemFrame):
         return f"{self.name}(message: {self.message})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionFrame(SystemFrame):
     """A text frame with transcription-specific data. Will be placed in the
     transport's receive queue when a participant speaks.
@@ -457,7 +484,7 @@ class TranscriptionFrame(SystemFrame):
         return f"{self.name}(user: {self.user_id}, text: [{self.text}], language: {self.language}, timestamp: {self.timestamp})"
 
 
-@dataclass
+@dataclass(slots=True)
 class InterimTranscriptionFrame(SystemFrame):
     """A text frame with interim transcription-specific data. Will be placed in
     the transport's receive queue when a participant speaks."""
@@ -471,7 +498,7 @@ class InterimTranscriptionFrame(SystemFrame):
         return f"{self.name}(user: {self.user_id}, text: [{self.text}], language: {self.language}, timestamp: {self.timestamp})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserImageRequestFrame(SystemFrame):
     """A frame user to request an image from the given user."""
 
@@ -482,20 +509,20 @@ class UserImageRequestFrame(SystemFrame):
         return f"{self.name}, user: {self.user_id}"
 
 
-@dataclass
+@dataclass(slots=True)
 class InputAudioRawFrame(SystemFrame, AudioRawFrame):
     """A chunk of audio usually coming from an input transport."""
 
     def __post_init__(self):
-        super().__post_init__()
-        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+        SystemFrame.__post_init__(self)
+        AudioRawFrame.__post_init__(self)
 
     def __str__(self):
         pts = format_pts(self.pts)
         return f"{self.name}(pts: {pts}, size: {len(self.audio)}, frames: {self.num_frames}, sample_rate: {self.sample_rate}, channels: {self.num_channels})"
 
 
-@dataclass
+@dataclass(slots=True)
 class InputImageRawFrame(SystemFrame, ImageRawFrame):
     """An image usually coming from an input transport."""
 
@@ -504,7 +531,7 @@ class InputImageRawFrame(SystemFrame, ImageRawFrame):
         return f"{self.name}(pts: {pts}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserImageRawFrame(InputImageRawFrame):
     """An image associated to a user."""
 
@@ -515,7 +542,7 @@ class UserImageRawFrame(InputImageRawFrame):
         return f"{self.name}(pts: {pts}, user: {self.user_id}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class VisionImageRawFrame(InputImageRawFrame):
     """An image with an associated text to ask for a description of it."""
 
@@ -531,7 +558,7 @@ class VisionImageRawFrame(InputImageRawFrame):
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class EndFrame(ControlFrame):
     """Indicates that a pipeline has ended and frame processors and pipelines
     should be shut down. If the transport receives this frame, it will stop
@@ -544,7 +571,7 @@ class EndFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMFullResponseStartFrame(ControlFrame):
     """Used to indicate the beginning of an LLM response. Following by one or
     more TextFrame and a final LLMFullResponseEndFrame."""
@@ -552,14 +579,14 @@ class LLMFullResponseStartFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMFullResponseEndFrame(ControlFrame):
     """Indicates the end of an LLM response."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStartedFrame(ControlFrame):
     """Used to indicate the beginning of a TTS response. Following
     TTSAudioRawFrames are part of the TTS response until an
@@ -572,43 +599,43 @@ class TTSStartedFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStoppedFrame(ControlFrame):
     """Indicates the end of a TTS response."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceUpdateSettingsFrame(ControlFrame):
     """A control frame containing a request to update service settings."""
 
     settings: Mapping[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMUpdateSettingsFrame(ServiceUpdateSettingsFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSUpdateSettingsFrame(ServiceUpdateSettingsFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class STTMuteFrame(ControlFrame):
     """Control frame to mute/unmute the STT service."""
 
     mute: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class STTUpdateSettingsFrame(ServiceUpdateSettingsFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class VADParamsUpdateFrame(ControlFrame):
     """A control frame containing a request to update VAD params. Intended
     to be pushed upstream from RTVI processor.
@@ -617,42 +644,42 @@ class VADParamsUpdateFrame(ControlFrame):
     params: VADParams
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterControlFrame(ControlFrame):
     """Base control frame for other audio filter frames."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterUpdateSettingsFrame(FilterControlFrame):
     """Control frame to update filter settings."""
 
     settings: Mapping[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterEnableFrame(FilterControlFrame):
     """Control frame to enable or disable the filter at runtime."""
 
     enable: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class MixerControlFrame(ControlFrame):
     """Base control frame for other audio mixer frames."""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class MixerUpdateSettingsFrame(MixerControlFrame):
     """Control frame to update mixer settings."""
 
     settings: Mapping[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class MixerEnableFrame(MixerControlFrame):
     """Control frame to enable or disable the mixer at runtime."""
 
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel
 
 
@@ -29,3 +29,26 @@ class LLMUsageMetricsData(MetricsData):
 
 class TTSUsageMetricsData(MetricsData):
     value: int
+
+
+class LatencyHistogramData(BaseModel):
+    count: int
+    mean: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class QueueDepthData(BaseModel):
+    mean: float
+    max: int
+
+
+class FrameProcessorInstrumentationData(MetricsData):
+    process_time: LatencyHistogramData
+    input_queue_wait: LatencyHistogramData
+    push_queue_wait: LatencyHistogramData
+    input_queue_depth: QueueDepthData
+    push_queue_depth: QueueDepthData
+    frames_per_second: Dict[str, float]
@@ -18,3 +18,10 @@ class BasePipeline(FrameProcessor):
     @abstractmethod
     def processors_with_metrics(self) -> List[FrameProcessor]:
         pass
+
+    def processors_with_instrumentation(self) -> List[FrameProcessor]:
+        """Processors with instrumentation enabled. Pipelines that don't
+        override this don't report any instrumentation data.
+
+        """
+        return []
@@ -94,6 +94,11 @@ class ParallelPipeline(BasePipeline):
     def processors_with_metrics(self) -> List[FrameProcessor]:
         return list(chain.from_iterable(p.processors_with_metrics() for p in self._pipelines))
 
+    def processors_with_instrumentation(self) -> List[FrameProcessor]:
+        return list(
+            chain.from_iterable(p.processors_with_instrumentation() for p in self._pipelines)
+        )
+
     #
     # Frame processor
     #
@@ -125,11 +130,13 @@ class ParallelPipeline(BasePipeline):
             await self.push_frame(frame, direction)
 
         # If we get an EndFrame we stop our queue processing tasks and wait on
-        # all the pipelines to finish.
+        # all the pipelines to finish. The downstream task finishes by itself
+        # once the EndFrame has gone through all the pipelines.
         if isinstance(frame, (CancelFrame, EndFrame)):
             # Use None to indicate when queues should be done processing.
             await self._up_queue.put(None)
-            await self._down_queue.put(None)
+            if isinstance(frame, CancelFrame):
+                await self._down_queue.put(None)
             if self._up_task:
                 await self._up_task
             if self._down_task:
@@ -149,10 +156,18 @@ class ParallelPipeline(BasePipeline):
     async def _process_down_queue(self):
         running = True
         seen_ids = set()
+        end_frames = 0
         while running:
             frame = await self._down_queue.get()
-            if frame and frame.id not in seen_ids:
-                await self.push_frame(frame, FrameDirection.DOWNSTREAM)
-                seen_ids.add(frame.id)
-            running = frame is not None
+            if isinstance(frame, EndFrame):
+                # Only push EndFrame once every pipeline is done.
+                end_frames += 1
+                running = end_frames < len(self._sinks)
+                if not running:
+                    await self.push_frame(frame, FrameDirection.DOWNSTREAM)
+            else:
+                if frame and frame.id not in seen_ids:
+                    await self.push_frame(frame, FrameDirection.DOWNSTREAM)
+                    seen_ids.add(frame.id)
+                running = frame is not None
             self._down_queue.task_done()
@@ -16,6 +16,9 @@ class PipelineSource(FrameProcessor):
         super().__init__()
         self._upstream_push_frame = upstream_push_frame
 
+    def can_process_inline(self) -> bool:
+        return True
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
@@ -31,6 +34,9 @@ class PipelineSink(FrameProcessor):
         super().__init__()
         self._downstream_push_frame = downstream_push_frame
 
+    def can_process_inline(self) -> bool:
+        return True
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
@@ -42,7 +48,7 @@ class PipelineSink(FrameProcessor):
 
 
 class Pipeline(BasePipeline):
-    def __init__(self, processors: List[FrameProcessor]):
+    def __init__(self, processors: List[FrameProcessor], *, inline_processing: bool = False):
         super().__init__()
 
         # Add a source and a sink queue so we can forward frames upstream and
@@ -53,6 +59,9 @@ class Pipeline(BasePipeline):
 
         self._link_processors()
 
+        if inline_processing:
+            self.enable_inline_processing()
+
     #
     # BasePipeline
     #
@@ -66,10 +75,30 @@ class Pipeline(BasePipeline):
                 services.append(p)
         return services
 
+    def processors_with_instrumentation(self):
+        processors = []
+        # Skip our source and sink, they just forward frames.
+        for p in self._processors[1:-1]:
+            if isinstance(p, BasePipeline):
+                processors.extend(p.processors_with_instrumentation())
+            elif p.instrumentation:
+                processors.append(p)
+        return processors
+
     #
     # Frame processor
     #
 
+    def can_process_inline(self) -> bool:
+        return True
+
+    def enable_inline_processing(self) -> bool:
+        # Enabling inline processing in a pipeline enables it in all the
+        # processors (including nested pipelines) that support it.
+        for p in self._processors:
+            p.enable_inline_processing()
+        return super().enable_inline_processing()
+
     async def cleanup(self):
         await self._cleanup_processors()
 
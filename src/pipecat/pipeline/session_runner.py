@@ -0,0 +1,290 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from loguru import logger
+from pydantic import BaseModel
+
+from pipecat.audio.vad.vad_worker import VADWorker
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_queue import FrameQueueStats
+
+
+class SessionAdmissionParams(BaseModel):
+    """Admission control for `MultiSessionPipelineRunner`.
+
+    max_sessions: maximum number of sessions running at the same time (0 means
+        no limit).
+    max_pending_sessions: maximum number of sessions waiting to be admitted. If
+        there's no room in the pending queue the session is rejected.
+    admission_timeout: maximum time (in seconds) a session waits to be
+        admitted before being rejected (None waits forever).
+    max_loop_lag: new sessions are not admitted while the event loop lag (in
+        seconds) is above this value (0 disables the check).
+    max_cpu_usage: new sessions are not admitted while the process CPU usage
+        (1.0 is a full core) is above this value (0 disables the check). This is
+        the CPU used by the whole process, including other threads (e.g. VAD
+        workers or audio filter chains), not just the event loop.
+    monitor_interval: how often (in seconds) event loop lag and CPU usage are
+        sampled.
+
+    """
+
+    max_sessions: int = 0
+    max_pending_sessions: int = 0
+    admission_timeout: Optional[float] = None
+    max_loop_lag: float = 0.0
+    max_cpu_usage: float = 0.0
+    monitor_interval: float = 0.5
+
+
+class SessionRejectedError(Exception):
+    pass
+
+
+class SharedResources:
+    """Heavy resources that the sessions of a runner can share.
+
+    Nothing is shared automatically: sessions have to be built with these
+    resources, e.g. `TransportParams(vad_worker=runner.resources.vad_worker)`
+    or a service created with `runner.resources.http_session`. Silero VAD
+    models don't need to be here, `SileroVADModel.shared()` is already shared
+    by the whole process. Anything else can be shared with `get_or_create()`,
+    which creates a resource the first time it's requested and returns the
+    same instance afterwards.
+
+    """
+
+    def __init__(self, *, max_workers: int | None = None, vad_worker_threads: int = 1):
+        self._max_workers = max_workers
+        self._vad_worker_threads = vad_worker_threads
+        self._executor: ThreadPoolExecutor | None = None
+        self._http_session: aiohttp.ClientSession | None = None
+        self._vad_worker: VADWorker | None = None
+        self._resources: Dict[str, Any] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    @property
+    def http_session(self) -> aiohttp.ClientSession:
+        if not self._http_session or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
+
+    @property
+    def vad_worker(self) -> VADWorker:
+        if not self._vad_worker:
+            self._vad_worker = VADWorker(num_threads=self._vad_worker_threads)
+        return self._vad_worker
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        if key not in self._resources:
+            self._resources[key] = factory()
+        return self._resources[key]
+
+    async def close(self):
+        if self._http_session:
+            await self._http_session.close()
+            self._http_session = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._vad_worker:
+            await asyncio.to_thread(self._vad_worker.stop)
+            self._vad_worker = None
+        self._resources.clear()
+
+
+@dataclass
+class SessionStats:
+    name: str
+    queued_at: float
+    admitted_at: float | None = None
+    finished_at: float | None = None
+    queue_stats: FrameQueueStats = field(default_factory=FrameQueueStats)
+
+    @property
+    def admission_wait(self) -> float:
+        end = self.admitted_at or time.monotonic()
+        return end - self.queued_at
+
+    @property
+    def duration(self) -> float:
+        if not self.admitted_at:
+            return 0.0
+        end = self.finished_at or time.monotonic()
+        return end - self.admitted_at
+
+
+@dataclass
+class RunnerStats:
+    running_sessions: int = 0
+    pending_sessions: int = 0
+    admitted_sessions: int = 0
+    rejected_sessions: int = 0
+    finished_sessions: int = 0
+    loop_lag: float = 0.0
+    cpu_usage: float = 0.0
+
+
+class MultiSessionPipelineRunner(PipelineRunner):
+    """Runs many pipeline tasks (sessions) in the same event loop.
+
+    `run()` can be called concurrently, once per session. Sessions are admitted
+    while there's capacity (see `SessionAdmissionParams`), otherwise they wait
+    in a pending queue or are rejected with `SessionRejectedError`. Overload
+    only affects new sessions, running sessions are never stopped.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str | None = None,
+        handle_sigint: bool = True,
+        params: SessionAdmissionParams = SessionAdmissionParams(),
+        resources: SharedResources | None = None,
+    ):
+        super().__init__(name=name, handle_sigint=handle_sigint)
+        self._params = params
+        self._resources = resources or SharedResources()
+
+        self._running = 0
+        self._stats = RunnerStats()
+        self._sessions: Dict[str, SessionStats] = {}
+        self._waiters: deque[asyncio.Future] = deque()
+        self._monitor_task: asyncio.Task | None = None
+
+    @property
+    def resources(self) -> SharedResources:
+        return self._resources
+
+    @property
+    def stats(self) -> RunnerStats:
+        self._stats.running_sessions = self._running
+        self._stats.pending_sessions = len(self._waiters)
+        return self._stats
+
+    def session_stats(self) -> List[SessionStats]:
+        return list(self._sessions.values())
+
+    async def run(self, task: PipelineTask):
+        self._maybe_start_monitor()
+
+        session = SessionStats(
+            name=task.name, queued_at=time.monotonic(), queue_stats=task.queue_stats
+        )
+        self._sessions[task.name] = session
+        try:
+            await self._admit(session)
+        except BaseException:
+            del self._sessions[task.name]
+            raise
+
+        try:
+            await super().run(task)
+        finally:
+            session.finished_at = time.monotonic()
+            self._running -= 1
+            self._stats.finished_sessions += 1
+            del self._sessions[task.name]
+            self._admit_waiters()
+
+    async def cleanup(self):
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        await self._resources.close()
+
+    #
+    # Admission control
+    #
+
+    def _overloaded(self) -> bool:
+        if self._params.max_sessions and self._running >= self._params.max_sessions:
+            return True
+        if self._params.max_loop_lag and self._stats.loop_lag > self._params.max_loop_lag:
+            return True
+        if self._params.max_cpu_usage and self._stats.cpu_usage > self._params.max_cpu_usage:
+            return True
+        return False
+
+    async def _admit(self, session: SessionStats):
+        if self._waiters or self._overloaded():
+            await self._wait_for_admission(session)
+        else:
+            self._running += 1
+        self._stats.admitted_sessions += 1
+        session.admitted_at = time.monotonic()
+
+    async def _wait_for_admission(self, session: SessionStats):
+        if len(self._waiters) >= self._params.max_pending_sessions:
+            self._reject(session, "too many pending sessions")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        logger.debug(f"Runner {self} queued session {session.name}")
+        try:
+            await asyncio.wait_for(waiter, timeout=self._params.admission_timeout)
+        except asyncio.TimeoutError:
+            self._reject(session, "admission timeout")
+        except asyncio.CancelledError:
+            # We might have been admitted right before being cancelled.
+            if waiter.done() and not waiter.cancelled():
+                self._running -= 1
+                self._admit_waiters()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def _admit_waiters(self):
+        while self._waiters and not self._overloaded():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._running += 1
+                waiter.set_result(None)
+
+    def _reject(self, session: SessionStats, reason: str):
+        self._stats.rejected_sessions += 1
+        logger.warning(f"Runner {self} rejected session {session.name}: {reason}")
+        raise SessionRejectedError(reason)
+
+    #
+    # Load monitor
+    #
+
+    def _maybe_start_monitor(self):
+        if not self._monitor_task:
+            self._monitor_task = asyncio.create_task(self._monitor_task_handler())
+
+    async def _monitor_task_handler(self):
+        interval = self._params.monitor_interval
+        while True:
+            wall_start = time.monotonic()
+            cpu_start = time.process_time()
+            await asyncio.sleep(interval)
+            elapsed = time.monotonic() - wall_start
+            self._stats.loop_lag = max(0.0, elapsed - interval)
+            self._stats.cpu_usage = (time.process_time() - cpu_start) / elapsed
+            # Load might have gone down.
+            self._admit_waiters()
@@ -0,0 +1,392 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Run pipelines on several CPU cores.
+
+`ShardedPipelineRunner` creates a listening socket and forks a number of
+worker processes that inherit it. Each worker has its own event loop and
+`PipelineRunner`, and runs a user provided worker function that creates
+sessions (pipeline tasks) whose transports serve on the shared socket. This
+way a single listening socket fans out to many cores.
+
+Workers only take new sessions when they are the least loaded worker (see
+`WorkerContext.wait_for_turn()`), and report their health periodically to
+the parent process.
+
+With `WebsocketServerTransport`, which serves a single client per session,
+each session is created when it's the worker's turn. While the session waits
+for its client (inside `ctx.accepting()`) it doesn't count as load, and the
+next session is only created once the client connects:
+
+    async def worker(ctx: WorkerContext):
+        while await ctx.wait_for_turn():
+            connected = asyncio.Event()
+            transport = WebsocketServerTransport(params=..., sock=ctx.sock)
+
+            @transport.event_handler("on_client_connected")
+            async def on_client_connected(transport, client):
+                connected.set()
+
+            task = PipelineTask(Pipeline([transport.input(), ..., transport.output()]))
+            async with ctx.accepting():
+                ctx.start(task)
+                await connected.wait()
+
+    ShardedPipelineRunner(worker, host="0.0.0.0", port=8765).run()
+
+With `FastAPIWebsocketTransport`, the worker function serves the FastAPI
+application on the shared socket (e.g. `await uvicorn.Server(config).serve(
+sockets=[ctx.sock])`) and the websocket endpoint runs its pipeline task with
+`await ctx.run(task)`. Note that uvicorn accepts connections on every worker
+all the time, so sessions are spread by the kernel and not by load: the
+least loaded assignment above doesn't hold. If that matters, the endpoint can
+use `ctx.is_least_loaded()` as an admission check and reject the handshake
+(so the client connects again) before accepting the websocket:
+
+    @app.websocket("/ws")
+    async def websocket_endpoint(websocket: WebSocket):
+        if not ctx.is_least_loaded():
+            await websocket.close()
+            return
+        await websocket.accept()
+        ...
+
+On SIGTERM (or SIGINT) the parent asks all workers to drain: workers stop
+taking new sessions and wait for the running ones to finish. If they don't
+finish within `drain_timeout`, or if a second signal is received, the
+worker's `PipelineRunner` is cancelled like on a regular SIGINT. Sessions
+still waiting for their client (inside `ctx.accepting()`) are not waited
+for, they are cancelled once the others are done.
+
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+
+
+class ShardedRunnerParams(BaseModel):
+    num_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    max_sessions_per_worker: int = 0
+    health_interval: float = 1.0
+    drain_timeout: Optional[float] = 30.0
+    restart_workers: bool = True
+
+
+@dataclass
+class WorkerHealth:
+    worker_id: int
+    pid: int
+    sessions: int
+    accepting: bool
+    finished_sessions: int
+    loop_lag: float
+    draining: bool
+    timestamp: float
+
+
+class WorkerContext:
+    """Everything a worker function needs. It lives in the worker process."""
+
+    # How often we check the other workers load while waiting for our turn.
+    TURN_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        worker_id: int,
+        sock: socket.socket,
+        sessions,
+        accepting,
+        params: ShardedRunnerParams,
+    ):
+        self._worker_id = worker_id
+        self._sock = sock
+        # These are shared by all workers, indexed by worker id.
+        self._sessions = sessions
+        self._accepting = accepting
+        self._params = params
+
+        self._runner = PipelineRunner(name=f"Worker#{worker_id}", handle_sigint=False)
+        self._tasks: Set[asyncio.Task] = set()
+        self._finished_sessions = 0
+        self._draining = asyncio.Event()
+
+    @property
+    def worker_id(self) -> int:
+        return self._worker_id
+
+    @property
+    def sock(self) -> socket.socket:
+        return self._sock
+
+    @property
+    def runner(self) -> PipelineRunner:
+        return self._runner
+
+    @property
+    def sessions(self) -> int:
+        return self._sessions[self._worker_id]
+
+    @property
+    def accepting_sessions(self) -> bool:
+        return self._accepting[self._worker_id] > 0
+
+    @property
+    def finished_sessions(self) -> int:
+        return self._finished_sessions
+
+    @property
+    def draining(self) -> bool:
+        return self._draining.is_set()
+
+    def is_least_loaded(self) -> bool:
+        max_sessions = self._params.max_sessions_per_worker
+        if max_sessions and self.sessions >= max_sessions:
+            return False
+        # Workers that are not alive have a negative number of sessions.
+        loads = [
+            sessions - accepting
+            for sessions, accepting in zip(self._sessions, self._accepting)
+            if sessions >= 0
+        ]
+        return self._load() <= min(loads)
+
+    async def wait_for_turn(self) -> bool:
+        """Waits until this worker is the least loaded one. Returns False if the
+        worker is draining and shouldn't take any new session.
+
+        """
+        while not self.draining:
+            if self.is_least_loaded():
+                return True
+            try:
+                await asyncio.wait_for(self._draining.wait(), timeout=self.TURN_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        return False
+
+    @asynccontextmanager
+    async def accepting(self):
+        """Marks the worker as accepting a new client. A session started while
+        accepting doesn't count as load until the context exits, which should
+        happen once the session gets its client.
+
+        """
+        self._accepting[self._worker_id] += 1
+        try:
+            yield
+        finally:
+            self._accepting[self._worker_id] -= 1
+
+    async def run(self, task: PipelineTask):
+        self._sessions[self._worker_id] += 1
+        try:
+            await self._runner.run(task)
+        finally:
+            self._sessions[self._worker_id] -= 1
+            self._finished_sessions += 1
+
+    def start(self, task: PipelineTask) -> asyncio.Task:
+        t = asyncio.create_task(self.run(task))
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+        return t
+
+    def _drain(self):
+        if self.draining:
+            # We have been asked twice, don't wait anymore.
+            asyncio.create_task(self._runner._sig_handler())
+        else:
+            logger.info(f"Worker {self._worker_id} draining {self.sessions} sessions")
+            self._draining.set()
+
+    def _load(self) -> int:
+        return self._sessions[self._worker_id] - self._accepting[self._worker_id]
+
+    async def _wait_for_draining(self):
+        await self._draining.wait()
+
+    async def _wait_for_sessions(self):
+        while self._load() > 0:
+            await asyncio.sleep(self.TURN_POLL_INTERVAL)
+
+
+class ShardedPipelineRunner:
+    def __init__(
+        self,
+        worker: Callable[[WorkerContext], Awaitable[None]],
+        *,
+        host: str = "localhost",
+        port: int = 8765,
+        sock: socket.socket | None = None,
+        params: ShardedRunnerParams = ShardedRunnerParams(),
+    ):
+        self._worker = worker
+        self._host = host
+        self._port = port
+        self._sock = sock
+        self._params = params
+
+        self._mp = multiprocessing.get_context("fork")
+        self._sessions = self._mp.Array("i", params.num_workers, lock=False)
+        self._accepting = self._mp.Array("i", params.num_workers, lock=False)
+        self._health_queue = self._mp.Queue()
+        self._health: Dict[int, WorkerHealth] = {}
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._drain_requests = 0
+
+    @property
+    def sock(self) -> socket.socket | None:
+        return self._sock
+
+    def health(self) -> List[WorkerHealth]:
+        return [self._health[i] for i in sorted(self._health)]
+
+    def stop(self):
+        """Asks all workers to drain. The same as sending SIGTERM to the parent."""
+        self._drain_requests += 1
+
+    def run(self):
+        if not self._sock:
+            self._sock = socket.create_server((self._host, self._port))
+        logger.info(f"Starting {self._params.num_workers} workers on {self._sock.getsockname()}")
+
+        prev_handlers = {
+            sig: signal.signal(sig, lambda *args: self.stop())
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            for worker_id in range(self._params.num_workers):
+                self._start_worker(worker_id)
+            self._monitor()
+        finally:
+            for sig, handler in prev_handlers.items():
+                signal.signal(sig, handler)
+            self._sock.close()
+
+    #
+    # Parent process
+    #
+
+    def _start_worker(self, worker_id: int):
+        self._sessions[worker_id] = 0
+        self._accepting[worker_id] = 0
+        process = self._mp.Process(target=self._worker_main, args=(worker_id,))
+        process.start()
+        self._processes[worker_id] = process
+        logger.debug(f"Started worker {worker_id} (pid {process.pid})")
+
+    def _monitor(self):
+        drain_requests_sent = 0
+        while self._processes:
+            if drain_requests_sent < self._drain_requests:
+                logger.warning("Interruption detected. Draining workers")
+                for process in self._processes.values():
+                    process.terminate()
+                drain_requests_sent = self._drain_requests
+
+            try:
+                health: WorkerHealth = self._health_queue.get(timeout=self._params.health_interval)
+                self._health[health.worker_id] = health
+            except queue.Empty:
+                pass
+
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive():
+                    continue
+                process.join()
+                del self._processes[worker_id]
+                self._sessions[worker_id] = -1
+                if self._drain_requests:
+                    logger.debug(f"Worker {worker_id} finished")
+                elif self._params.restart_workers and process.exitcode != 0:
+                    logger.warning(f"Worker {worker_id} exited ({process.exitcode}), restarting")
+                    self._start_worker(worker_id)
+
+    #
+    # Worker process
+    #
+
+    def _worker_main(self, worker_id: int):
+        # The parent handles SIGINT and tells us to drain with SIGTERM.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        if not asyncio.run(self._worker_handler(worker_id)):
+            # Exit with an error so the parent restarts us.
+            sys.exit(1)
+
+    async def _worker_handler(self, worker_id: int) -> bool:
+        """Runs the worker function until it finishes or we are asked to
+        drain. Returns False if the worker function failed.
+
+        """
+        ctx = WorkerContext(worker_id, self._sock, self._sessions, self._accepting, self._params)
+
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, ctx._drain)
+
+        health_task = asyncio.create_task(self._health_task_handler(ctx))
+        worker_task = asyncio.create_task(self._worker(ctx))
+        drain_task = asyncio.create_task(ctx._wait_for_draining())
+
+        await asyncio.wait([worker_task, drain_task], return_when=asyncio.FIRST_COMPLETED)
+        failed = worker_task.done() and worker_task.exception() is not None
+        if failed:
+            logger.error(f"Worker {worker_id} error: {worker_task.exception()}")
+
+        # Wait for running sessions, but not forever. Sessions that are still
+        # waiting for their client are cancelled.
+        try:
+            await asyncio.wait_for(ctx._wait_for_sessions(), timeout=self._params.drain_timeout)
+        except asyncio.TimeoutError:
+            pass
+        if ctx.sessions > 0:
+            await ctx.runner._sig_handler()
+        await asyncio.gather(*ctx._tasks, return_exceptions=True)
+
+        for task in (worker_task, drain_task, health_task):
+            task.cancel()
+        await asyncio.gather(worker_task, drain_task, health_task, return_exceptions=True)
+
+        self._report_health(ctx, 0.0)
+
+        return not failed
+
+    async def _health_task_handler(self, ctx: WorkerContext):
+        interval = self._params.health_interval
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(interval)
+            loop_lag = max(0.0, time.monotonic() - start - interval)
+            self._report_health(ctx, loop_lag)
+
+    def _report_health(self, ctx: WorkerContext, loop_lag: float):
+        self._health_queue.put(
+            WorkerHealth(
+                worker_id=ctx.worker_id,
+                pid=os.getpid(),
+                sessions=ctx.sessions,
+                accepting=ctx.accepting_sessions,
+                finished_sessions=ctx.finished_sessions,
+                loop_lag=loop_lag,
+                draining=ctx.draining,
+                timestamp=time.time(),
+            )
+        )
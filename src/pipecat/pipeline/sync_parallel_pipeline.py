@@ -98,6 +98,11 @@ class SyncParallelPipeline(BasePipeline):
     def processors_with_metrics(self) -> List[FrameProcessor]:
         return list(chain.from_iterable(p.processors_with_metrics() for p in self._pipelines))
 
+    def processors_with_instrumentation(self) -> List[FrameProcessor]:
+        return list(
+            chain.from_iterable(p.processors_with_instrumentation() for p in self._pipelines)
+        )
+
     #
     # Frame processor
     #
@@ -6,7 +6,7 @@
 
 import asyncio
 
-from typing import AsyncIterable, Iterable
+from typing import AsyncIterable, Iterable, List
 
 from pydantic import BaseModel
 
@@ -23,9 +23,14 @@ from pipecat.frames.frames import (
     StartFrame,
     StopTaskFrame,
 )
-from pipecat.metrics.metrics import TTFBMetricsData, ProcessingMetricsData
+from pipecat.metrics.metrics import (
+    FrameProcessorInstrumentationData,
+    ProcessingMetricsData,
+    TTFBMetricsData,
+)
 from pipecat.pipeline.base_pipeline import BasePipeline
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_queue import FrameQueue, FrameQueueParams, FrameQueueStats
 from pipecat.utils.utils import obj_count, obj_id
 
 from loguru import logger
@@ -37,6 +42,9 @@ class PipelineParams(BaseModel):
     enable_usage_metrics: bool = False
     send_initial_empty_metrics: bool = True
     report_only_initial_ttfb: bool = False
+    enable_instrumentation: bool = False
+    instrumentation_sample_interval: int = 16
+    queue_params: FrameQueueParams = FrameQueueParams()
 
 
 class Source(FrameProcessor):
@@ -99,7 +107,7 @@ class PipelineTask:
 
         self._up_queue = asyncio.Queue()
         self._down_queue = asyncio.Queue()
-        self._push_queue = asyncio.Queue()
+        self._push_queue = FrameQueue(params.queue_params)
 
         self._source = Source(self._up_queue)
         self._source.link(pipeline)
@@ -107,6 +115,18 @@ class PipelineTask:
         self._sink = Sink(self._down_queue)
         pipeline.link(self._sink)
 
+    @property
+    def queue_stats(self) -> FrameQueueStats:
+        return self._push_queue.stats
+
+    def instrumentation_data(self) -> List[FrameProcessorInstrumentationData]:
+        """Returns the instrumentation data of every processor in the pipeline,
+        if `enable_instrumentation` is set.
+
+        """
+        processors = self._pipeline.processors_with_instrumentation()
+        return [p.instrumentation.data() for p in processors]
+
     def has_finished(self):
         return self._finished
 
@@ -158,6 +178,8 @@ class PipelineTask:
             enable_metrics=self._params.enable_metrics,
             enable_usage_metrics=self._params.enable_usage_metrics,
             report_only_initial_ttfb=self._params.report_only_initial_ttfb,
+            enable_instrumentation=self._params.enable_instrumentation,
+            instrumentation_sample_interval=self._params.instrumentation_sample_interval,
             clock=self._clock,
         )
         await self._source.queue_frame(start_frame, FrameDirection.DOWNSTREAM)
@@ -4,6 +4,7 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+from functools import lru_cache
 from typing import List, Type
 
 from pipecat.frames.frames import (
@@ -25,6 +26,7 @@ from pipecat.processors.aggregators.openai_llm_context import (
     OpenAILLMContext,
     OpenAILLMContextFrame,
 )
+from pipecat.processors.frame_dispatcher import FrameDispatcher
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
 
@@ -52,6 +54,15 @@ class LLMResponseAggregator(FrameProcessor):
         self._handle_interruptions = handle_interruptions
         self._expect_stripped_words = expect_stripped_words
 
+        # Handlers return whether the aggregation should be sent.
+        self.__frame_handlers = self.__create_frame_handlers(
+            start_frame,
+            end_frame,
+            accumulator_frame,
+            interim_accumulator_frame,
+            handle_interruptions,
+        )
+
         # Reset our accumulator state.
         self._reset()
 
@@ -88,60 +99,111 @@ class LLMResponseAggregator(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        send_aggregation = False
-
-        if isinstance(frame, self._start_frame):
-            self._aggregation = ""
-            self._aggregating = True
-            self._seen_start_frame = True
-            self._seen_end_frame = False
-            self._seen_interim_results = False
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, self._end_frame):
-            self._seen_end_frame = True
-            self._seen_start_frame = False
-
-            # We might have received the end frame but we might still be
-            # aggregating (i.e. we have seen interim results but not the final
-            # text).
-            self._aggregating = self._seen_interim_results or len(self._aggregation) == 0
-
-            # Send the aggregation if we are not aggregating anymore (i.e. no
-            # more interim results received).
-            send_aggregation = not self._aggregating
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, self._accumulator_frame):
-            if self._aggregating:
-                if self._expect_stripped_words:
-                    self._aggregation += f" {frame.text}" if self._aggregation else frame.text
-                else:
-                    self._aggregation += frame.text
-                # We have recevied a complete sentence, so if we have seen the
-                # end frame and we were still aggregating, it means we should
-                # send the aggregation.
-                send_aggregation = self._seen_end_frame
-
-            # We just got our final result, so let's reset interim results.
-            self._seen_interim_results = False
-        elif self._interim_accumulator_frame and isinstance(frame, self._interim_accumulator_frame):
-            self._seen_interim_results = True
-        elif self._handle_interruptions and isinstance(frame, StartInterruptionFrame):
-            await self._push_aggregation()
-            # Reset anyways
-            self._reset()
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, LLMMessagesAppendFrame):
-            self._add_messages(frame.messages)
-        elif isinstance(frame, LLMMessagesUpdateFrame):
-            self._set_messages(frame.messages)
-        elif isinstance(frame, LLMSetToolsFrame):
-            self._set_tools(frame.tools)
-        else:
-            await self.push_frame(frame, direction)
+        handler = self.__frame_handlers.get(frame)
+        send_aggregation = await handler(self, frame, direction)
 
         if send_aggregation:
             await self._push_aggregation()
 
+    async def __handle_start_frame(self, frame: Frame, direction: FrameDirection) -> bool:
+        self._aggregation = ""
+        self._aggregating = True
+        self._seen_start_frame = True
+        self._seen_end_frame = False
+        self._seen_interim_results = False
+        await self.push_frame(frame, direction)
+        return False
+
+    async def __handle_end_frame(self, frame: Frame, direction: FrameDirection) -> bool:
+        self._seen_end_frame = True
+        self._seen_start_frame = False
+
+        # We might have received the end frame but we might still be
+        # aggregating (i.e. we have seen interim results but not the final
+        # text).
+        self._aggregating = self._seen_interim_results or len(self._aggregation) == 0
+
+        # Send the aggregation if we are not aggregating anymore (i.e. no
+        # more interim results received).
+        send_aggregation = not self._aggregating
+        await self.push_frame(frame, direction)
+        return send_aggregation
+
+    async def __handle_accumulator_frame(self, frame: TextFrame, direction: FrameDirection) -> bool:
+        send_aggregation = False
+        if self._aggregating:
+            if self._expect_stripped_words:
+                self._aggregation += f" {frame.text}" if self._aggregation else frame.text
+            else:
+                self._aggregation += frame.text
+            # We have recevied a complete sentence, so if we have seen the
+            # end frame and we were still aggregating, it means we should
+            # send the aggregation.
+            send_aggregation = self._seen_end_frame
+
+        # We just got our final result, so let's reset interim results.
+        self._seen_interim_results = False
+        return send_aggregation
+
+    async def __handle_interim_frame(self, frame: TextFrame, direction: FrameDirection) -> bool:
+        self._seen_interim_results = True
+        return False
+
+    async def __handle_interruption(
+        self, frame: StartInterruptionFrame, direction: FrameDirection
+    ) -> bool:
+        await self._push_aggregation()
+        # Reset anyways
+        self._reset()
+        await self.push_frame(frame, direction)
+        return False
+
+    async def __handle_messages_append(
+        self, frame: LLMMessagesAppendFrame, direction: FrameDirection
+    ) -> bool:
+        self._add_messages(frame.messages)
+        return False
+
+    async def __handle_messages_update(
+        self, frame: LLMMessagesUpdateFrame, direction: FrameDirection
+    ) -> bool:
+        self._set_messages(frame.messages)
+        return False
+
+    async def __handle_set_tools(self, frame: LLMSetToolsFrame, direction: FrameDirection) -> bool:
+        self._set_tools(frame.tools)
+        return False
+
+    async def __handle_other_frame(self, frame: Frame, direction: FrameDirection) -> bool:
+        await self.push_frame(frame, direction)
+        return False
+
+    # The handled frame types are constructor arguments, so there's a
+    # dispatcher per combination of them (i.e. per aggregator class in
+    # practice), shared by all the aggregators that use it.
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __create_frame_handlers(
+        start_frame,
+        end_frame,
+        accumulator_frame: Type[TextFrame],
+        interim_accumulator_frame: Type[TextFrame] | None,
+        handle_interruptions: bool,
+    ) -> FrameDispatcher:
+        cls = LLMResponseAggregator
+        frame_handlers = FrameDispatcher(default=cls.__handle_other_frame)
+        frame_handlers.register(start_frame, cls.__handle_start_frame)
+        frame_handlers.register(end_frame, cls.__handle_end_frame)
+        frame_handlers.register(accumulator_frame, cls.__handle_accumulator_frame)
+        if interim_accumulator_frame:
+            frame_handlers.register(interim_accumulator_frame, cls.__handle_interim_frame)
+        if handle_interruptions:
+            frame_handlers.register(StartInterruptionFrame, cls.__handle_interruption)
+        frame_handlers.register(LLMMessagesAppendFrame, cls.__handle_messages_append)
+        frame_handlers.register(LLMMessagesUpdateFrame, cls.__handle_messages_update)
+        frame_handlers.register(LLMSetToolsFrame, cls.__handle_set_tools)
+        return frame_handlers
+
     async def _push_aggregation(self):
         if len(self._aggregation) > 0:
             self._messages.append({"role": self._role, "content": self._aggregation})
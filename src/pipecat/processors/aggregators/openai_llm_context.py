@@ -12,7 +12,6 @@ from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, List
 
 from loguru import logger
-from PIL import Image
 
 from pipecat.frames.frames import (
     AudioRawFrame,
@@ -140,6 +139,8 @@ class OpenAILLMContext:
     def add_image_frame_message(
         self, *, format: str, size: tuple[int, int], image: bytes, text: str = None
     ):
+        from PIL import Image
+
         buffer = io.BytesIO()
         Image.frombytes(format, size, image).save(buffer, format="JPEG")
         encoded_image = base64.b64encode(buffer.getvalue()).decode("utf-8")
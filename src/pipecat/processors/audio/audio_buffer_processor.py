@@ -4,14 +4,24 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-from pipecat.audio.utils import interleave_stereo_audio, mix_audio, resample_audio
+from typing import List, Optional
+
+from pipecat.audio.recorders.base_audio_recorder import BaseAudioRecorder
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
+from pipecat.audio.utils import interleave_stereo_audio, mix_audio
 from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
     Frame,
     InputAudioRawFrame,
     OutputAudioRawFrame,
+    StartFrame,
 )
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
+# Size of the blocks given to recorders if `buffer_size` is not set.
+RECORDER_BLOCK_SECS = 1.0
+
 
 class AudioBufferProcessor(FrameProcessor):
     """This processor buffers audio raw frames (input and output). The mixed
@@ -25,19 +35,43 @@ class AudioBufferProcessor(FrameProcessor):
     in the case of stereo the left channel will be used for the user's audio and
     the right channel for the bot.
 
+    User audio is used as the timeline: when the bot is not speaking its track
+    is filled with silence, so both tracks stay aligned.
+
+    Audio can also be streamed to one or more recorders (e.g. a
+    `FileAudioRecorder`) while the conversation is happening. Recorders receive
+    the merged audio in blocks of `buffer_size` bytes per track (or one second,
+    if `buffer_size` is 0) and the remaining audio when the pipeline ends. Audio
+    given to recorders or to the "on_audio_data" handler is not kept, so memory
+    doesn't grow with the length of the conversation.
+
     """
 
     def __init__(
-        self, *, sample_rate: int = 24000, num_channels: int = 1, buffer_size: int = 0, **kwargs
+        self,
+        *,
+        sample_rate: int = 24000,
+        num_channels: int = 1,
+        buffer_size: int = 0,
+        recorders: Optional[List[BaseAudioRecorder]] = None,
+        **kwargs,
     ):
         super().__init__(**kwargs)
         self._sample_rate = sample_rate
         self._num_channels = num_channels
         self._buffer_size = buffer_size
+        self._recorders: List[BaseAudioRecorder] = list(recorders or [])
+
+        block_size = buffer_size or int(sample_rate * RECORDER_BLOCK_SECS) * 2
+        # Whole 16-bit samples.
+        self._block_size = max(2, block_size - block_size % 2)
 
         self._user_audio_buffer = bytearray()
         self._bot_audio_buffer = bytearray()
 
+        self._user_resampler = StreamResampler()
+        self._bot_resampler = StreamResampler()
+
         self._register_event_handler("on_audio_data")
 
     @property
@@ -48,20 +82,17 @@ class AudioBufferProcessor(FrameProcessor):
     def num_channels(self) -> int:
         return self._num_channels
 
+    def add_recorder(self, recorder: BaseAudioRecorder):
+        """Adds a recorder. This needs to be done before the pipeline starts."""
+        self._recorders.append(recorder)
+
     def has_audio(self) -> bool:
         return self._buffer_has_audio(self._user_audio_buffer) and self._buffer_has_audio(
             self._bot_audio_buffer
         )
 
     def merge_audio_buffers(self) -> bytes:
-        if self._num_channels == 1:
-            return mix_audio(bytes(self._user_audio_buffer), bytes(self._bot_audio_buffer))
-        elif self._num_channels == 2:
-            return interleave_stereo_audio(
-                bytes(self._user_audio_buffer), bytes(self._bot_audio_buffer)
-            )
-        else:
-            return b""
+        return self._merge_audio(self._user_audio_buffer, self._bot_audio_buffer)
 
     def reset_audio_buffers(self):
         self._user_audio_buffer = bytearray()
@@ -70,33 +101,84 @@ class AudioBufferProcessor(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
+        if isinstance(frame, StartFrame):
+            await self._start_recorders()
         # Include all audio from the user.
-        if isinstance(frame, InputAudioRawFrame):
-            resampled = resample_audio(frame.audio, frame.sample_rate, self._sample_rate)
+        elif isinstance(frame, InputAudioRawFrame):
+            resampled = self._user_resampler.resample(
+                frame.audio, frame.sample_rate, self._sample_rate
+            )
             self._user_audio_buffer.extend(resampled)
             # Sync the bot's buffer to the user's buffer by adding silence if needed
-            if len(self._user_audio_buffer) > len(self._bot_audio_buffer):
-                silence = b"\x00" * len(resampled)
-                self._bot_audio_buffer.extend(silence)
+            missing = len(self._user_audio_buffer) - len(self._bot_audio_buffer)
+            if missing > 0:
+                self._bot_audio_buffer.extend(bytes(missing))
+            await self._process_blocks()
         # If the bot is speaking, include all audio from the bot.
         elif isinstance(frame, OutputAudioRawFrame):
-            resampled = resample_audio(frame.audio, frame.sample_rate, self._sample_rate)
+            resampled = self._bot_resampler.resample(
+                frame.audio, frame.sample_rate, self._sample_rate
+            )
             self._bot_audio_buffer.extend(resampled)
-
-        if self._buffer_size > 0 and len(self._user_audio_buffer) > self._buffer_size:
-            await self._call_on_audio_data_handler()
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._stop_recorders()
 
         await self.push_frame(frame, direction)
 
-    async def _call_on_audio_data_handler(self):
-        if not self.has_audio():
+    async def _start_recorders(self):
+        for recorder in self._recorders:
+            await recorder.start(self._sample_rate, self._num_channels)
+
+    async def _stop_recorders(self):
+        if self._recorders or self._buffer_size > 0:
+            await self._write_audio(self._take_audio(self._pending_audio_size()))
+        for recorder in self._recorders:
+            await recorder.stop()
+
+    async def _process_blocks(self):
+        if not self._recorders and self._buffer_size == 0:
             return
 
-        merged_audio = self.merge_audio_buffers()
-        await self._call_event_handler(
-            "on_audio_data", merged_audio, self._sample_rate, self._num_channels
-        )
-        self.reset_audio_buffers()
+        # Both buffers have the same audio timeline, so we can only write
+        # what's available in both.
+        available = min(len(self._user_audio_buffer), len(self._bot_audio_buffer))
+        while available >= self._block_size:
+            await self._write_audio(self._take_audio(self._block_size))
+            available -= self._block_size
+
+    async def _write_audio(self, audio: bytes):
+        if not audio:
+            return
+        for recorder in self._recorders:
+            await recorder.write(audio)
+        if self._buffer_size > 0:
+            await self._call_event_handler(
+                "on_audio_data", audio, self._sample_rate, self._num_channels
+            )
+
+    def _pending_audio_size(self) -> int:
+        return max(len(self._user_audio_buffer), len(self._bot_audio_buffer))
+
+    def _take_audio(self, size: int) -> bytes:
+        """Removes `size` bytes from the beginning of both buffers and returns
+        them merged. The shorter buffer is padded with silence.
+
+        """
+        user = self._user_audio_buffer[:size]
+        bot = self._bot_audio_buffer[:size]
+        del self._user_audio_buffer[:size]
+        del self._bot_audio_buffer[:size]
+        user.extend(bytes(size - len(user)))
+        bot.extend(bytes(size - len(bot)))
+        return self._merge_audio(user, bot)
+
+    def _merge_audio(self, user_audio: bytearray, bot_audio: bytearray) -> bytes:
+        if self._num_channels == 1:
+            return mix_audio(bytes(user_audio), bytes(bot_audio))
+        elif self._num_channels == 2:
+            return interleave_stereo_audio(bytes(user_audio), bytes(bot_audio))
+        else:
+            return b""
 
     def _buffer_has_audio(self, buffer: bytearray) -> bool:
         return buffer is not None and len(buffer) > 0
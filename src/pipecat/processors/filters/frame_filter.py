@@ -19,6 +19,9 @@ class FrameFilter(FrameProcessor):
     # Frame processor
     #
 
+    def can_process_inline(self) -> bool:
+        return True
+
     def _should_passthrough_frame(self, frame):
         if isinstance(frame, self._types):
             return True
@@ -24,6 +24,9 @@ class IdentityFilter(FrameProcessor):
     # Frame processor
     #
 
+    def can_process_inline(self) -> bool:
+        return True
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         """Process an incoming frame by passing it through unchanged."""
         await super().process_frame(frame, direction)
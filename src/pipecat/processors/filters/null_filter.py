@@ -12,3 +12,10 @@ class NullFilter(FrameProcessor):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+
+    #
+    # Frame processor
+    #
+
+    def can_process_inline(self) -> bool:
+        return True
@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from typing import Any, Callable, Dict, Mapping, Optional, Type
+
+from pipecat.frames.frames import Frame
+
+
+class FrameDispatcher:
+    """Maps frame types to handlers.
+
+    A handler registered for a frame type also handles all the subclasses of
+    that type. When several registered types match a frame, the most specific
+    one (the first one in the frame class MRO) wins. The handler for each
+    concrete frame class is resolved once and cached, so dispatching a frame
+    costs a single dictionary lookup instead of a chain of `isinstance` checks.
+
+    `get()` returns `default` if no registered type matches the frame.
+
+    Processors keep their dispatcher in a class attribute, with the handlers
+    as plain functions (called with the processor as first argument). That
+    way the table is built and the handlers resolved once per processor
+    class, not for every processor instance.
+
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[Mapping[Type[Frame], Callable[..., Any]]] = None,
+        default: Optional[Callable[..., Any]] = None,
+    ):
+        self._default = default
+        self._handlers: Dict[Type[Frame], Callable[..., Any]] = dict(handlers or {})
+        self._cache: Dict[type, Optional[Callable[..., Any]]] = {}
+
+    def register(self, frame_type: Type[Frame], handler: Callable[..., Any]):
+        self._handlers[frame_type] = handler
+        self._cache.clear()
+
+    def get(self, frame: Frame) -> Optional[Callable[..., Any]]:
+        frame_class = frame.__class__
+        try:
+            return self._cache[frame_class]
+        except KeyError:
+            handler = self._resolve(frame_class)
+            self._cache[frame_class] = handler
+            return handler
+
+    def _resolve(self, frame_class: type) -> Optional[Callable[..., Any]]:
+        for cls in frame_class.__mro__:
+            handler = self._handlers.get(cls)
+            if handler:
+                return handler
+        return self._default
@@ -6,6 +6,7 @@
 
 import asyncio
 import inspect
+import time
 from enum import Enum
 from typing import Awaitable, Callable, Optional
 
@@ -23,7 +24,14 @@ from pipecat.frames.frames import (
     SystemFrame,
 )
 from pipecat.metrics.metrics import LLMTokenUsage, MetricsData
+from pipecat.processors.frame_dispatcher import FrameDispatcher
+from pipecat.processors.frame_queue import FrameQueue, FrameQueueParams, FrameQueueStats
+from pipecat.processors.metrics.frame_processor_instrumentation import (
+    FrameProcessorInstrumentation,
+)
 from pipecat.processors.metrics.frame_processor_metrics import FrameProcessorMetrics
+from pipecat.utils.frame_tracer import get_frame_tracer
+from pipecat.utils.task_interruption import TaskInterruption
 from pipecat.utils.utils import obj_count, obj_id
 
 
@@ -38,6 +46,7 @@ class FrameProcessor:
         *,
         name: str | None = None,
         metrics: FrameProcessorMetrics | None = None,
+        queue_params: FrameQueueParams | None = None,
         loop: asyncio.AbstractEventLoop | None = None,
         **kwargs,
     ):
@@ -66,10 +75,40 @@ class FrameProcessor:
         # else to be pushed.
         self._cancelling = False
 
+        # Inline processing. Non-blocking processors can process frames
+        # directly from the upstream processor task instead of using their own
+        # input and push tasks. See `enable_inline_processing()`.
+        self._inline_processing = False
+
+        # Frame tracing is checked once here so pushing frames doesn't pay for
+        # it if it's disabled. See `pipecat.utils.frame_tracer`.
+        self.__frame_tracer = get_frame_tracer()
+
         # Metrics
         self._metrics = metrics or FrameProcessorMetrics()
         self._metrics.set_processor_name(self.name)
 
+        # Instrumentation (processing time, queue waits and depths, frame
+        # rates). Created when StartFrame enables it.
+        self._instrumentation: FrameProcessorInstrumentation | None = None
+
+        # Input and push queues are unbounded by default. If they are bounded,
+        # `queue_params` also tells what to do when they are full. Both queues
+        # update the same stats.
+        self._queue_params = queue_params or FrameQueueParams()
+        self._queue_stats = FrameQueueStats()
+
+        # Interruptions don't recreate the input and push tasks (or queues).
+        # Instead, every interruption starts a new generation. Queued frames
+        # are tagged with the generation they were queued in and frames from
+        # older generations are discarded when dequeued. Tasks are only
+        # interrupted if they are in the middle of something.
+        self.__generation = 0
+        self.__input_interruption = TaskInterruption()
+        self.__push_interruption = TaskInterruption()
+        self.__input_frame_busy = False
+        self.__push_frame_busy = False
+
         # Processors have an input queue. The input queue will be processed
         # immediately (default) or it will block if `pause_processing_frames()`
         # is called. To resume processing frames we need to call
@@ -98,9 +137,64 @@ class FrameProcessor:
     def report_only_initial_ttfb(self):
         return self._report_only_initial_ttfb
 
+    @property
+    def inline_processing_enabled(self):
+        return self._inline_processing
+
+    @property
+    def queue_stats(self) -> FrameQueueStats:
+        return self._queue_stats
+
+    @property
+    def instrumentation(self) -> FrameProcessorInstrumentation | None:
+        return self._instrumentation
+
     def can_generate_metrics(self) -> bool:
         return False
 
+    def can_process_inline(self) -> bool:
+        """Whether this processor is non-blocking and can process frames inline.
+
+        Inline processors don't have input and push queues (or tasks). Instead,
+        non-system frames are processed directly from the task of the upstream
+        processor that pushed them, and frames are pushed from the same task
+        that processed them. This is only safe for processors that don't block
+        for long while processing a frame, that don't push non-system frames
+        from other tasks (or while handling system frames) and that don't use
+        `pause_processing_frames()`.
+
+        Without an input queue, `process_frame()` calls are not serialized: a
+        downstream frame (processed from the upstream neighbour's task) and an
+        upstream frame (processed from the downstream neighbour's task) can be
+        processed at the same time, interleaved at any `await`. So, inline
+        processors must not keep state that is shared by both directions
+        across an `await` (e.g. updating it before pushing a frame and relying
+        on it after).
+
+        """
+        return False
+
+    def enable_inline_processing(self) -> bool:
+        """Enables inline processing if the processor supports it (see
+        `can_process_inline()`). This needs to be called before any frame is
+        queued into the processor. Returns whether inline processing is enabled.
+
+        """
+        if self._inline_processing:
+            return True
+
+        if not self.can_process_inline():
+            logger.debug(f"{self} can't process frames inline, it will use its own tasks")
+            return False
+
+        # Tasks have not processed anything yet, so we can just cancel them.
+        self._inline_processing = True
+        self.__input_frame_task.cancel()
+        self.__input_frame_task = None
+        self.__push_frame_task.cancel()
+        self.__push_frame_task = None
+        return True
+
     def set_core_metrics_data(self, data: MetricsData):
         self._metrics.set_core_metrics_data(data)
 
@@ -175,10 +269,16 @@ class FrameProcessor:
 
         if isinstance(frame, SystemFrame):
             # We don't want to queue system frames.
-            await self.process_frame(frame, direction)
+            await self.__process_frame(frame, direction)
+        elif self._inline_processing:
+            # Non-blocking processors process frames right away from the
+            # upstream task, which keeps frames ordered.
+            await self.__process_frame_inline(frame, direction, callback)
         else:
             # We queue everything else.
-            await self.__input_queue.put((frame, direction, callback))
+            if self._instrumentation:
+                self._instrumentation.input_frame_queued(frame, self.__input_queue.qsize())
+            await self.__input_queue.put((frame, direction, callback, self.__generation))
 
     async def pause_processing_frames(self):
         self.__should_block_frames = True
@@ -188,28 +288,20 @@ class FrameProcessor:
         self.__should_block_frames = False
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
-        if isinstance(frame, StartFrame):
-            self._clock = frame.clock
-            self._allow_interruptions = frame.allow_interruptions
-            self._enable_metrics = frame.enable_metrics
-            self._enable_usage_metrics = frame.enable_usage_metrics
-            self._report_only_initial_ttfb = frame.report_only_initial_ttfb
-        elif isinstance(frame, StartInterruptionFrame):
-            await self._start_interruption()
-            await self.stop_all_metrics()
-        elif isinstance(frame, StopInterruptionFrame):
-            self._should_report_ttfb = True
-        elif isinstance(frame, CancelFrame):
-            self._cancelling = True
+        handler = self.__frame_handlers.get(frame)
+        if handler:
+            await handler(self, frame, direction)
 
     async def push_error(self, error: ErrorFrame):
         await self.push_frame(error, FrameDirection.UPSTREAM)
 
     async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
-        if isinstance(frame, SystemFrame):
+        if isinstance(frame, SystemFrame) or self._inline_processing:
             await self.__internal_push_frame(frame, direction)
         else:
-            await self.__push_queue.put((frame, direction))
+            if self._instrumentation:
+                self._instrumentation.push_frame_queued(frame, self.__push_queue.qsize())
+            await self.__push_queue.put((frame, direction, self.__generation))
 
     def event_handler(self, event_name: str):
         def decorator(handler):
@@ -233,23 +325,30 @@ class FrameProcessor:
     #
 
     async def _start_interruption(self):
+        # Inline processors don't have tasks. Frames being processed inline
+        # belong to the task of an upstream processor which has already been
+        # interrupted, since system frames are processed in order.
+        if self._inline_processing:
+            return
+
+        # Everything queued so far belongs to the previous generation and will
+        # be discarded.
+        self.__generation += 1
+        self.__input_event.clear()
+
         try:
-            # Cancel the push frame task. This will stop pushing frames downstream.
-            await self.__cancel_push_task()
+            # Stop pushing the current frame downstream, if any.
+            if self.__push_frame_busy:
+                await self.__push_interruption.interrupt(self.__push_frame_task)
 
-            # Cancel the input task. This will stop processing queued frames.
-            await self.__cancel_input_task()
+            # Stop processing the current frame, if any.
+            if self.__input_frame_busy:
+                await self.__input_interruption.interrupt(self.__input_frame_task)
         except Exception as e:
             logger.exception(f"Uncaught exception in {self}: {e}")
             await self.push_error(ErrorFrame(str(e)))
             raise
 
-        # Create a new input queue and task.
-        self.__create_input_task()
-
-        # Create a new output queue and task.
-        self.__create_push_task()
-
     async def _stop_interruption(self):
         # Nothing to do right now.
         pass
@@ -257,26 +356,93 @@ class FrameProcessor:
     async def __internal_push_frame(self, frame: Frame, direction: FrameDirection):
         try:
             if direction == FrameDirection.DOWNSTREAM and self._next:
-                logger.trace(f"Pushing {frame} from {self} to {self._next}")
+                if self.__frame_tracer:
+                    self.__frame_tracer.record(frame, self, self._next)
                 await self._next.queue_frame(frame, direction)
             elif direction == FrameDirection.UPSTREAM and self._prev:
-                logger.trace(f"Pushing {frame} upstream from {self} to {self._prev}")
+                if self.__frame_tracer:
+                    self.__frame_tracer.record(frame, self, self._prev)
                 await self._prev.queue_frame(frame, direction)
         except Exception as e:
             logger.exception(f"Uncaught exception in {self}: {e}")
             await self.push_error(ErrorFrame(str(e)))
             raise
 
+    async def __process_frame(self, frame: Frame, direction: FrameDirection):
+        instrumentation = self._instrumentation
+        if not instrumentation:
+            await self.process_frame(frame, direction)
+            return
+
+        start_ns = time.perf_counter_ns() if instrumentation.should_sample(frame) else None
+        await self.process_frame(frame, direction)
+        instrumentation.frame_processed(frame, start_ns)
+
+    async def __process_frame_inline(
+        self,
+        frame: Frame,
+        direction: FrameDirection,
+        callback: Optional[Callable[["FrameProcessor", Frame, FrameDirection], Awaitable[None]]],
+    ):
+        try:
+            await self.__process_frame(frame, direction)
+
+            # If this frame has an associated callback, call it now.
+            if callback:
+                await callback(self, frame, direction)
+        except Exception as e:
+            logger.exception(f"Uncaught exception in {self}: {e}")
+            await self.push_error(ErrorFrame(str(e)))
+
+    async def __handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        self._clock = frame.clock
+        self._allow_interruptions = frame.allow_interruptions
+        self._enable_metrics = frame.enable_metrics
+        self._enable_usage_metrics = frame.enable_usage_metrics
+        self._report_only_initial_ttfb = frame.report_only_initial_ttfb
+        if frame.enable_instrumentation and not self._instrumentation:
+            self._instrumentation = FrameProcessorInstrumentation(
+                self.name, frame.instrumentation_sample_interval
+            )
+
+    async def __handle_start_interruption(
+        self, frame: StartInterruptionFrame, direction: FrameDirection
+    ):
+        await self._start_interruption()
+        await self.stop_all_metrics()
+
+    async def __handle_stop_interruption(
+        self, frame: StopInterruptionFrame, direction: FrameDirection
+    ):
+        self._should_report_ttfb = True
+
+    async def __handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        self._cancelling = True
+
+    # Frames handled by this base class. The table is built once for the class
+    # and holds plain functions, so handlers are called with `self`.
+    # Subclasses keep their own dispatchers, so they don't interfere with each
+    # other.
+    __frame_handlers = FrameDispatcher(
+        {
+            StartFrame: __handle_start_frame,
+            StartInterruptionFrame: __handle_start_interruption,
+            StopInterruptionFrame: __handle_stop_interruption,
+            CancelFrame: __handle_cancel_frame,
+        }
+    )
+
     def __create_input_task(self):
-        self.__input_queue = asyncio.Queue()
+        self.__input_queue = FrameQueue(self._queue_params, self._queue_stats)
         self.__input_frame_task = self.get_event_loop().create_task(
             self.__input_frame_task_handler()
         )
         self.__input_event = asyncio.Event()
 
     async def __cancel_input_task(self):
-        self.__input_frame_task.cancel()
-        await self.__input_frame_task
+        if self.__input_frame_task:
+            self.__input_frame_task.cancel()
+            await self.__input_frame_task
 
     async def __input_frame_task_handler(self):
         running = True
@@ -286,45 +452,76 @@ class FrameProcessor:
                     await self.__input_event.wait()
                     self.__input_event.clear()
 
-                (frame, direction, callback) = await self.__input_queue.get()
+                (frame, direction, callback, generation) = await self.__input_queue.get()
+
+                if self._instrumentation:
+                    self._instrumentation.input_frame_dequeued(frame)
+
+                # Discard frames queued before the last interruption.
+                if generation == self.__generation:
+                    self.__input_frame_busy = True
 
-                # Process the frame.
-                await self.process_frame(frame, direction)
+                    # Process the frame.
+                    await self.__process_frame(frame, direction)
 
-                # If this frame has an associated callback, call it now.
-                if callback:
-                    await callback(self, frame, direction)
+                    # If this frame has an associated callback, call it now.
+                    if callback:
+                        await callback(self, frame, direction)
 
-                running = not isinstance(frame, EndFrame)
+                    self.__input_frame_busy = False
+
+                    # In case the frame processing swallowed an interruption.
+                    self.__input_interruption.interrupted()
+
+                    running = not isinstance(frame, EndFrame)
 
                 self.__input_queue.task_done()
             except asyncio.CancelledError:
+                self.__input_frame_busy = False
+                if self.__input_interruption.interrupted():
+                    self.__input_queue.task_done()
+                    continue
                 logger.trace(f"Cancelled input task in {self}")
                 break
             except Exception as e:
+                self.__input_frame_busy = False
                 logger.exception(f"Uncaught exception in {self}: {e}")
                 await self.push_error(ErrorFrame(str(e)))
 
     def __create_push_task(self):
-        self.__push_queue = asyncio.Queue()
+        self.__push_queue = FrameQueue(self._queue_params, self._queue_stats)
         self.__push_frame_task = self.get_event_loop().create_task(self.__push_frame_task_handler())
 
     async def __cancel_push_task(self):
-        self.__push_frame_task.cancel()
-        await self.__push_frame_task
+        if self.__push_frame_task:
+            self.__push_frame_task.cancel()
+            await self.__push_frame_task
 
     async def __push_frame_task_handler(self):
         running = True
         while running:
             try:
-                (frame, direction) = await self.__push_queue.get()
-                await self.__internal_push_frame(frame, direction)
-                running = not isinstance(frame, EndFrame)
+                (frame, direction, generation) = await self.__push_queue.get()
+                if self._instrumentation:
+                    self._instrumentation.push_frame_dequeued(frame)
+                # Discard frames queued before the last interruption.
+                if generation == self.__generation:
+                    self.__push_frame_busy = True
+                    await self.__internal_push_frame(frame, direction)
+                    self.__push_frame_busy = False
+                    # In case pushing the frame swallowed an interruption.
+                    self.__push_interruption.interrupted()
+                    running = not isinstance(frame, EndFrame)
                 self.__push_queue.task_done()
             except asyncio.CancelledError:
+                self.__push_frame_busy = False
+                if self.__push_interruption.interrupted():
+                    self.__push_queue.task_done()
+                    continue
                 logger.trace(f"Cancelled push task in {self}")
                 break
             except Exception as e:
+                self.__push_frame_busy = False
                 logger.exception(f"Uncaught exception in {self}: {e}")
                 await self.push_error(ErrorFrame(str(e)))
 
@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+from pipecat.frames.frames import AudioRawFrame, Frame
+
+
+class FrameQueuePolicy(Enum):
+    """What to do when a bounded frame queue is full.
+
+    BLOCK: wait until there's room in the queue (backpressure).
+    DROP_OLDEST: discard the oldest queued audio frame to make room.
+    DROP_NEWEST: discard the incoming audio frame.
+    COALESCE: merge the incoming audio frame into the last queued one.
+
+    Only audio frames are ever dropped or coalesced. Any other frame waits
+    until there's room in the queue, as with BLOCK.
+
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+
+
+class FrameQueueParams(BaseModel):
+    max_size: int = 0
+    policy: FrameQueuePolicy = FrameQueuePolicy.BLOCK
+
+
+@dataclass
+class FrameQueueStats:
+    """Counters updated by the frame queues that share this object."""
+
+    overflows: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+
+
+class FrameQueue(asyncio.Queue):
+    """An `asyncio.Queue` for frames with an optional size limit and a policy to
+    handle overflows. Queue items can be frames or tuples whose first element is
+    a frame. A `max_size` of 0 means the queue is unbounded.
+
+    """
+
+    def __init__(
+        self, params: FrameQueueParams | None = None, stats: FrameQueueStats | None = None
+    ):
+        self._params = params or FrameQueueParams()
+        self._stats = stats or FrameQueueStats()
+        super().__init__(maxsize=self._params.max_size)
+
+    @property
+    def stats(self) -> FrameQueueStats:
+        return self._stats
+
+    async def put(self, item: Any):
+        if self.full():
+            self._stats.overflows += 1
+            if self._handle_overflow(item):
+                return
+        await super().put(item)
+
+    def _handle_overflow(self, item: Any) -> bool:
+        match self._params.policy:
+            case FrameQueuePolicy.DROP_OLDEST:
+                return self._drop_oldest(item)
+            case FrameQueuePolicy.DROP_NEWEST:
+                return self._drop_newest(item)
+            case FrameQueuePolicy.COALESCE:
+                return self._coalesce(item)
+        return False
+
+    def _drop_oldest(self, item: Any) -> bool:
+        for i, queued in enumerate(self._queue):
+            if self._is_droppable(queued):
+                del self._queue[i]
+                # The dropped item will never be retrieved.
+                self.task_done()
+                self._stats.dropped += 1
+                self.put_nowait(item)
+                return True
+        return False
+
+    def _drop_newest(self, item: Any) -> bool:
+        if self._is_droppable(item):
+            self._stats.dropped += 1
+            return True
+        return False
+
+    def _coalesce(self, item: Any) -> bool:
+        if not self._is_droppable(item):
+            return False
+
+        last = self._queue[-1]
+        if isinstance(item, tuple) and (not isinstance(last, tuple) or item[1:] != last[1:]):
+            return False
+
+        frame = self._item_frame(item)
+        last_frame = self._item_frame(last)
+        if (
+            type(last_frame) is not type(frame)
+            or last_frame.sample_rate != frame.sample_rate
+            or last_frame.num_channels != frame.num_channels
+        ):
+            return False
+
+        # The queued frame might be shared (e.g. by parallel pipelines or
+        # observers), so we queue a new frame instead of modifying it.
+        merged = dataclasses.replace(last_frame, audio=last_frame.audio + frame.audio)
+        merged.pts = last_frame.pts
+        self._queue[-1] = (merged,) + last[1:] if isinstance(last, tuple) else merged
+        self._stats.coalesced += 1
+        return True
+
+    def _item_frame(self, item: Any) -> Frame:
+        return item[0] if isinstance(item, tuple) else item
+
+    def _is_droppable(self, item: Any) -> bool:
+        return isinstance(self._item_frame(item), AudioRawFrame)
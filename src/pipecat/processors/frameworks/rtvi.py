@@ -36,7 +36,6 @@ from pipecat.frames.frames import (
     LLMFullResponseStartFrame,
     MetricsFrame,
     StartFrame,
-    SystemFrame,
     TextFrame,
     TranscriptionFrame,
     TransportMessageUrgentFrame,
@@ -55,8 +54,9 @@ from pipecat.processors.aggregators.openai_llm_context import (
     OpenAILLMContext,
     OpenAILLMContextFrame,
 )
+from pipecat.processors.frame_dispatcher import FrameDispatcher
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.utils.string import match_endofsentence
+from pipecat.utils.string import SentenceSegmenter
 
 RTVI_PROTOCOL_VERSION = "0.3.0"
 
@@ -470,7 +470,7 @@ class RTVIUserLLMTextProcessor(RTVIFrameProcessor):
 class RTVIBotTranscriptionProcessor(RTVIFrameProcessor):
     def __init__(self):
         super().__init__()
-        self._aggregation = ""
+        self._segmenter = SentenceSegmenter()
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -480,15 +480,14 @@ class RTVIBotTranscriptionProcessor(RTVIFrameProcessor):
         if isinstance(frame, UserStartedSpeakingFrame):
             await self._push_aggregation()
         elif isinstance(frame, TextFrame):
-            self._aggregation += frame.text
-            if match_endofsentence(self._aggregation):
+            if self._segmenter.append(frame.text):
                 await self._push_aggregation()
 
     async def _push_aggregation(self):
-        if len(self._aggregation) > 0:
-            message = RTVIBotTranscriptionMessage(data=RTVITextMessageData(text=self._aggregation))
+        aggregation = self._segmenter.pop()
+        if len(aggregation) > 0:
+            message = RTVIBotTranscriptionMessage(data=RTVITextMessageData(text=aggregation))
             await self._push_transport_message_urgent(message)
-            self._aggregation = ""
 
 
 class RTVIBotLLMProcessor(RTVIFrameProcessor):
@@ -644,36 +643,51 @@ class RTVIProcessor(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        # Specific system frames
-        if isinstance(frame, StartFrame):
-            # Push StartFrame before start(), because we want StartFrame to be
-            # processed by every processor before any other frame is processed.
-            await self.push_frame(frame, direction)
-            await self._start(frame)
-        elif isinstance(frame, CancelFrame):
-            await self._cancel(frame)
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, ErrorFrame):
-            await self._send_error_frame(frame)
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, TransportMessageUrgentFrame):
-            await self._handle_transport_message(frame)
-        # All other system frames
-        elif isinstance(frame, SystemFrame):
-            await self.push_frame(frame, direction)
-        # Control frames
-        elif isinstance(frame, EndFrame):
-            # Push EndFrame before stop(), because stop() waits on the task to
-            # finish and the task finishes when EndFrame is processed.
-            await self.push_frame(frame, direction)
-            await self._stop(frame)
-        # Data frames
-        elif isinstance(frame, RTVIActionFrame):
-            await self._action_queue.put(frame)
-        # Other frames
+        handler = self.__frame_handlers.get(frame)
+        if handler:
+            await handler(self, frame, direction)
         else:
             await self.push_frame(frame, direction)
 
+    async def __handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        # Push StartFrame before start(), because we want StartFrame to be
+        # processed by every processor before any other frame is processed.
+        await self.push_frame(frame, direction)
+        await self._start(frame)
+
+    async def __handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self._cancel(frame)
+        await self.push_frame(frame, direction)
+
+    async def __handle_error_frame(self, frame: ErrorFrame, direction: FrameDirection):
+        await self._send_error_frame(frame)
+        await self.push_frame(frame, direction)
+
+    async def __handle_urgent_message(
+        self, frame: TransportMessageUrgentFrame, direction: FrameDirection
+    ):
+        await self._handle_transport_message(frame)
+
+    async def __handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        # Push EndFrame before stop(), because stop() waits on the task to
+        # finish and the task finishes when EndFrame is processed.
+        await self.push_frame(frame, direction)
+        await self._stop(frame)
+
+    async def __handle_action_frame(self, frame: RTVIActionFrame, direction: FrameDirection):
+        await self._action_queue.put(frame)
+
+    __frame_handlers = FrameDispatcher(
+        {
+            StartFrame: __handle_start_frame,
+            CancelFrame: __handle_cancel_frame,
+            ErrorFrame: __handle_error_frame,
+            TransportMessageUrgentFrame: __handle_urgent_message,
+            EndFrame: __handle_end_frame,
+            RTVIActionFrame: __handle_action_frame,
+        }
+    )
+
     async def cleanup(self):
         await super().cleanup()
         if self._pipeline:
@@ -28,6 +28,9 @@ class FrameLogger(FrameProcessor):
         self._color = color
         self._ignored_frame_types = tuple(ignored_frame_types) if ignored_frame_types else None
 
+    def can_process_inline(self) -> bool:
+        return True
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         if self._ignored_frame_types and not isinstance(frame, self._ignored_frame_types):
             dir = "<" if direction is FrameDirection.UPSTREAM else ">"
@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import time
+from typing import Dict
+
+from pipecat.frames.frames import Frame
+from pipecat.metrics.metrics import (
+    FrameProcessorInstrumentationData,
+    LatencyHistogramData,
+    QueueDepthData,
+)
+
+# Bucket i holds latencies below 2^i microseconds, so the last bucket starts at
+# about 8 seconds.
+HISTOGRAM_BUCKETS = 24
+
+
+class LatencyHistogram:
+    """A histogram of latencies with power of two (in microseconds) buckets.
+
+    Recording a value is just a couple of integer operations. Percentiles are
+    approximated with the upper bound of the bucket they fall into.
+
+    """
+
+    def __init__(self):
+        self._buckets = [0] * HISTOGRAM_BUCKETS
+        self._count = 0
+        self._total_ns = 0
+        self._max_ns = 0
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def record(self, value_ns: int):
+        index = min((value_ns // 1000).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self._buckets[index] += 1
+        self._count += 1
+        self._total_ns += value_ns
+        if value_ns > self._max_ns:
+            self._max_ns = value_ns
+
+    def percentile(self, percentile: float) -> float:
+        """Returns the given percentile (0-100) in seconds."""
+        if self._count == 0:
+            return 0.0
+        rank = self._count * percentile / 100
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self._max_ns / 1_000_000_000)
+        return self._max_ns / 1_000_000_000
+
+    def data(self) -> LatencyHistogramData:
+        mean = self._total_ns / self._count / 1_000_000_000 if self._count else 0.0
+        return LatencyHistogramData(
+            count=self._count,
+            mean=mean,
+            max=self._max_ns / 1_000_000_000,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+        )
+
+
+class QueueDepth:
+    def __init__(self):
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    def record(self, depth: int):
+        self._count += 1
+        self._total += depth
+        if depth > self._max:
+            self._max = depth
+
+    def data(self) -> QueueDepthData:
+        mean = self._total / self._count if self._count else 0.0
+        return QueueDepthData(mean=mean, max=self._max)
+
+
+class FrameProcessorInstrumentation:
+    """Instrumentation of a frame processor.
+
+    Frames are counted by type, but latencies (time spent in `process_frame()`
+    and time waiting in the input and push queues) and queue depths are only
+    recorded for one in every `sample_interval` frames. Frames are sampled by
+    id, so the same frames are sampled in every processor.
+
+    """
+
+    def __init__(self, processor_name: str, sample_interval: int = 16):
+        self._processor_name = processor_name
+        self._sample_interval = max(1, sample_interval)
+
+        self._start_time = time.monotonic()
+        self._frame_counts: Dict[type, int] = {}
+
+        self._process_time = LatencyHistogram()
+        self._input_queue_wait = LatencyHistogram()
+        self._push_queue_wait = LatencyHistogram()
+        self._input_queue_depth = QueueDepth()
+        self._push_queue_depth = QueueDepth()
+
+        # Enqueue times of the sampled frames that are waiting in the queues.
+        self._input_enqueue_times: Dict[int, int] = {}
+        self._push_enqueue_times: Dict[int, int] = {}
+
+    @property
+    def process_time(self) -> LatencyHistogram:
+        return self._process_time
+
+    @property
+    def input_queue_wait(self) -> LatencyHistogram:
+        return self._input_queue_wait
+
+    @property
+    def push_queue_wait(self) -> LatencyHistogram:
+        return self._push_queue_wait
+
+    def should_sample(self, frame: Frame) -> bool:
+        return frame.id % self._sample_interval == 0
+
+    def frame_processed(self, frame: Frame, start_ns: int | None):
+        cls = frame.__class__
+        self._frame_counts[cls] = self._frame_counts.get(cls, 0) + 1
+        if start_ns is not None:
+            self._process_time.record(time.perf_counter_ns() - start_ns)
+
+    def input_frame_queued(self, frame: Frame, depth: int):
+        self._frame_queued(frame, depth, self._input_enqueue_times, self._input_queue_depth)
+
+    def input_frame_dequeued(self, frame: Frame):
+        self._frame_dequeued(frame, self._input_enqueue_times, self._input_queue_wait)
+
+    def push_frame_queued(self, frame: Frame, depth: int):
+        self._frame_queued(frame, depth, self._push_enqueue_times, self._push_queue_depth)
+
+    def push_frame_dequeued(self, frame: Frame):
+        self._frame_dequeued(frame, self._push_enqueue_times, self._push_queue_wait)
+
+    def data(self) -> FrameProcessorInstrumentationData:
+        elapsed = max(time.monotonic() - self._start_time, 1e-9)
+        return FrameProcessorInstrumentationData(
+            processor=self._processor_name,
+            process_time=self._process_time.data(),
+            input_queue_wait=self._input_queue_wait.data(),
+            push_queue_wait=self._push_queue_wait.data(),
+            input_queue_depth=self._input_queue_depth.data(),
+            push_queue_depth=self._push_queue_depth.data(),
+            frames_per_second={
+                cls.__name__: count / elapsed for cls, count in self._frame_counts.items()
+            },
+        )
+
+    def _frame_queued(
+        self, frame: Frame, depth: int, enqueue_times: Dict[int, int], queue_depth: QueueDepth
+    ):
+        if not self.should_sample(frame):
+            return
+        queue_depth.record(depth)
+        # Frames dropped by a bounded queue are never dequeued, don't grow
+        # forever because of them.
+        if len(enqueue_times) > 1024:
+            enqueue_times.clear()
+        enqueue_times[frame.id] = time.perf_counter_ns()
+
+    def _frame_dequeued(
+        self, frame: Frame, enqueue_times: Dict[int, int], histogram: LatencyHistogram
+    ):
+        enqueue_time = enqueue_times.pop(frame.id, None)
+        if enqueue_time is not None:
+            histogram.record(time.perf_counter_ns() - enqueue_time)
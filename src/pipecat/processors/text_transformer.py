@@ -26,6 +26,9 @@ class StatelessTextTransformer(FrameProcessor):
         super().__init__()
         self._transform_fn = transform_fn
 
+    def can_process_inline(self) -> bool:
+        return True
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
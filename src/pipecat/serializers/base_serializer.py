@@ -28,3 +28,10 @@ class FrameSerializer(ABC):
     @abstractmethod
     def deserialize(self, data: str | bytes) -> Frame | None:
         pass
+
+    def flush(self) -> str | bytes | None:
+        """Called when the bot stops speaking. Serializers that hold back
+        output (e.g. a resampler tail) can return it here.
+
+        """
+        return None
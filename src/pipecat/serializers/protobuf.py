@@ -55,6 +55,9 @@ class ProtobufFrameSerializer(FrameSerializer):
             value = getattr(frame, field.name)
             if value and hasattr(proto_attr, field.name):
                 setattr(proto_attr, field.name, value)
+        # Frame names are not dataclass fields (they are built lazily).
+        if hasattr(proto_attr, "name"):
+            setattr(proto_attr, "name", frame.name)
 
         return proto_frame.SerializeToString()
 
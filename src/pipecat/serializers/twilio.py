@@ -9,8 +9,15 @@ import json
 
 from pydantic import BaseModel
 
-from pipecat.audio.utils import ulaw_to_pcm, pcm_to_ulaw
-from pipecat.frames.frames import AudioRawFrame, Frame, InputAudioRawFrame, StartInterruptionFrame
+from pipecat.audio import g711
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
+from pipecat.audio.utils import pcm_to_ulaw, ulaw_to_pcm
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    Frame,
+    InputAudioRawFrame,
+    StartInterruptionFrame,
+)
 from pipecat.serializers.base_serializer import FrameSerializer, FrameSerializerType
 
 
@@ -23,6 +30,11 @@ class TwilioFrameSerializer(FrameSerializer):
         self._stream_sid = stream_sid
         self._params = params
 
+        # Audio comes in 20ms packets, so we keep the resamplers state between
+        # packets to avoid clicks at packet boundaries.
+        self._input_resampler = StreamResampler()
+        self._output_resampler = StreamResampler()
+
     @property
     def type(self) -> FrameSerializerType:
         return FrameSerializerType.TEXT
@@ -31,20 +43,33 @@ class TwilioFrameSerializer(FrameSerializer):
         if isinstance(frame, AudioRawFrame):
             data = frame.audio
 
-            serialized_data = pcm_to_ulaw(data, frame.sample_rate, self._params.twilio_sample_rate)
-            payload = base64.b64encode(serialized_data).decode("utf-8")
-            answer = {
-                "event": "media",
-                "streamSid": self._stream_sid,
-                "media": {"payload": payload},
-            }
-
-            return json.dumps(answer)
+            serialized_data = pcm_to_ulaw(
+                data, frame.sample_rate, self._params.twilio_sample_rate, self._output_resampler
+            )
+            return self._media_message(serialized_data)
 
         if isinstance(frame, StartInterruptionFrame):
+            self._output_resampler.reset()
             answer = {"event": "clear", "streamSid": self._stream_sid}
             return json.dumps(answer)
 
+    def flush(self) -> str | bytes | None:
+        # Send the end of the bot audio still held by the resampler, instead of
+        # leaving it for the next response.
+        tail = self._output_resampler.flush()
+        if tail:
+            return self._media_message(g711.pcm_to_ulaw(tail))
+        return None
+
+    def _media_message(self, ulaw_audio: bytes) -> str:
+        payload = base64.b64encode(ulaw_audio).decode("utf-8")
+        answer = {
+            "event": "media",
+            "streamSid": self._stream_sid,
+            "media": {"payload": payload},
+        }
+        return json.dumps(answer)
+
     def deserialize(self, data: str | bytes) -> Frame | None:
         message = json.loads(data)
 
@@ -55,7 +80,10 @@ class TwilioFrameSerializer(FrameSerializer):
             payload = base64.b64decode(payload_base64)
 
             deserialized_data = ulaw_to_pcm(
-                payload, self._params.twilio_sample_rate, self._params.sample_rate
+                payload,
+                self._params.twilio_sample_rate,
+                self._params.sample_rate,
+                self._input_resampler,
             )
             audio_frame = InputAudioRawFrame(
                 audio=deserialized_data, num_channels=1, sample_rate=self._params.sample_rate
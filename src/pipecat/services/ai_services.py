@@ -8,11 +8,12 @@ import asyncio
 import io
 import wave
 from abc import abstractmethod
-from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from loguru import logger
 
-from pipecat.audio.utils import calculate_audio_volume, exp_smoothing
+from pipecat.audio.utils import exp_smoothing
+from pipecat.audio.volume_meter import VolumeMeter
 from pipecat.frames.frames import (
     AudioRawFrame,
     CancelFrame,
@@ -34,13 +35,28 @@ from pipecat.frames.frames import (
     VisionImageRawFrame,
 )
 from pipecat.metrics.metrics import MetricsData
-from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.frame_dispatcher import FrameDispatcher
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.transcriptions.language import Language
-from pipecat.utils.string import match_endofsentence
+
+# `match_endofsentence` is still imported from here by some applications.
+from pipecat.utils.string import SentenceSegmenter, match_endofsentence
 from pipecat.utils.text.base_text_filter import BaseTextFilter
 from pipecat.utils.time import seconds_to_nanoseconds
 
+if TYPE_CHECKING:
+    # The context imports the OpenAI SDK, don't load it unless it's needed.
+    from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+
+def __getattr__(name: str):
+    # Keep `from pipecat.services.ai_services import OpenAILLMContext` working.
+    if name == "OpenAILLMContext":
+        from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+
+        return OpenAILLMContext
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class AIService(FrameProcessor):
     def __init__(self, **kwargs):
@@ -112,12 +128,26 @@ class AIService(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        if isinstance(frame, StartFrame):
-            await self.start(frame)
-        elif isinstance(frame, CancelFrame):
-            await self.cancel(frame)
-        elif isinstance(frame, EndFrame):
-            await self.stop(frame)
+        handler = self.__frame_handlers.get(frame)
+        if handler:
+            await handler(self, frame, direction)
+
+    async def __handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await self.start(frame)
+
+    async def __handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self.cancel(frame)
+
+    async def __handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await self.stop(frame)
+
+    __frame_handlers = FrameDispatcher(
+        {
+            StartFrame: __handle_start_frame,
+            CancelFrame: __handle_cancel_frame,
+            EndFrame: __handle_end_frame,
+        }
+    )
 
     async def process_generator(self, generator: AsyncGenerator[Frame | None, None]):
         async for f in generator:
@@ -158,7 +188,7 @@ class LLMService(AIService):
     async def call_function(
         self,
         *,
-        context: OpenAILLMContext,
+        context: "OpenAILLMContext",
         tool_call_id: str,
         function_name: str,
         arguments: str,
@@ -181,7 +211,7 @@ class LLMService(AIService):
         )
 
     # QUESTION FOR CB: maybe this isn't needed anymore?
-    async def call_start_function(self, context: OpenAILLMContext, function_name: str):
+    async def call_start_function(self, context: "OpenAILLMContext", function_name: str):
         if function_name in self._start_callbacks.keys():
             await self._start_callbacks[function_name](function_name, self, context)
         elif None in self._start_callbacks.keys():
@@ -223,7 +253,8 @@ class TTSService(AIService):
         self._stop_frame_task: Optional[asyncio.Task] = None
         self._stop_frame_queue: asyncio.Queue = asyncio.Queue()
 
-        self._current_sentence: str = ""
+        # Text waiting for the end of a sentence, if aggregating sentences.
+        self._sentence_segmenter = SentenceSegmenter()
 
     @property
     def sample_rate(self) -> int:
@@ -290,27 +321,50 @@ class TTSService(AIService):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        if isinstance(frame, TextFrame):
-            await self._process_text_frame(frame)
-        elif isinstance(frame, StartInterruptionFrame):
-            await self._handle_interruption(frame, direction)
-        elif isinstance(frame, (LLMFullResponseEndFrame, EndFrame)):
-            sentence = self._current_sentence
-            self._current_sentence = ""
-            await self._push_tts_frames(sentence)
-            if isinstance(frame, LLMFullResponseEndFrame):
-                if self._push_text_frames:
-                    await self.push_frame(frame, direction)
-            else:
+        handler = self.__frame_handlers.get(frame)
+        if handler:
+            await handler(self, frame, direction)
+        else:
+            await self.push_frame(frame, direction)
+
+    async def __handle_text_frame(self, frame: TextFrame, direction: FrameDirection):
+        await self._process_text_frame(frame)
+
+    async def __handle_response_end(
+        self, frame: LLMFullResponseEndFrame | EndFrame, direction: FrameDirection
+    ):
+        sentence = self._sentence_segmenter.pop()
+        await self._push_tts_frames(sentence)
+        if isinstance(frame, LLMFullResponseEndFrame):
+            if self._push_text_frames:
                 await self.push_frame(frame, direction)
-        elif isinstance(frame, TTSSpeakFrame):
-            await self._push_tts_frames(frame.text)
-            await self.flush_audio()
-        elif isinstance(frame, TTSUpdateSettingsFrame):
-            await self._update_settings(frame.settings)
         else:
             await self.push_frame(frame, direction)
 
+    async def __handle_speak_frame(self, frame: TTSSpeakFrame, direction: FrameDirection):
+        await self._push_tts_frames(frame.text)
+        await self.flush_audio()
+
+    async def __handle_update_settings(
+        self, frame: TTSUpdateSettingsFrame, direction: FrameDirection
+    ):
+        await self._update_settings(frame.settings)
+
+    async def __handle_interruption(self, frame: StartInterruptionFrame, direction: FrameDirection):
+        # Services override `_handle_interruption()`.
+        await self._handle_interruption(frame, direction)
+
+    __frame_handlers = FrameDispatcher(
+        {
+            TextFrame: __handle_text_frame,
+            StartInterruptionFrame: __handle_interruption,
+            LLMFullResponseEndFrame: __handle_response_end,
+            EndFrame: __handle_response_end,
+            TTSSpeakFrame: __handle_speak_frame,
+            TTSUpdateSettingsFrame: __handle_update_settings,
+        }
+    )
+
     async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
         await super().push_frame(frame, direction)
 
@@ -323,7 +377,7 @@ class TTSService(AIService):
             await self._stop_frame_queue.put(frame)
 
     async def _handle_interruption(self, frame: StartInterruptionFrame, direction: FrameDirection):
-        self._current_sentence = ""
+        self._sentence_segmenter.clear()
         if self._text_filter:
             self._text_filter.handle_interruption()
         await self.push_frame(frame, direction)
@@ -333,11 +387,9 @@ class TTSService(AIService):
         if not self._aggregate_sentences:
             text = frame.text
         else:
-            self._current_sentence += frame.text
-            eos_end_marker = match_endofsentence(self._current_sentence)
+            eos_end_marker = self._sentence_segmenter.append(frame.text)
             if eos_end_marker:
-                text = self._current_sentence[:eos_end_marker]
-                self._current_sentence = self._current_sentence[eos_end_marker:]
+                text = self._sentence_segmenter.pop(eos_end_marker)
 
         if text:
             await self._push_tts_frames(text)
@@ -364,7 +416,7 @@ class TTSService(AIService):
             has_started = False
             while True:
                 try:
-                    frame = await asyncio.wait_for(
+                    frame = await self.get_clock().wait_for(
                         self._stop_frame_queue.get(), self._stop_frame_timeout_s
                     )
                     if isinstance(frame, TTSStartedFrame):
@@ -537,6 +589,7 @@ class SegmentedSTTService(STTService):
         (self._content, self._wave) = self._new_wave()
         self._silence_num_frames = 0
         # Volume exponential smoothing
+        self._volume_meter = VolumeMeter()
         self._smoothing_factor = 0.2
         self._prev_volume = 0
 
@@ -579,7 +632,7 @@ class SegmentedSTTService(STTService):
         return (content, ww)
 
     def _get_smoothed_volume(self, frame: AudioRawFrame) -> float:
-        volume = calculate_audio_volume(frame.audio, frame.sample_rate)
+        volume = self._volume_meter.volume(frame.audio, frame.sample_rate)
         return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
 
 
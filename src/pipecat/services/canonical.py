@@ -5,16 +5,14 @@
 #
 
 import aiohttp
-import io
 import os
 import uuid
-import wave
 
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+from pipecat.audio.recorders.file_audio_recorder import FileAudioRecorder
 from pipecat.frames.frames import CancelFrame, EndFrame, Frame
-from pipecat.processors.audio import audio_buffer_processor
 from pipecat.processors.audio.audio_buffer_processor import AudioBufferProcessor
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.ai_services import AIService
@@ -40,8 +38,10 @@ PART_SIZE = 1024 * 1024 * 5
 class CanonicalMetricsService(AIService):
     """Initialize a CanonicalAudioProcessor instance.
 
-    This class uses an AudioBufferProcessor to get the conversation audio and
-    uploads it to Canonical Voice API for audio processing.
+    This class uses an AudioBufferProcessor to record the conversation audio
+    to a file and uploads it to Canonical Voice API for audio processing. The
+    audio is written to the file during the conversation, so this service
+    needs to be after the AudioBufferProcessor in the pipeline.
 
     Args:
 
@@ -83,6 +83,10 @@ class CanonicalMetricsService(AIService):
         self._assistant_speaks_first = assistant_speaks_first
         self._output_dir = output_dir
 
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._recorder = FileAudioRecorder(self._get_output_filename())
+        audio_buffer_processor.add_recorder(self._recorder)
+
     async def stop(self, frame: EndFrame):
         await super().stop(frame)
         await self._process_audio()
@@ -96,28 +100,14 @@ class CanonicalMetricsService(AIService):
         await self.push_frame(frame, direction)
 
     async def _process_audio(self):
-        audio_buffer_processor = self._audio_buffer_processor
-
-        if not audio_buffer_processor.has_audio():
-            return
-
-        os.makedirs(self._output_dir, exist_ok=True)
-        filename = self._get_output_filename()
-        audio = audio_buffer_processor.merge_audio_buffers()
-
-        with io.BytesIO() as buffer:
-            with wave.open(buffer, "wb") as wf:
-                wf.setsampwidth(2)
-                wf.setnchannels(audio_buffer_processor.num_channels)
-                wf.setframerate(audio_buffer_processor.sample_rate)
-                wf.writeframes(audio)
-            async with aiofiles.open(filename, "wb") as file:
-                await file.write(buffer.getvalue())
+        # In case the AudioBufferProcessor didn't get to stop it.
+        await self._recorder.stop()
 
+        filename = self._recorder.file_name
         try:
-            await self._multipart_upload(filename)
+            if self._recorder.num_frames > 0:
+                await self._multipart_upload(filename)
             await aiofiles.os.remove(filename)
-            audio_buffer_processor.reset_audio_buffers()
         except FileNotFoundError:
             pass
         except Exception as e:
@@ -22,7 +22,7 @@ from pipecat.frames.frames import (
 )
 from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.ai_services import AIService
-from pipecat.audio.utils import resample_audio
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
 
 from loguru import logger
 
@@ -44,6 +44,7 @@ class TavusVideoService(AIService):
         self._replica_id = replica_id
         self._persona_id = persona_id
         self._session = session
+        self._resampler = StreamResampler()
 
         self._conversation_id: str
 
@@ -86,7 +87,7 @@ class TavusVideoService(AIService):
     ) -> None:
         """Encodes audio to base64 and sends it to Tavus"""
         if not done:
-            audio = resample_audio(audio, original_sample_rate, 16000)
+            audio = self._resampler.resample(audio, original_sample_rate, 16000)
         audio_base64 = base64.b64encode(audio).decode("utf-8")
         logger.trace(f"TavusVideoService sending {len(audio)} bytes")
         await self._send_audio_message(audio_base64, done=done)
@@ -100,16 +101,25 @@ class TavusVideoService(AIService):
         elif isinstance(frame, TTSAudioRawFrame):
             await self._encode_audio_and_send(frame.audio, frame.sample_rate, done=False)
         elif isinstance(frame, TTSStoppedFrame):
+            await self._send_resampler_tail()
             await self._encode_audio_and_send(b"\x00", 16000, done=True)
             await self.stop_ttfb_metrics()
             await self.stop_processing_metrics()
         elif isinstance(frame, StartInterruptionFrame):
+            self._resampler.reset()
             await self._send_interrupt_message()
         elif isinstance(frame, (EndFrame, CancelFrame)):
             await self._end_conversation()
         else:
             await self.push_frame(frame, direction)
 
+    async def _send_resampler_tail(self) -> None:
+        """Sends the last few milliseconds of audio held by the resampler"""
+        audio = self._resampler.flush()
+        if audio:
+            audio_base64 = base64.b64encode(audio).decode("utf-8")
+            await self._send_audio_message(audio_base64, done=False)
+
     async def _send_interrupt_message(self) -> None:
         transport_frame = TransportMessageUrgentFrame(
             message={
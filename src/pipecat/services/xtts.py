@@ -9,7 +9,7 @@ from typing import Any, AsyncGenerator, Dict
 import aiohttp
 from loguru import logger
 
-from pipecat.audio.utils import resample_audio
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
 from pipecat.frames.frames import (
     ErrorFrame,
     Frame,
@@ -144,6 +144,7 @@ class XTTSService(TTSService):
 
             yield TTSStartedFrame()
 
+            resampler = StreamResampler()
             buffer = bytearray()
             async for chunk in r.content.iter_chunked(1024):
                 if len(chunk) > 0:
@@ -161,16 +162,18 @@ class XTTSService(TTSService):
                         buffer = buffer[48000:]
 
                         # XTTS uses 24000 so we need to resample to our desired rate.
-                        resampled_audio = resample_audio(
+                        resampled_audio = resampler.resample(
                             bytes(process_data), 24000, self._sample_rate
                         )
                         # Create the frame with the resampled audio
                         frame = TTSAudioRawFrame(resampled_audio, self._sample_rate, 1)
                         yield frame
 
-            # Process any remaining data in the buffer.
-            if len(buffer) > 0:
-                resampled_audio = resample_audio(bytes(buffer), 24000, self._sample_rate)
+            # Process any remaining data in the buffer, and the audio still
+            # held by the resampler.
+            resampled_audio = resampler.resample(bytes(buffer), 24000, self._sample_rate)
+            resampled_audio += resampler.flush()
+            if len(resampled_audio) > 0:
                 frame = TTSAudioRawFrame(resampled_audio, self._sample_rate, 1)
                 yield frame
 
@@ -5,16 +5,18 @@
 #
 
 import asyncio
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 
 from loguru import logger
 
 from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADState
+from pipecat.audio.vad.vad_worker import VADWorkerStream
 from pipecat.frames.frames import (
     BotInterruptionFrame,
     CancelFrame,
     EndFrame,
-    FilterUpdateSettingsFrame,
+    FilterControlFrame,
     Frame,
     InputAudioRawFrame,
     StartFrame,
@@ -41,6 +43,11 @@ class BaseInputTransport(FrameProcessor):
         # if passthrough is enabled.
         self._audio_task = None
 
+        # If VAD runs in a VAD worker, our audio stream in the worker and the
+        # state changes it has reported. They are pushed by the audio task.
+        self._vad_stream: VADWorkerStream | None = None
+        self._vad_worker_states: deque[VADState] = deque()
+
     async def start(self, frame: StartFrame):
         # Start audio filter.
         if self._params.audio_in_filter:
@@ -49,6 +56,12 @@ class BaseInputTransport(FrameProcessor):
         if self._params.audio_in_enabled or self._params.vad_enabled:
             self._audio_in_queue = asyncio.Queue()
             self._audio_task = self.get_event_loop().create_task(self._audio_task_handler())
+        # Start streaming audio to the VAD worker, if we have one.
+        vad_analyzer = self.vad_analyzer()
+        if self._params.vad_enabled and self._params.vad_worker and vad_analyzer:
+            self._vad_stream = self._params.vad_worker.create_stream(
+                vad_analyzer, self._vad_worker_callback
+            )
 
     async def stop(self, frame: EndFrame):
         # Cancel and wait for the audio input task to finish.
@@ -56,6 +69,7 @@ class BaseInputTransport(FrameProcessor):
             self._audio_task.cancel()
             await self._audio_task
             self._audio_task = None
+        await self._stop_vad_worker_stream()
         # Stop audio filter.
         if self._params.audio_in_filter:
             await self._params.audio_in_filter.stop()
@@ -66,6 +80,10 @@ class BaseInputTransport(FrameProcessor):
             self._audio_task.cancel()
             await self._audio_task
             self._audio_task = None
+        await self._stop_vad_worker_stream()
+        # Stop audio filter.
+        if self._params.audio_in_filter:
+            await self._params.audio_in_filter.stop()
 
     def vad_analyzer(self) -> VADAnalyzer | None:
         return self._params.vad_analyzer
@@ -105,9 +123,12 @@ class BaseInputTransport(FrameProcessor):
             await self.stop(frame)
         elif isinstance(frame, VADParamsUpdateFrame):
             vad_analyzer = self.vad_analyzer()
-            if vad_analyzer:
+            if self._vad_stream:
+                # The analyzer is in use by the worker thread.
+                self._vad_stream.set_params(frame.params)
+            elif vad_analyzer:
                 vad_analyzer.set_params(frame.params)
-        elif isinstance(frame, FilterUpdateSettingsFrame) and self._params.audio_in_filter:
+        elif isinstance(frame, FilterControlFrame) and self._params.audio_in_filter:
             await self._params.audio_in_filter.process_frame(frame)
         # Other frames
         else:
@@ -166,11 +187,38 @@ class BaseInputTransport(FrameProcessor):
             vad_state = new_vad_state
         return vad_state
 
+    def _vad_worker_callback(self, state: VADState):
+        # Called from the VAD worker thread. The audio task pushes the state
+        # change before the next audio frame, so user speaking frames stay in
+        # order with the audio. If no audio is coming, we wake it up with an
+        # empty item.
+        self._vad_worker_states.append(state)
+        self.get_event_loop().call_soon_threadsafe(self._audio_in_queue.put_nowait, None)
+
+    async def _handle_vad_worker_states(self):
+        while self._vad_worker_states:
+            state = self._vad_worker_states.popleft()
+            if state == VADState.SPEAKING:
+                await self._handle_interruptions(UserStartedSpeakingFrame())
+            elif state == VADState.QUIET:
+                await self._handle_interruptions(UserStoppedSpeakingFrame())
+
+    async def _stop_vad_worker_stream(self):
+        if self._vad_stream:
+            self._vad_stream.close()
+            self._vad_stream = None
+
     async def _audio_task_handler(self):
         vad_state: VADState = VADState.QUIET
         while True:
             try:
-                frame: InputAudioRawFrame = await self._audio_in_queue.get()
+                frame: InputAudioRawFrame | None = await self._audio_in_queue.get()
+
+                # Push the state changes reported by the VAD worker so far.
+                await self._handle_vad_worker_states()
+                if not frame:
+                    self._audio_in_queue.task_done()
+                    continue
 
                 audio_passthrough = True
 
@@ -181,7 +229,10 @@ class BaseInputTransport(FrameProcessor):
                 # Check VAD and push event if necessary. We just care about
                 # changes from QUIET to SPEAKING and vice versa.
                 if self._params.vad_enabled:
-                    vad_state = await self._handle_vad(frame.audio, vad_state)
+                    if self._vad_stream:
+                        self._vad_stream.analyze_audio(frame.audio)
+                    else:
+                        vad_state = await self._handle_vad(frame.audio, vad_state)
                     audio_passthrough = self._params.vad_audio_passthrough
 
                 # Push audio downstream if passthrough.
@@ -7,12 +7,11 @@
 import asyncio
 import itertools
 import sys
-import time
 from typing import AsyncGenerator, List
 
 from loguru import logger
-from PIL import Image
 
+from pipecat.audio.audio_chunker import AudioChunker
 from pipecat.audio.vad.vad_analyzer import VAD_STOP_SECS
 from pipecat.frames.frames import (
     AudioRawFrame,
@@ -31,11 +30,15 @@ from pipecat.frames.frames import (
     StopInterruptionFrame,
     SystemFrame,
     TTSAudioRawFrame,
+    TTSStoppedFrame,
     TransportMessageFrame,
     TransportMessageUrgentFrame,
 )
+from pipecat.processors.frame_dispatcher import FrameDispatcher
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_queue import FrameQueue, FrameQueueStats
 from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.task_interruption import TaskInterruption
 from pipecat.utils.time import nanoseconds_to_seconds
 
 
@@ -46,16 +49,27 @@ class BaseOutputTransport(FrameProcessor):
         self._params = params
 
         # Task to process incoming frames so we don't block upstream elements.
+        self._sink_queue = None
         self._sink_task = None
 
         # Task to process incoming frames using a clock.
+        self._sink_clock_queue = None
         self._sink_clock_task = None
 
         # Task to write/send audio and image frames.
+        self._audio_out_queue = None
         self._audio_out_task = None
+        self._camera_out_queue = None
         self._camera_out_task = None
         self._running_out_tasks = True
 
+        # Interruptions stop what the sink and output tasks are doing and
+        # discard their queued frames, but the tasks keep running.
+        self._sink_interruption = TaskInterruption()
+        self._sink_clock_interruption = TaskInterruption()
+        self._audio_out_interruption = TaskInterruption()
+        self._camera_out_interruption = TaskInterruption()
+
         # These are the images that we should send to the camera at our desired
         # framerate.
         self._camera_images = None
@@ -66,13 +80,24 @@ class BaseOutputTransport(FrameProcessor):
             int(self._params.audio_out_sample_rate / 100) * self._params.audio_out_channels * 2
         )
         self._audio_chunk_size = audio_bytes_10ms * 2
-        self._audio_buffer = bytearray()
+        self._audio_chunker = AudioChunker(self._audio_chunk_size)
+        # Last audio frame we chunked, to know what the pending audio is.
+        self._last_audio_frame: OutputAudioRawFrame | None = None
+
+        # Sink and audio output queues are unbounded unless
+        # `audio_out_queue_params` is given. This is useful to shed stale audio
+        # if the transport can't keep up.
+        self._out_queue_stats = FrameQueueStats()
 
         self._stopped_event = asyncio.Event()
 
         # Indicates if the bot is currently speaking.
         self._bot_speaking = False
 
+    @property
+    def out_queue_stats(self) -> FrameQueueStats:
+        return self._out_queue_stats
+
     async def start(self, frame: StartFrame):
         # Start audio mixer.
         if self._params.audio_out_mixer:
@@ -110,47 +135,90 @@ class BaseOutputTransport(FrameProcessor):
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
 
-        #
-        # System frames (like StartInterruptionFrame) are pushed
-        # immediately. Other frames require order so they are put in the sink
-        # queue.
-        #
-        if isinstance(frame, StartFrame):
-            # Push StartFrame before start(), because we want StartFrame to be
-            # processed by every processor before any other frame is processed.
-            await self.push_frame(frame, direction)
-            await self.start(frame)
-        elif isinstance(frame, CancelFrame):
-            await self.cancel(frame)
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, (StartInterruptionFrame, StopInterruptionFrame)):
-            await self.push_frame(frame, direction)
-            await self._handle_interruptions(frame)
-        elif isinstance(frame, TransportMessageUrgentFrame):
-            await self.send_message(frame)
-        elif isinstance(frame, SystemFrame):
-            await self.push_frame(frame, direction)
-        # Control frames.
-        elif isinstance(frame, EndFrame):
-            # Process sink tasks.
-            await self._stop_sink_tasks(frame)
-            # Now we can stop.
-            await self.stop(frame)
-            # We finally push EndFrame down so PipelineTask stops nicely.
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, MixerControlFrame) and self._params.audio_out_mixer:
+        handler = self.__frame_handlers.get(frame)
+        await handler(self, frame, direction)
+
+    async def __handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        # Push StartFrame before start(), because we want StartFrame to be
+        # processed by every processor before any other frame is processed.
+        await self.push_frame(frame, direction)
+        await self.start(frame)
+
+    async def __handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self.cancel(frame)
+        await self.push_frame(frame, direction)
+
+    async def __handle_interruption_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+        await self._handle_interruptions(frame)
+
+    async def __handle_urgent_message(
+        self, frame: TransportMessageUrgentFrame, direction: FrameDirection
+    ):
+        await self.send_message(frame)
+
+    async def __handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        # Don't leave any audio behind.
+        await self._flush_audio()
+        # Process sink tasks.
+        await self._stop_sink_tasks(frame)
+        # Now we can stop.
+        await self.stop(frame)
+        # We finally push EndFrame down so PipelineTask stops nicely.
+        await self.push_frame(frame, direction)
+
+    async def __handle_system_frame(self, frame: SystemFrame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    async def __handle_mixer_control(self, frame: MixerControlFrame, direction: FrameDirection):
+        if self._params.audio_out_mixer:
             await self._params.audio_out_mixer.process_frame(frame)
-        # Other frames.
-        elif isinstance(frame, OutputAudioRawFrame):
-            await self._handle_audio(frame)
-        elif isinstance(frame, (OutputImageRawFrame, SpriteFrame)):
-            await self._handle_image(frame)
+        else:
+            await self.__handle_sink_frame(frame, direction)
+
+    async def __handle_audio_frame(self, frame: OutputAudioRawFrame, direction: FrameDirection):
+        await self._handle_audio(frame)
+
+    async def __handle_tts_stopped_frame(self, frame: TTSStoppedFrame, direction: FrameDirection):
+        # Play the end of the TTS audio now, not with the next response.
+        await self._flush_audio()
+        await self.__handle_sink_frame(frame, direction)
+
+    async def __handle_image_frame(
+        self, frame: OutputImageRawFrame | SpriteFrame, direction: FrameDirection
+    ):
+        await self._handle_image(frame)
+
+    async def __handle_sink_frame(self, frame: Frame, direction: FrameDirection):
         # TODO(aleix): Images and audio should support presentation timestamps.
-        elif frame.pts:
+        if frame.pts:
             await self._sink_clock_queue.put((frame.pts, frame.id, frame))
         else:
             await self._sink_queue.put(frame)
 
+    # System frames (like StartInterruptionFrame) are pushed immediately. Other
+    # frames require order so they are put in the sink queue (the default
+    # handler).
+    __frame_handlers = FrameDispatcher(
+        {
+            StartFrame: __handle_start_frame,
+            CancelFrame: __handle_cancel_frame,
+            StartInterruptionFrame: __handle_interruption_frame,
+            StopInterruptionFrame: __handle_interruption_frame,
+            TransportMessageUrgentFrame: __handle_urgent_message,
+            SystemFrame: __handle_system_frame,
+            # Control frames.
+            EndFrame: __handle_end_frame,
+            MixerControlFrame: __handle_mixer_control,
+            # Other frames.
+            OutputAudioRawFrame: __handle_audio_frame,
+            TTSStoppedFrame: __handle_tts_stopped_frame,
+            OutputImageRawFrame: __handle_image_frame,
+            SpriteFrame: __handle_image_frame,
+        },
+        default=__handle_sink_frame,
+    )
+
     async def _stop_sink_tasks(self, frame: EndFrame):
         # Let the sink tasks process the queue until they reach this EndFrame.
         await self._sink_clock_queue.put((sys.maxsize, frame.id, frame))
@@ -170,12 +238,10 @@ class BaseOutputTransport(FrameProcessor):
             return
 
         if isinstance(frame, StartInterruptionFrame):
-            # Cancel sink and output tasks.
-            await self._cancel_sink_tasks()
-            await self._cancel_output_tasks()
-            # Create sink and output tasks.
-            self._create_output_tasks()
-            self._create_sink_tasks()
+            # Stop the sink and output tasks and discard what they had queued.
+            await self._interrupt_sink_tasks()
+            await self._interrupt_output_tasks()
+            self._audio_chunker.clear()
             # Let's send a bot stopped speaking if we have to.
             await self._bot_stopped_speaking()
 
@@ -186,16 +252,18 @@ class BaseOutputTransport(FrameProcessor):
         if self._params.audio_out_is_live:
             await self._audio_out_queue.put(frame)
         else:
-            cls = type(frame)
-            self._audio_buffer.extend(frame.audio)
-            while len(self._audio_buffer) >= self._audio_chunk_size:
-                chunk = cls(
-                    bytes(self._audio_buffer[: self._audio_chunk_size]),
-                    sample_rate=frame.sample_rate,
-                    num_channels=frame.num_channels,
-                )
-                await self._sink_queue.put(chunk)
-                self._audio_buffer = self._audio_buffer[self._audio_chunk_size :]
+            self._last_audio_frame = frame
+            for audio in self._audio_chunker.chunks(frame.audio):
+                await self._sink_queue.put(self._audio_chunk_frame(frame, audio))
+
+    async def _flush_audio(self):
+        # Pad the audio we have pending to a whole chunk of audio.
+        audio = self._audio_chunker.flush()
+        if audio and self._last_audio_frame:
+            await self._sink_queue.put(self._audio_chunk_frame(self._last_audio_frame, audio))
+
+    def _audio_chunk_frame(self, frame: OutputAudioRawFrame, audio: bytes) -> OutputAudioRawFrame:
+        return type(frame)(audio, sample_rate=frame.sample_rate, num_channels=frame.num_channels)
 
     async def _handle_image(self, frame: OutputImageRawFrame | SpriteFrame):
         if not self._params.camera_out_enabled:
@@ -226,7 +294,7 @@ class BaseOutputTransport(FrameProcessor):
 
     def _create_sink_tasks(self):
         loop = self.get_event_loop()
-        self._sink_queue = asyncio.Queue()
+        self._sink_queue = FrameQueue(self._params.audio_out_queue_params, self._out_queue_stats)
         self._sink_task = loop.create_task(self._sink_task_handler())
         self._sink_clock_queue = asyncio.PriorityQueue()
         self._sink_clock_task = loop.create_task(self._sink_clock_task_handler())
@@ -243,6 +311,12 @@ class BaseOutputTransport(FrameProcessor):
             await self._sink_clock_task
             self._sink_clock_task = None
 
+    async def _interrupt_sink_tasks(self):
+        await self._sink_interruption.interrupt(self._sink_task)
+        await self._sink_clock_interruption.interrupt(self._sink_clock_task)
+        self._discard_queued_frames(self._sink_queue)
+        self._discard_queued_frames(self._sink_clock_queue)
+
     async def _sink_frame_handler(self, frame: Frame):
         if isinstance(frame, OutputAudioRawFrame):
             await self._audio_out_queue.put(frame)
@@ -259,21 +333,33 @@ class BaseOutputTransport(FrameProcessor):
     async def _sink_task_handler(self):
         running = True
         while running:
+            # Whether we got a frame from the queue and haven't finished it.
+            busy = False
             try:
                 frame = await self._sink_queue.get()
+                busy = True
                 await self._sink_frame_handler(frame)
                 running = not isinstance(frame, EndFrame)
+                busy = False
                 self._sink_queue.task_done()
             except asyncio.CancelledError:
-                break
+                if not self._sink_interruption.interrupted():
+                    break
+                if busy:
+                    self._sink_queue.task_done()
             except Exception as e:
                 logger.exception(f"{self} error processing sink queue: {e}")
+                if busy:
+                    self._sink_queue.task_done()
 
     async def _sink_clock_task_handler(self):
         running = True
         while running:
+            # Whether we got a frame from the queue and haven't finished it.
+            busy = False
             try:
                 timestamp, _, frame = await self._sink_clock_queue.get()
+                busy = True
 
                 # If we hit an EndFrame, we can finish right away.
                 running = not isinstance(frame, EndFrame)
@@ -285,14 +371,30 @@ class BaseOutputTransport(FrameProcessor):
                     current_time = self.get_clock().get_time()
                     if timestamp > current_time:
                         wait_time = nanoseconds_to_seconds(timestamp - current_time)
-                        await asyncio.sleep(wait_time)
+                        await self.get_clock().sleep(wait_time)
                     await self._sink_frame_handler(frame)
 
+                busy = False
                 self._sink_clock_queue.task_done()
             except asyncio.CancelledError:
-                break
+                if not self._sink_clock_interruption.interrupted():
+                    break
+                if busy:
+                    self._sink_clock_queue.task_done()
             except Exception as e:
                 logger.exception(f"{self} error processing sink clock queue: {e}")
+                if busy:
+                    self._sink_clock_queue.task_done()
+
+    def _clock_time(self) -> float:
+        return nanoseconds_to_seconds(self.get_clock().get_time())
+
+    def _discard_queued_frames(self, queue: asyncio.Queue | None):
+        if not queue:
+            return
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
 
     #
     # Output tasks
@@ -306,7 +408,9 @@ class BaseOutputTransport(FrameProcessor):
             self._camera_out_task = loop.create_task(self._camera_out_task_handler())
         # Create audio output queue and task if needed.
         if self._params.audio_out_enabled:
-            self._audio_out_queue = asyncio.Queue()
+            self._audio_out_queue = FrameQueue(
+                self._params.audio_out_queue_params, self._out_queue_stats
+            )
             self._audio_out_task = loop.create_task(self._audio_out_task_handler())
 
     async def _stop_output_tasks(self):
@@ -318,6 +422,14 @@ class BaseOutputTransport(FrameProcessor):
         if self._audio_out_task and self._params.audio_out_enabled:
             await self._audio_out_task
 
+    async def _interrupt_output_tasks(self):
+        if self._camera_out_task and self._params.camera_out_enabled:
+            await self._camera_out_interruption.interrupt(self._camera_out_task)
+            self._discard_queued_frames(self._camera_out_queue)
+        if self._audio_out_task and self._params.audio_out_enabled:
+            await self._audio_out_interruption.interrupt(self._audio_out_task)
+            self._discard_queued_frames(self._audio_out_queue)
+
     async def _cancel_output_tasks(self):
         # Stop camera output task.
         if self._camera_out_task and self._params.camera_out_enabled:
@@ -341,6 +453,9 @@ class BaseOutputTransport(FrameProcessor):
         desired_size = (self._params.camera_out_width, self._params.camera_out_height)
 
         if frame.size != desired_size:
+            # Pillow is only needed if we need to resize images.
+            from PIL import Image
+
             image = Image.frombytes(frame.format, frame.size, frame.image)
             resized_image = image.resize(desired_size)
             logger.warning(f"{frame} does not have the expected size {desired_size}, resizing")
@@ -362,45 +477,52 @@ class BaseOutputTransport(FrameProcessor):
         self._camera_out_frame_duration = 1 / self._params.camera_out_framerate
         self._camera_out_frame_reset = self._camera_out_frame_duration * 5
         while self._running_out_tasks:
+            # Whether we got an image from the queue and haven't rendered it.
+            busy = False
             try:
                 if self._params.camera_out_is_live:
-                    await self._camera_out_is_live_handler()
+                    image = await self._camera_out_queue.get()
+                    busy = True
+                    await self._camera_out_is_live_handler(image)
+                    busy = False
+                    self._camera_out_queue.task_done()
                 elif self._camera_images:
                     image = next(self._camera_images)
                     await self._draw_image(image)
-                    await asyncio.sleep(self._camera_out_frame_duration)
+                    await self.get_clock().sleep(self._camera_out_frame_duration)
                 else:
-                    await asyncio.sleep(self._camera_out_frame_duration)
+                    await self.get_clock().sleep(self._camera_out_frame_duration)
             except asyncio.CancelledError:
-                break
+                if not self._camera_out_interruption.interrupted():
+                    break
+                if busy:
+                    self._camera_out_queue.task_done()
             except Exception as e:
                 logger.exception(f"{self} error writing to camera: {e}")
+                if busy:
+                    self._camera_out_queue.task_done()
 
-    async def _camera_out_is_live_handler(self):
-        image = await self._camera_out_queue.get()
-
+    async def _camera_out_is_live_handler(self, image: OutputImageRawFrame):
         # We get the start time as soon as we get the first image.
         if not self._camera_out_start_time:
-            self._camera_out_start_time = time.time()
+            self._camera_out_start_time = self._clock_time()
             self._camera_out_frame_index = 0
 
         # Calculate how much time we need to wait before rendering next image.
-        real_elapsed_time = time.time() - self._camera_out_start_time
+        real_elapsed_time = self._clock_time() - self._camera_out_start_time
         real_render_time = self._camera_out_frame_index * self._camera_out_frame_duration
         delay_time = self._camera_out_frame_duration + real_render_time - real_elapsed_time
 
         if abs(delay_time) > self._camera_out_frame_reset:
-            self._camera_out_start_time = time.time()
+            self._camera_out_start_time = self._clock_time()
             self._camera_out_frame_index = 0
         elif delay_time > 0:
-            await asyncio.sleep(delay_time)
+            await self.get_clock().sleep(delay_time)
             self._camera_out_frame_index += 1
 
         # Render image
         await self._draw_image(image)
 
-        self._camera_out_queue.task_done()
-
     #
     # Audio out
     #
@@ -412,7 +534,7 @@ class BaseOutputTransport(FrameProcessor):
         async def without_mixer(vad_stop_secs: float) -> AsyncGenerator[AudioRawFrame, None]:
             while self._running_out_tasks or self._bot_speaking:
                 try:
-                    frame = await asyncio.wait_for(
+                    frame = await self.get_clock().wait_for(
                         self._audio_out_queue.get(), timeout=vad_stop_secs
                     )
                     yield frame
@@ -427,11 +549,11 @@ class BaseOutputTransport(FrameProcessor):
                 try:
                     frame = self._audio_out_queue.get_nowait()
                     frame.audio = await self._params.audio_out_mixer.mix(frame.audio)
-                    last_frame_time = time.time()
+                    last_frame_time = self._clock_time()
                     yield frame
                 except asyncio.QueueEmpty:
                     # Notify the bot stopped speaking upstream if necessary.
-                    diff_time = time.time() - last_frame_time
+                    diff_time = self._clock_time() - last_frame_time
                     if diff_time > vad_stop_secs:
                         await self._bot_stopped_speaking()
                     # Generate an audio frame with only the mixer's part.
@@ -453,21 +575,26 @@ class BaseOutputTransport(FrameProcessor):
             return without_mixer(vad_stop_secs)
 
     async def _audio_out_task_handler(self):
-        try:
-            async for frame in self._next_audio_frame():
-                # Notify the bot started speaking upstream if necessary and that
-                # it's actually speaking.
-                if isinstance(frame, TTSAudioRawFrame):
-                    await self._bot_started_speaking()
-                    await self.push_frame(BotSpeakingFrame())
-                    await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
-
-                # Also, push frame downstream in case anyone else needs it.
-                await self.push_frame(frame)
-
-                # Send audio.
-                await self.write_raw_audio_frames(frame.audio)
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.exception(f"{self} error writing to microphone: {e}")
+        running = True
+        while running:
+            try:
+                async for frame in self._next_audio_frame():
+                    # Notify the bot started speaking upstream if necessary and
+                    # that it's actually speaking.
+                    if isinstance(frame, TTSAudioRawFrame):
+                        await self._bot_started_speaking()
+                        await self.push_frame(BotSpeakingFrame())
+                        await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
+
+                    # Also, push frame downstream in case anyone else needs it.
+                    await self.push_frame(frame)
+
+                    # Send audio.
+                    await self.write_raw_audio_frames(frame.audio)
+                running = False
+            except asyncio.CancelledError:
+                # If interrupted, we just start over with a new generator.
+                running = self._audio_out_interruption.interrupted()
+            except Exception as e:
+                logger.exception(f"{self} error writing to microphone: {e}")
+                running = False
@@ -16,7 +16,9 @@ from pydantic import BaseModel
 from pipecat.audio.filters.base_audio_filter import BaseAudioFilter
 from pipecat.audio.mixers.base_audio_mixer import BaseAudioMixer
 from pipecat.audio.vad.vad_analyzer import VADAnalyzer
+from pipecat.audio.vad.vad_worker import VADWorker
 from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.processors.frame_queue import FrameQueueParams
 
 from loguru import logger
 
@@ -37,6 +39,7 @@ class TransportParams(BaseModel):
     audio_out_channels: int = 1
     audio_out_bitrate: int = 96000
     audio_out_mixer: Optional[BaseAudioMixer] = None
+    audio_out_queue_params: Optional[FrameQueueParams] = None
     audio_in_enabled: bool = False
     audio_in_sample_rate: int = 16000
     audio_in_channels: int = 1
@@ -44,6 +47,11 @@ class TransportParams(BaseModel):
     vad_enabled: bool = False
     vad_audio_passthrough: bool = False
     vad_analyzer: VADAnalyzer | None = None
+    # With a VAD worker, user speaking frames are pushed by the audio input
+    # task in order with the audio frames, before the next audio frame after
+    # the worker reports the state change (audio frames received while the
+    # worker was analyzing go first).
+    vad_worker: VADWorker | None = None
 
 
 class BaseTransport(ABC):
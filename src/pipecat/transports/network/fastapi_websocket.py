@@ -7,7 +7,6 @@
 
 import asyncio
 import io
-import time
 import typing
 import wave
 
@@ -26,6 +25,7 @@ from pipecat.serializers.base_serializer import FrameSerializer, FrameSerializer
 from pipecat.transports.base_input import BaseInputTransport
 from pipecat.transports.base_output import BaseOutputTransport
 from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.time import nanoseconds_to_seconds
 
 from loguru import logger
 
@@ -107,6 +107,14 @@ class FastAPIWebsocketOutputTransport(BaseOutputTransport):
             await self._write_frame(frame)
             self._next_send_time = 0
 
+    async def _bot_stopped_speaking(self):
+        if self._bot_speaking:
+            # Send any audio the serializer still holds (e.g. a resampler tail).
+            payload = self._params.serializer.flush()
+            if payload and self._websocket.client_state == WebSocketState.CONNECTED:
+                await self._send_data(payload)
+        await super()._bot_stopped_speaking()
+
     async def write_raw_audio_frames(self, frames: bytes):
         if self._websocket.client_state != WebSocketState.CONNECTED:
             # Simulate audio playback with a sleep.
@@ -152,12 +160,14 @@ class FastAPIWebsocketOutputTransport(BaseOutputTransport):
             return self._websocket.send_text(data)
 
     async def _write_audio_sleep(self):
-        # Simulate a clock.
-        current_time = time.monotonic()
+        # Simulate audio playback with the pipeline clock, so this runs faster
+        # than real time with a virtual clock.
+        clock = self.get_clock()
+        current_time = nanoseconds_to_seconds(clock.get_time())
         sleep_duration = max(0, self._next_send_time - current_time)
-        await asyncio.sleep(sleep_duration)
+        await clock.sleep(sleep_duration)
         if sleep_duration == 0:
-            self._next_send_time = time.monotonic() + self._send_interval
+            self._next_send_time = nanoseconds_to_seconds(clock.get_time()) + self._send_interval
         else:
             self._next_send_time += self._send_interval
 
@@ -6,8 +6,9 @@
 
 import asyncio
 import io
-import time
+import socket
 import wave
+from http import HTTPStatus
 
 from typing import Awaitable, Callable
 from pydantic import BaseModel
@@ -27,6 +28,7 @@ from pipecat.serializers.protobuf import ProtobufFrameSerializer
 from pipecat.transports.base_input import BaseInputTransport
 from pipecat.transports.base_output import BaseOutputTransport
 from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.time import nanoseconds_to_seconds
 
 from loguru import logger
 
@@ -55,14 +57,18 @@ class WebsocketServerInputTransport(BaseInputTransport):
         port: int,
         params: WebsocketServerParams,
         callbacks: WebsocketServerCallbacks,
+        sock: socket.socket | None = None,
         **kwargs,
     ):
         super().__init__(params, **kwargs)
 
         self._host = host
         self._port = port
+        self._sock = sock
         self._params = params
         self._callbacks = callbacks
+        self._server = None
+        self._client_taken = False
 
         self._websocket: websockets.WebSocketServerProtocol | None = None
 
@@ -83,9 +89,32 @@ class WebsocketServerInputTransport(BaseInputTransport):
         await self._server_task
 
     async def _server_task_handler(self):
-        logger.info(f"Starting websocket server on {self._host}:{self._port}")
-        async with websockets.serve(self._client_handler, self._host, self._port) as server:
+        if self._sock:
+            # The socket might be shared with other sessions (and processes),
+            # so we serve on our own copy that we can close.
+            logger.info(f"Starting websocket server on {self._sock.getsockname()}")
+            serve = websockets.serve(
+                self._client_handler, sock=self._sock.dup(), process_request=self._process_request
+            )
+        else:
+            logger.info(f"Starting websocket server on {self._host}:{self._port}")
+            serve = websockets.serve(self._client_handler, self._host, self._port)
+        async with serve as server:
+            self._server = server
             await self._stop_server_event.wait()
+        self._server = None
+
+    async def _process_request(self, path, request_headers):
+        # With a shared socket, the session only serves its first client and
+        # other sessions take the next ones. We stop listening once the first
+        # client connects, but connections accepted before that (they are
+        # accepted in batches) might still land here, so we reject them
+        # instead of replacing our client and they can try again.
+        if self._client_taken:
+            logger.warning("Session already has a client, rejecting new connection")
+            return (HTTPStatus.SERVICE_UNAVAILABLE, [], b"Session already has a client\n")
+        self._client_taken = True
+        return None
 
     async def _client_handler(self, websocket: websockets.WebSocketServerProtocol, path):
         logger.info(f"New client connection from {websocket.remote_address}")
@@ -95,6 +124,12 @@ class WebsocketServerInputTransport(BaseInputTransport):
 
         self._websocket = websocket
 
+        # If the socket is shared, other sessions take the next clients. We
+        # can only stop listening after the handshake, otherwise the server
+        # would reject our client as well.
+        if self._sock and self._server:
+            self._server.server.close()
+
         # Notify
         await self._callbacks.on_client_connected(websocket)
 
@@ -145,6 +180,14 @@ class WebsocketServerOutputTransport(BaseOutputTransport):
             await self._write_frame(frame)
             self._next_send_time = 0
 
+    async def _bot_stopped_speaking(self):
+        if self._bot_speaking:
+            # Send any audio the serializer still holds (e.g. a resampler tail).
+            payload = self._params.serializer.flush()
+            if payload and self._websocket:
+                await self._websocket.send(payload)
+        await super()._bot_stopped_speaking()
+
     async def write_raw_audio_frames(self, frames: bytes):
         if not self._websocket:
             # Simulate audio playback with a sleep.
@@ -184,12 +227,14 @@ class WebsocketServerOutputTransport(BaseOutputTransport):
             await self._websocket.send(payload)
 
     async def _write_audio_sleep(self):
-        # Simulate a clock.
-        current_time = time.monotonic()
+        # Simulate audio playback with the pipeline clock, so this runs faster
+        # than real time with a virtual clock.
+        clock = self.get_clock()
+        current_time = nanoseconds_to_seconds(clock.get_time())
         sleep_duration = max(0, self._next_send_time - current_time)
-        await asyncio.sleep(sleep_duration)
+        await clock.sleep(sleep_duration)
         if sleep_duration == 0:
-            self._next_send_time = time.monotonic() + self._send_interval
+            self._next_send_time = nanoseconds_to_seconds(clock.get_time()) + self._send_interval
         else:
             self._next_send_time += self._send_interval
 
@@ -203,10 +248,12 @@ class WebsocketServerTransport(BaseTransport):
         input_name: str | None = None,
         output_name: str | None = None,
         loop: asyncio.AbstractEventLoop | None = None,
+        sock: socket.socket | None = None,
     ):
         super().__init__(input_name=input_name, output_name=output_name, loop=loop)
         self._host = host
         self._port = port
+        self._sock = sock
         self._params = params
 
         self._callbacks = WebsocketServerCallbacks(
@@ -225,7 +272,12 @@ class WebsocketServerTransport(BaseTransport):
     def input(self) -> WebsocketServerInputTransport:
         if not self._input:
             self._input = WebsocketServerInputTransport(
-                self._host, self._port, self._params, self._callbacks, name=self._input_name
+                self._host,
+                self._port,
+                self._params,
+                self._callbacks,
+                sock=self._sock,
+                name=self._input_name,
             )
         return self._input
 
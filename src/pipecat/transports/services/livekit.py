@@ -6,14 +6,13 @@
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, List
+from typing import Any, Awaitable, Callable, Dict, List
 
 from pydantic import BaseModel
 
-from pipecat.audio.utils import resample_audio
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
 from pipecat.audio.vad.vad_analyzer import VADAnalyzer
 from pipecat.frames.frames import (
-    AudioRawFrame,
     CancelFrame,
     EndFrame,
     Frame,
@@ -315,6 +314,9 @@ class LiveKitInputTransport(BaseInputTransport):
         self._client = client
         self._audio_in_task = None
         self._vad_analyzer: VADAnalyzer | None = params.vad_analyzer
+        # The audio of all participants comes interleaved in the same queue, so
+        # each participant needs its own resampler state.
+        self._resamplers: Dict[str, StreamResampler] = {}
 
     async def start(self, frame: StartFrame):
         await super().start(frame)
@@ -361,15 +363,13 @@ class LiveKitInputTransport(BaseInputTransport):
                 audio_data = await self._client.get_next_audio_frame()
                 if audio_data:
                     audio_frame_event, participant_id = audio_data
-                    pipecat_audio_frame = self._convert_livekit_audio_to_pipecat(audio_frame_event)
-                    input_audio_frame = InputAudioRawFrame(
-                        audio=pipecat_audio_frame.audio,
-                        sample_rate=pipecat_audio_frame.sample_rate,
-                        num_channels=pipecat_audio_frame.num_channels,
+                    resampler = self._resamplers.get(participant_id)
+                    if not resampler:
+                        resampler = StreamResampler()
+                        self._resamplers[participant_id] = resampler
+                    input_audio_frame = self._convert_livekit_audio_to_pipecat(
+                        audio_frame_event, resampler
                     )
-                    await self.push_frame(
-                        pipecat_audio_frame
-                    )  # TODO: ensure audio frames are pushed with the default BaseInputTransport.push_audio_frame()
                     await self.push_audio_frame(input_audio_frame)
             except asyncio.CancelledError:
                 logger.info("Audio input task cancelled")
@@ -378,18 +378,18 @@ class LiveKitInputTransport(BaseInputTransport):
                 logger.error(f"Error in audio input task: {e}")
 
     def _convert_livekit_audio_to_pipecat(
-        self, audio_frame_event: rtc.AudioFrameEvent
-    ) -> AudioRawFrame:
+        self, audio_frame_event: rtc.AudioFrameEvent, resampler: StreamResampler
+    ) -> InputAudioRawFrame:
         audio_frame = audio_frame_event.frame
         audio_data = audio_frame.data
         original_sample_rate = audio_frame.sample_rate
 
         if original_sample_rate != self._params.audio_in_sample_rate:
-            audio_data = resample_audio(
+            audio_data = resampler.resample(
                 audio_data, original_sample_rate, self._params.audio_in_sample_rate
             )
 
-        return AudioRawFrame(
+        return InputAudioRawFrame(
             audio=audio_data,
             sample_rate=self._params.audio_in_sample_rate,
             num_channels=audio_frame.num_channels,
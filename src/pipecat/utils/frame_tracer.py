@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Structured frame-flow tracing.
+
+When enabled, every frame pushed between processors is recorded as a
+`FrameTraceRecord` in a fixed-size ring buffer. Nothing is formatted while
+recording, so tracing is cheap enough to leave on while debugging real-time
+pipelines, and the buffer can be dumped later (e.g. after an error).
+
+Tracing is disabled by default and costs nothing in that case: processors
+check whether tracing is enabled once, when they are created. So, tracing
+needs to be enabled before creating the pipeline, either with
+`enable_frame_tracing()` or by setting the `PIPECAT_FRAME_TRACE` environment
+variable to the ring buffer capacity (e.g. `PIPECAT_FRAME_TRACE=4096`). A
+capacity of 0 or less keeps tracing disabled.
+
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional, TextIO
+
+from loguru import logger
+
+from pipecat.utils.time import nanoseconds_to_seconds
+
+DEFAULT_FRAME_TRACE_CAPACITY = 4096
+
+
+class FrameTraceRecord(NamedTuple):
+    frame_id: int
+    frame_type: str
+    src: str
+    dst: str
+    timestamp_ns: int
+
+
+class FrameTracer:
+    def __init__(self, capacity: int = DEFAULT_FRAME_TRACE_CAPACITY):
+        self._records = deque(maxlen=capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._records.maxlen
+
+    def record(self, frame, src, dst):
+        # Only store references here, records are built when requested.
+        self._records.append((frame.id, frame.__class__, src.name, dst.name, time.monotonic_ns()))
+
+    def records(self) -> List[FrameTraceRecord]:
+        return [
+            FrameTraceRecord(frame_id, frame_type.__name__, src, dst, timestamp_ns)
+            for (frame_id, frame_type, src, dst, timestamp_ns) in self._records
+        ]
+
+    def clear(self):
+        self._records.clear()
+
+    def dump(self, file: TextIO = sys.stderr):
+        records = self.records()
+        start_ns = records[0].timestamp_ns if records else 0
+        for r in records:
+            elapsed = nanoseconds_to_seconds(r.timestamp_ns - start_ns)
+            print(f"{elapsed:12.6f} {r.src} -> {r.dst}: {r.frame_type}#{r.frame_id}", file=file)
+
+
+_frame_tracer: Optional[FrameTracer] = None
+
+
+def enable_frame_tracing(capacity: int = DEFAULT_FRAME_TRACE_CAPACITY) -> FrameTracer:
+    global _frame_tracer
+    _frame_tracer = FrameTracer(capacity)
+    return _frame_tracer
+
+
+def disable_frame_tracing():
+    global _frame_tracer
+    _frame_tracer = None
+
+
+def get_frame_tracer() -> Optional[FrameTracer]:
+    return _frame_tracer
+
+
+def _enable_frame_tracing_from_env(value: Optional[str]):
+    if not value:
+        return
+    try:
+        capacity = int(value)
+    except ValueError:
+        logger.error(f"Ignoring PIPECAT_FRAME_TRACE={value!r}, it should be the trace capacity")
+        return
+    if capacity > 0:
+        enable_frame_tracing(capacity)
+
+
+_enable_frame_tracing_from_env(os.getenv("PIPECAT_FRAME_TRACE"))
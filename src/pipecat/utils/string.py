@@ -5,21 +5,133 @@
 #
 
 import re
+from typing import List
 
-ENDOFSENTENCE_PATTERN_STR = r"""
+# Sentence ends that can be anywhere in the text. Whether a character is a
+# sentence end only depends on the characters before it.
+ENDOFSENTENCE_PUNCTUATION_PATTERN_STR = r"""
     (?<![A-Z])       # Negative lookbehind: not preceded by an uppercase letter (e.g., "U.S.A.")
     (?<!\d)          # Negative lookbehind: not preceded by a digit (e.g., "1. Let's start")
     (?<!\d\s[ap])    # Negative lookbehind: not preceded by time (e.g., "3:00 a.m.")
     (?<!Mr|Ms|Dr)    # Negative lookbehind: not preceded by Mr, Ms, Dr (combined bc. length is the same)
     (?<!Mrs)         # Negative lookbehind: not preceded by "Mrs"
     (?<!Prof)        # Negative lookbehind: not preceded by "Prof"
-    [\.\?\!:;]|      # Match a period, question mark, exclamation point, colon, or semicolon
+    [\.\?\!:;]       # Match a period, question mark, exclamation point, colon, or semicolon
+"""
+ENDOFSENTENCE_PATTERN_STR = (
+    ENDOFSENTENCE_PUNCTUATION_PATTERN_STR
+    + r"""
+    |
     [。？！：；]       # the full-width version (mainly used in East Asian languages such as Chinese)
     $                # End of string
 """
+)
 ENDOFSENTENCE_PATTERN = re.compile(ENDOFSENTENCE_PATTERN_STR, re.VERBOSE)
+ENDOFSENTENCE_PUNCTUATION_PATTERN = re.compile(ENDOFSENTENCE_PUNCTUATION_PATTERN_STR, re.VERBOSE)
+
+# Full-width sentence ends only count at the end of the text.
+ENDOFSENTENCE_FULLWIDTH = "。？！：；"
+
+# Longest lookbehind in `ENDOFSENTENCE_PUNCTUATION_PATTERN_STR` ("Prof").
+ENDOFSENTENCE_LOOKBEHIND = 4
 
 
 def match_endofsentence(text: str) -> int:
     match = ENDOFSENTENCE_PATTERN.search(text.rstrip())
     return match.end() if match else 0
+
+
+class SentenceSegmenter:
+    """Finds the end of sentences in a stream of text (e.g. LLM tokens).
+
+    `append()` returns the same as calling `match_endofsentence()` with all
+    the text appended so far (and not removed with `pop()`), but only the new
+    text is searched, so the cost of a token doesn't depend on the length of
+    the sentence it belongs to.
+
+    >>> segmenter = SentenceSegmenter()
+    >>> segmenter.append("Hello, Mr")
+    0
+    >>> segmenter.append(". Smith. How")
+    17
+    >>> segmenter.pop(17)
+    'Hello, Mr. Smith.'
+    >>> segmenter.text
+    ' How'
+
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        # Start of the text in the stream (i.e. characters popped so far).
+        self._start = 0
+        # End of the text in the stream.
+        self._end = 0
+        # The last characters appended, needed for the lookbehinds.
+        self._tail = ""
+        # End (in the stream) of the sentence ends found and not popped.
+        self._ends: List[int] = []
+        # Last non-whitespace character and its end (in the stream).
+        self._last_char = ""
+        self._last_char_end = 0
+
+    @property
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def append(self, text: str) -> int:
+        """Appends `text` and returns the end of the first sentence in the
+        text (or 0 if there's no complete sentence).
+
+        """
+        if text:
+            offset = self._end - len(self._tail)
+            for match in ENDOFSENTENCE_PUNCTUATION_PATTERN.finditer(
+                self._tail + text, len(self._tail)
+            ):
+                self._ends.append(offset + match.end())
+
+            stripped = text.rstrip()
+            if stripped:
+                self._last_char = stripped[-1]
+                self._last_char_end = self._end + len(stripped)
+
+            self._parts.append(text)
+            self._end += len(text)
+            self._tail = (self._tail + text)[-ENDOFSENTENCE_LOOKBEHIND:]
+
+        if self._ends:
+            return self._ends[0] - self._start
+        if self._last_char_end > self._start and self._last_char in ENDOFSENTENCE_FULLWIDTH:
+            return self._last_char_end - self._start
+        return 0
+
+    def pop(self, end: int | None = None) -> str:
+        """Removes and returns the first `end` characters of the text (all of
+        it if `end` is not given).
+
+        """
+        text = self.text
+        if end is None or end > len(text):
+            end = len(text)
+        remaining = text[end:]
+        self._parts = [remaining] if remaining else []
+        self._start += end
+
+        # The text is now searched as if it started here, so the sentence
+        # ends at the beginning need to be found again without the
+        # lookbehinds seeing the removed text.
+        head = len(remaining[:ENDOFSENTENCE_LOOKBEHIND])
+        self._ends = [e for e in self._ends if e > self._start + head]
+        self._ends[:0] = [
+            self._start + match.end()
+            for match in ENDOFSENTENCE_PUNCTUATION_PATTERN.finditer(remaining[:head])
+        ]
+        self._tail = self._tail[len(self._tail) - min(len(self._tail), len(remaining)) :]
+
+        return text[:end]
+
+    def clear(self):
+        self.pop()
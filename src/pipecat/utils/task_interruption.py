@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+
+
+class TaskInterruption:
+    """Interrupts whatever a long-lived task is doing without finishing it.
+
+    `interrupt()` cancels the task and waits until the task acknowledges the
+    interruption. The task catches `asyncio.CancelledError` as usual and calls
+    `interrupted()`, which tells whether the cancellation was an interruption
+    (and the task should keep running) or a real cancellation.
+
+        while True:
+            try:
+                ...
+            except asyncio.CancelledError:
+                if not interruption.interrupted():
+                    break
+
+    """
+
+    def __init__(self):
+        self._acknowledged: asyncio.Future | None = None
+
+    async def interrupt(self, task: asyncio.Task | None):
+        # A task can't interrupt itself, and there's nothing to interrupt if it
+        # has already finished.
+        if not task or task.done() or task is asyncio.current_task():
+            return
+
+        self._acknowledged = asyncio.get_running_loop().create_future()
+        task.cancel()
+        try:
+            # The task might finish instead of acknowledging the interruption.
+            await asyncio.wait({self._acknowledged, task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self._acknowledged = None
+
+    def interrupted(self) -> bool:
+        """Needs to be called from the interrupted task. Returns whether there
+        was a pending interruption, which is then acknowledged.
+
+        """
+        if not self._acknowledged or self._acknowledged.done():
+            return False
+
+        # We are not really cancelled anymore.
+        task = asyncio.current_task()
+        if task and hasattr(task, "uncancel"):
+            task.uncancel()
+        self._acknowledged.set_result(None)
+        return True
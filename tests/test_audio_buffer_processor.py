@@ -0,0 +1,154 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import os
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+from pipecat.audio.recorders.base_audio_recorder import BaseAudioRecorder
+from pipecat.audio.recorders.file_audio_recorder import FileAudioRecorder
+from pipecat.clocks.system_clock import SystemClock
+from pipecat.frames.frames import EndFrame, InputAudioRawFrame, OutputAudioRawFrame, StartFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.audio.audio_buffer_processor import AudioBufferProcessor
+from pipecat.processors.frame_processor import FrameDirection
+
+SAMPLE_RATE = 16000
+CHUNK = 320  # 20ms
+
+
+class MemoryAudioRecorder(BaseAudioRecorder):
+    def __init__(self):
+        self.blocks = []
+        self.started = None
+        self.stopped = False
+
+    async def start(self, sample_rate: int, num_channels: int):
+        self.started = (sample_rate, num_channels)
+
+    async def write(self, audio: bytes):
+        self.blocks.append(audio)
+
+    async def stop(self):
+        self.stopped = True
+
+
+def user_frame(i: int) -> InputAudioRawFrame:
+    audio = np.full(CHUNK, i + 1, dtype=np.int16).tobytes()
+    return InputAudioRawFrame(audio=audio, sample_rate=SAMPLE_RATE, num_channels=1)
+
+
+def bot_frame(samples: int) -> OutputAudioRawFrame:
+    audio = np.full(samples, -1, dtype=np.int16).tobytes()
+    return OutputAudioRawFrame(audio=audio, sample_rate=SAMPLE_RATE, num_channels=1)
+
+
+class TestAudioBufferProcessor(unittest.IsolatedAsyncioTestCase):
+    async def run_frames(self, processor: AudioBufferProcessor, frames):
+        task = PipelineTask(Pipeline([processor]))
+        await task.queue_frames(frames + [EndFrame()])
+        await task.run()
+
+    async def process_frames(self, processor: AudioBufferProcessor, frames):
+        """Input audio frames are system frames, so in a pipeline they would
+        get ahead of output audio frames. We want them in order here.
+
+        """
+
+        async def push_frame(frame, direction=FrameDirection.DOWNSTREAM):
+            pass
+
+        processor.push_frame = push_frame
+        for frame in [StartFrame(clock=SystemClock())] + frames + [EndFrame()]:
+            await processor.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    async def test_stream_aligned_blocks(self):
+        recorder = MemoryAudioRecorder()
+        processor = AudioBufferProcessor(
+            sample_rate=SAMPLE_RATE, num_channels=2, buffer_size=1000, recorders=[recorder]
+        )
+        blocks_sizes = []
+
+        @processor.event_handler("on_audio_data")
+        async def on_audio_data(processor, audio, sample_rate, num_channels):
+            blocks_sizes.append(len(audio))
+
+        # The bot speaks 0.1s (in one frame) after 10 user chunks.
+        frames = [user_frame(i) for i in range(10)]
+        frames += [bot_frame(1600)]
+        frames += [user_frame(i) for i in range(10, 50)]
+        await self.process_frames(processor, frames)
+
+        self.assertEqual(recorder.started, (SAMPLE_RATE, 2))
+        self.assertTrue(recorder.stopped)
+        self.assertTrue(all(len(block) == 2000 for block in recorder.blocks[:-1]))
+        self.assertEqual(blocks_sizes, [len(block) for block in recorder.blocks])
+
+        stereo = np.frombuffer(b"".join(recorder.blocks), dtype=np.int16).reshape(-1, 2)
+        expected_user = np.repeat(np.arange(1, 51, dtype=np.int16), CHUNK)
+        expected_bot = np.zeros(50 * CHUNK, dtype=np.int16)
+        expected_bot[10 * CHUNK : 10 * CHUNK + 1600] = -1
+        np.testing.assert_array_equal(stereo[:, 0], expected_user)
+        np.testing.assert_array_equal(stereo[:, 1], expected_bot)
+
+        # Nothing kept in memory.
+        self.assertFalse(processor.merge_audio_buffers())
+
+    async def test_memory_is_bounded(self):
+        recorder = MemoryAudioRecorder()
+        processor = AudioBufferProcessor(sample_rate=SAMPLE_RATE, recorders=[recorder])
+        max_pending = 0
+
+        task = PipelineTask(Pipeline([processor]))
+        frames = [user_frame(i % 100) for i in range(500)] + [EndFrame()]
+        await task.queue_frames(frames)
+
+        original_process_blocks = processor._process_blocks
+
+        async def process_blocks():
+            nonlocal max_pending
+            await original_process_blocks()
+            max_pending = max(max_pending, len(processor._user_audio_buffer))
+
+        processor._process_blocks = process_blocks
+        await task.run()
+
+        self.assertLess(max_pending, SAMPLE_RATE * 2)
+        self.assertEqual(sum(len(block) for block in recorder.blocks), 500 * CHUNK * 2)
+
+    async def test_file_recorder(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            wav_file = os.path.join(tmp_dir, "recording.wav")
+            flac_file = os.path.join(tmp_dir, "recording.flac")
+            processor = AudioBufferProcessor(
+                sample_rate=SAMPLE_RATE,
+                recorders=[FileAudioRecorder(wav_file), FileAudioRecorder(flac_file)],
+            )
+            frames = [user_frame(i) for i in range(100)]
+            await self.run_frames(processor, frames)
+
+            with wave.open(wav_file, "rb") as wf:
+                self.assertEqual(wf.getframerate(), SAMPLE_RATE)
+                self.assertEqual(wf.getnchannels(), 1)
+                wav_audio = wf.readframes(wf.getnframes())
+            expected = b"".join(frame.audio for frame in frames)
+            self.assertEqual(wav_audio, expected)
+
+            try:
+                import soundfile as sf
+            except ModuleNotFoundError:
+                return
+            flac_audio, sample_rate = sf.read(flac_file, dtype="int16")
+            self.assertEqual(sample_rate, SAMPLE_RATE)
+            self.assertEqual(flac_audio.tobytes(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+from pipecat.audio.audio_chunker import AudioChunker
+from pipecat.frames.frames import EndFrame, TTSAudioRawFrame, TTSStoppedFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+
+class TestAudioChunker(unittest.TestCase):
+    def test_chunks(self):
+        audio = bytes(range(256)) * 10
+        chunker = AudioChunker(64)
+        chunks = []
+        # Buffers smaller and bigger than a chunk.
+        for size in [10, 100, 1, 64, 500, 5]:
+            chunks += list(chunker.chunks(audio[:size]))
+            audio = audio[size:]
+        self.assertTrue(all(len(chunk) == 64 for chunk in chunks))
+        self.assertEqual(len(chunks), 680 // 64)
+        self.assertEqual(chunker.pending_bytes, 680 % 64)
+        self.assertEqual(b"".join(chunks), (bytes(range(256)) * 10)[: len(chunks) * 64])
+
+    def test_flush(self):
+        chunker = AudioChunker(64)
+        self.assertEqual(list(chunker.chunks(b"\x01" * 70)), [b"\x01" * 64])
+        self.assertEqual(chunker.flush(), b"\x01" * 6 + b"\x00" * 58)
+        self.assertEqual(chunker.flush(), b"")
+        list(chunker.chunks(b"\x01" * 10))
+        self.assertEqual(chunker.flush(pad=False), b"\x01" * 10)
+
+    def test_clear(self):
+        chunker = AudioChunker(64)
+        list(chunker.chunks(b"\x01" * 10))
+        chunker.clear()
+        self.assertEqual(list(chunker.chunks(b"\x02" * 64)), [b"\x02" * 64])
+
+
+class AudioCollectorOutputTransport(BaseOutputTransport):
+    def __init__(self, params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self.written = []
+
+    async def write_raw_audio_frames(self, frames: bytes):
+        self.written.append(frames)
+
+
+class TestOutputTransportChunking(unittest.IsolatedAsyncioTestCase):
+    async def test_tts_stopped_flushes_audio(self):
+        params = TransportParams(audio_out_enabled=True, audio_out_sample_rate=16000)
+        transport = AudioCollectorOutputTransport(params)
+        task = PipelineTask(Pipeline([transport]))
+
+        # XTTS sized frame, which is not a whole number of 20ms chunks.
+        audio = b"\x01\x00" * 24050
+        await task.queue_frames([TTSAudioRawFrame(audio, 16000, 1), TTSStoppedFrame(), EndFrame()])
+        await task.run()
+
+        self.assertTrue(all(len(chunk) == 640 for chunk in transport.written))
+        written = b"".join(transport.written)
+        self.assertEqual(written[: len(audio)], audio)
+        self.assertEqual(written[len(audio) :], bytes(len(written) - len(audio)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import threading
+import unittest
+
+import numpy as np
+
+from pipecat.audio.filters.agc_filter import AGCFilter
+from pipecat.audio.filters.audio_filter_chain import AudioFilterChain
+from pipecat.audio.filters.high_pass_filter import HighPassFilter
+from pipecat.audio.filters.sync_audio_filter import SyncAudioFilter
+from pipecat.frames.frames import FilterEnableFrame, FilterUpdateSettingsFrame
+
+SAMPLE_RATE = 16000
+CHUNK = 320  # 20ms
+
+
+class AddFilter(SyncAudioFilter):
+    def __init__(self, value: float):
+        super().__init__()
+        self.value = value
+        self.threads = set()
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        self.threads.add(threading.current_thread())
+        samples += self.value
+        return samples
+
+
+class ControlFilter(SyncAudioFilter):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        self.threads.add(threading.current_thread())
+        return samples
+
+    def process_control_frame(self, frame):
+        super().process_control_frame(frame)
+        self.threads.add(threading.current_thread())
+
+
+class ScaleFilter(SyncAudioFilter):
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        # Returns a new array (in double precision).
+        return samples.astype(np.float64) * 2
+
+
+def sine(amplitude: float, secs: float) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * secs)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.int16)
+
+
+async def filter_chunks(audio_filter, audio: np.ndarray) -> np.ndarray:
+    output = b""
+    for i in range(0, len(audio), CHUNK):
+        output += await audio_filter.filter(audio[i : i + CHUNK].tobytes())
+    return np.frombuffer(output, dtype=np.int16)
+
+
+class TestAudioFilterChain(unittest.IsolatedAsyncioTestCase):
+    async def test_filters_run_in_order_off_loop(self):
+        add = AddFilter(10)
+        chain = AudioFilterChain([add, ScaleFilter()])
+        await chain.start(SAMPLE_RATE)
+        audio = np.full(CHUNK * 3, 100, dtype=np.int16)
+        output = await filter_chunks(chain, audio)
+        await chain.stop()
+
+        np.testing.assert_array_equal(output, np.full(CHUNK * 3, 220))
+        self.assertNotIn(threading.current_thread(), add.threads)
+        self.assertEqual([stats.name for stats in chain.stats], ["AddFilter", "ScaleFilter"])
+        self.assertEqual([stats.chunks for stats in chain.stats], [3, 3])
+        self.assertTrue(all(stats.max_time >= stats.average_time > 0 for stats in chain.stats))
+
+    async def test_enable_and_clip(self):
+        add = AddFilter(30000)
+        chain = AudioFilterChain([add])
+        await chain.start(SAMPLE_RATE)
+        audio = np.full(CHUNK, 10000, dtype=np.int16)
+        np.testing.assert_array_equal(await filter_chunks(chain, audio), np.full(CHUNK, 32767))
+
+        # A single filter.
+        await add.process_frame(FilterEnableFrame(enable=False))
+        np.testing.assert_array_equal(await filter_chunks(chain, audio), audio)
+        await add.process_frame(FilterEnableFrame(enable=True))
+
+        # The whole chain.
+        await chain.process_frame(FilterEnableFrame(enable=False))
+        np.testing.assert_array_equal(await filter_chunks(chain, audio), audio)
+        await chain.stop()
+
+    async def test_control_frames_run_in_filter_thread(self):
+        control = ControlFilter()
+        chain = AudioFilterChain([control])
+        await chain.start(SAMPLE_RATE)
+        await filter_chunks(chain, np.zeros(CHUNK, dtype=np.int16))
+        await chain.process_frame(FilterUpdateSettingsFrame(settings={}))
+        await chain.stop()
+
+        # Audio and control frames are handled by the same (chain) thread.
+        self.assertEqual(len(control.threads), 1)
+        self.assertNotIn(threading.current_thread(), control.threads)
+
+
+class TestFilters(unittest.IsolatedAsyncioTestCase):
+    async def test_high_pass_removes_dc(self):
+        high_pass = HighPassFilter()
+        await high_pass.start(SAMPLE_RATE)
+        audio = sine(5000, 1) + 3000
+        output = await filter_chunks(high_pass, audio)
+        # After the filter settles there's no offset and the tone is intact.
+        settled = output[SAMPLE_RATE // 2 :].astype(np.float64)
+        self.assertLess(abs(settled.mean()), 50)
+        self.assertAlmostEqual(settled.std() / (5000 / np.sqrt(2)), 1.0, delta=0.05)
+
+    async def test_agc(self):
+        agc = AGCFilter(target_db=-20.0)
+        await agc.start(SAMPLE_RATE)
+
+        # Quiet speech is brought up to the target level.
+        output = await filter_chunks(agc, sine(500, 3))
+        tail = output[-SAMPLE_RATE // 2 :].astype(np.float64)
+        level_db = 10 * np.log10(np.mean(tail**2) / 32768**2)
+        self.assertAlmostEqual(level_db, -20.0, delta=1.0)
+
+        # Silence doesn't change the gain.
+        gain = agc.gain
+        await filter_chunks(
+            agc, np.random.default_rng(0).normal(0, 5, SAMPLE_RATE).astype(np.int16)
+        )
+        self.assertEqual(agc.gain, gain)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.audio.vad.cascaded import CascadedVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+PARAMS = VADParams(start_secs=0.1, stop_secs=0.3, min_volume=0)
+
+
+class LevelVADAnalyzer(VADAnalyzer):
+    """Thinks there's voice in any window louder than -40 dBFS."""
+
+    def __init__(self):
+        super().__init__(sample_rate=SAMPLE_RATE, num_channels=1, params=PARAMS)
+        self.calls = 0
+
+    def num_frames_required(self) -> int:
+        return WINDOW
+
+    def voice_confidence(self, buffer) -> float:
+        self.calls += 1
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float64)
+        return 1.0 if np.sqrt(np.mean(samples**2)) > 328 else 0.0
+
+
+def call_audio() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    silence = rng.normal(0, 10, SAMPLE_RATE * 2)
+    speech = 3000 * np.sin(2 * np.pi * 200 * t)
+    return np.concatenate((silence, speech, silence)).astype(np.int16)
+
+
+def states(analyzer: VADAnalyzer, audio: np.ndarray):
+    result = []
+    for i in range(0, len(audio) - WINDOW + 1, WINDOW):
+        result.append(analyzer.analyze_audio(audio[i : i + WINDOW].tobytes()))
+    return result
+
+
+class TestCascadedVADAnalyzer(unittest.TestCase):
+    def test_same_states_as_wrapped_analyzer(self):
+        audio = call_audio()
+        expected = states(LevelVADAnalyzer(), audio)
+
+        wrapped = LevelVADAnalyzer()
+        analyzer = CascadedVADAnalyzer(wrapped)
+        self.assertEqual(states(analyzer, audio), expected)
+
+        # Silence (4 of 5 seconds) is skipped, except for the hangover.
+        windows = len(expected)
+        self.assertEqual(analyzer.analyzed_windows + analyzer.skipped_windows, windows)
+        self.assertEqual(wrapped.calls, analyzer.analyzed_windows)
+        self.assertLess(analyzer.analyzed_windows, windows * 0.3)
+
+    def test_noise_is_skipped(self):
+        rng = np.random.default_rng(0)
+        # Loud enough to be in between thresholds, but white noise.
+        noise = rng.normal(0, 60, SAMPLE_RATE).astype(np.int16)
+        analyzer = CascadedVADAnalyzer(LevelVADAnalyzer())
+        states(analyzer, noise)
+        self.assertEqual(analyzer.analyzed_windows, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
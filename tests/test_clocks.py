@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+import unittest
+
+from pipecat.clocks.virtual_clock import VirtualClock
+from pipecat.frames.frames import EndFrame, Frame, TextFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.time import seconds_to_nanoseconds
+
+
+class TimestampCollector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TextFrame):
+            self.texts.append((frame.text, self.get_clock().get_time()))
+        await self.push_frame(frame, direction)
+
+
+class TestVirtualClock(unittest.IsolatedAsyncioTestCase):
+    async def test_sleepers_wake_up_in_order(self):
+        clock = VirtualClock()
+        woken = []
+
+        async def sleeper(name: str, seconds: float):
+            await clock.sleep(seconds)
+            woken.append((name, clock.get_time()))
+
+        start = time.monotonic()
+        await asyncio.gather(sleeper("c", 300), sleeper("a", 100), sleeper("b", 200))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(
+            woken,
+            [
+                ("a", seconds_to_nanoseconds(100)),
+                ("b", seconds_to_nanoseconds(200)),
+                ("c", seconds_to_nanoseconds(300)),
+            ],
+        )
+
+    async def test_wait_for_timeout(self):
+        clock = VirtualClock()
+        with self.assertRaises(asyncio.TimeoutError):
+            await clock.wait_for(asyncio.Event().wait(), timeout=60)
+        self.assertEqual(clock.get_time(), seconds_to_nanoseconds(60))
+        self.assertEqual(await clock.wait_for(asyncio.sleep(0, "done"), timeout=60), "done")
+
+    async def test_output_transport_presentation_timestamps(self):
+        clock = VirtualClock()
+        output = BaseOutputTransport(TransportParams())
+        collector = TimestampCollector()
+        task = PipelineTask(Pipeline([output, collector]), clock=clock)
+
+        frames = []
+        for i, text in enumerate(["one", "two", "three"]):
+            frame = TextFrame(text)
+            # A minute between frames.
+            frame.pts = seconds_to_nanoseconds(60 * (i + 1))
+            frames.append(frame)
+
+        start = time.monotonic()
+        await task.queue_frames(list(reversed(frames)) + [EndFrame()])
+        await task.run()
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(
+            collector.texts,
+            [
+                ("one", seconds_to_nanoseconds(60)),
+                ("two", seconds_to_nanoseconds(120)),
+                ("three", seconds_to_nanoseconds(180)),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
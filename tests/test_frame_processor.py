@@ -0,0 +1,308 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.clocks.system_clock import SystemClock
+from pipecat.frames.frames import (
+    CancelFrame,
+    DataFrame,
+    EndFrame,
+    Frame,
+    OutputAudioRawFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TextFrame,
+    TransportMessageFrame,
+    TTSAudioRawFrame,
+)
+from pipecat.pipeline.base_pipeline import BasePipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.aggregators.llm_response import (
+    LLMAssistantResponseAggregator,
+    LLMUserResponseAggregator,
+)
+from pipecat.processors.aggregators.sentence import SentenceAggregator
+from pipecat.processors.filters.identity_filter import IdentityFilter
+from pipecat.processors.frame_dispatcher import FrameDispatcher
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_queue import FrameQueue, FrameQueueParams, FrameQueuePolicy
+from pipecat.processors.metrics.frame_processor_instrumentation import LatencyHistogram
+from pipecat.processors.text_transformer import StatelessTextTransformer
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.frame_tracer import (
+    _enable_frame_tracing_from_env,
+    disable_frame_tracing,
+    enable_frame_tracing,
+    get_frame_tracer,
+)
+
+
+class FrameCollector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+
+class TestInlineProcessing(unittest.IsolatedAsyncioTestCase):
+    async def test_enable_inline_processing(self):
+        identity = IdentityFilter()
+        collector = FrameCollector()
+        self.assertTrue(identity.enable_inline_processing())
+        self.assertFalse(collector.enable_inline_processing())
+        self.assertTrue(identity.inline_processing_enabled)
+        self.assertFalse(collector.inline_processing_enabled)
+
+    async def test_inline_pipeline_keeps_order(self):
+        identity = IdentityFilter()
+        aggregator = SentenceAggregator()
+        upper = StatelessTextTransformer(lambda text: text.upper())
+        collector = FrameCollector()
+
+        pipeline = Pipeline([identity, aggregator, upper, collector], inline_processing=True)
+        self.assertTrue(pipeline.inline_processing_enabled)
+        self.assertTrue(aggregator.inline_processing_enabled)
+        self.assertFalse(collector.inline_processing_enabled)
+
+        task = PipelineTask(pipeline)
+        words = ["Hello, ", "world. ", "How ", "are ", "you? ", "Fine"]
+        await task.queue_frames([TextFrame(word) for word in words] + [EndFrame()])
+        await task.run()
+
+        texts = [f.text for f in collector.frames if isinstance(f, TextFrame)]
+        self.assertEqual(texts, ["HELLO, WORLD. ", "HOW ARE YOU? ", "FINE"])
+        self.assertIsInstance(collector.frames[-1], EndFrame)
+
+
+def audio_frame(audio: bytes) -> OutputAudioRawFrame:
+    return OutputAudioRawFrame(audio=audio, sample_rate=16000, num_channels=1)
+
+
+class TestFrameQueue(unittest.IsolatedAsyncioTestCase):
+    async def test_drop_oldest(self):
+        queue = FrameQueue(FrameQueueParams(max_size=2, policy=FrameQueuePolicy.DROP_OLDEST))
+        text = TextFrame("hello")
+        await queue.put(text)
+        await queue.put(audio_frame(b"\x01\x00"))
+        await queue.put(audio_frame(b"\x02\x00"))
+        self.assertEqual(queue.qsize(), 2)
+        self.assertIs(queue.get_nowait(), text)
+        self.assertEqual(queue.get_nowait().audio, b"\x02\x00")
+        self.assertEqual(queue.stats.overflows, 1)
+        self.assertEqual(queue.stats.dropped, 1)
+
+    async def test_drop_newest(self):
+        queue = FrameQueue(FrameQueueParams(max_size=1, policy=FrameQueuePolicy.DROP_NEWEST))
+        await queue.put(audio_frame(b"\x01\x00"))
+        await queue.put(audio_frame(b"\x02\x00"))
+        self.assertEqual(queue.qsize(), 1)
+        self.assertEqual(queue.get_nowait().audio, b"\x01\x00")
+        self.assertEqual(queue.stats.dropped, 1)
+
+    async def test_coalesce(self):
+        queue = FrameQueue(FrameQueueParams(max_size=1, policy=FrameQueuePolicy.COALESCE))
+        first = audio_frame(b"\x01\x00")
+        await queue.put((first, FrameDirection.DOWNSTREAM))
+        await queue.put((audio_frame(b"\x02\x00"), FrameDirection.DOWNSTREAM))
+        (frame, direction) = queue.get_nowait()
+        self.assertIsInstance(frame, OutputAudioRawFrame)
+        self.assertEqual(frame.audio, b"\x01\x00\x02\x00")
+        self.assertEqual(frame.num_frames, 2)
+        self.assertEqual(direction, FrameDirection.DOWNSTREAM)
+        # Queued frames might be shared, they are never modified.
+        self.assertEqual(first.audio, b"\x01\x00")
+        self.assertEqual(queue.stats.coalesced, 1)
+
+    async def test_non_audio_frames_are_never_dropped(self):
+        queue = FrameQueue(FrameQueueParams(max_size=1, policy=FrameQueuePolicy.DROP_NEWEST))
+        await queue.put(TextFrame("hello"))
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(queue.put(EndFrame()), timeout=0.01)
+        self.assertEqual(queue.stats.dropped, 0)
+
+
+class TestFrameDispatcher(unittest.IsolatedAsyncioTestCase):
+    def test_most_specific_handler(self):
+        dispatcher = FrameDispatcher(default="default")
+        dispatcher.register(DataFrame, "data")
+        dispatcher.register(OutputAudioRawFrame, "audio")
+        self.assertEqual(dispatcher.get(audio_frame(b"")), "audio")
+        self.assertEqual(dispatcher.get(TTSAudioRawFrame(b"", 16000, 1)), "audio")
+        self.assertEqual(dispatcher.get(TextFrame("hello")), "data")
+        self.assertEqual(dispatcher.get(EndFrame()), "default")
+
+    def test_register_clears_cache(self):
+        dispatcher = FrameDispatcher()
+        dispatcher.register(OutputAudioRawFrame, "audio")
+        self.assertEqual(dispatcher.get(TTSAudioRawFrame(b"", 16000, 1)), "audio")
+        dispatcher.register(TTSAudioRawFrame, "tts")
+        self.assertEqual(dispatcher.get(TTSAudioRawFrame(b"", 16000, 1)), "tts")
+        self.assertIsNone(dispatcher.get(EndFrame()))
+
+    async def test_handlers_are_resolved_once_per_class(self):
+        first = LLMUserResponseAggregator()
+        second = LLMUserResponseAggregator()
+        handlers = "_LLMResponseAggregator__frame_handlers"
+        self.assertIs(getattr(first, handlers), getattr(second, handlers))
+        self.assertIsNot(
+            getattr(first, handlers), getattr(LLMAssistantResponseAggregator(), handlers)
+        )
+
+
+class TestFrameTracer(unittest.IsolatedAsyncioTestCase):
+    def tearDown(self):
+        disable_frame_tracing()
+
+    async def test_records_pushed_frames(self):
+        tracer = enable_frame_tracing()
+        identity = IdentityFilter()
+        collector = FrameCollector()
+        task = PipelineTask(Pipeline([identity, collector]))
+        await task.queue_frames([TextFrame("hello"), EndFrame()])
+        await task.run()
+
+        records = [r for r in tracer.records() if r.src == identity.name]
+        self.assertEqual([r.frame_type for r in records], ["StartFrame", "TextFrame", "EndFrame"])
+        self.assertEqual(records[0].dst, collector.name)
+        self.assertLessEqual(records[1].timestamp_ns, records[2].timestamp_ns)
+
+    async def test_ring_buffer_discards_old_records(self):
+        tracer = enable_frame_tracing(capacity=2)
+        src = FrameCollector()
+        dst = FrameCollector()
+        frames = [TextFrame("one"), TextFrame("two"), EndFrame()]
+        for frame in frames:
+            tracer.record(frame, src, dst)
+        self.assertEqual([r.frame_id for r in tracer.records()], [f.id for f in frames[1:]])
+
+    def test_environment_variable(self):
+        for value in ["", "0", "-1", "true"]:
+            _enable_frame_tracing_from_env(value)
+            self.assertIsNone(get_frame_tracer(), value)
+        _enable_frame_tracing_from_env("16")
+        self.assertEqual(get_frame_tracer().capacity, 16)
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def test_instrumentation_disabled_by_default(self):
+        collector = FrameCollector()
+        task = PipelineTask(Pipeline([collector]))
+        await task.queue_frame(EndFrame())
+        await task.run()
+        self.assertIsNone(collector.instrumentation)
+        self.assertEqual(task.instrumentation_data(), [])
+
+    async def test_pipeline_instrumentation(self):
+        collector = FrameCollector()
+        task = PipelineTask(
+            Pipeline([IdentityFilter(), collector]),
+            PipelineParams(enable_instrumentation=True, instrumentation_sample_interval=1),
+        )
+        await task.queue_frames([TextFrame(str(i)) for i in range(10)] + [EndFrame()])
+        await task.run()
+
+        data = task.instrumentation_data()
+        self.assertEqual(len(data), 2)
+        collector_data = data[1]
+        self.assertEqual(collector_data.processor, collector.name)
+        self.assertGreater(collector_data.frames_per_second["TextFrame"], 0)
+        # StartFrame is a system frame, it's not queued.
+        self.assertEqual(collector_data.input_queue_wait.count, 11)
+        self.assertEqual(collector_data.push_queue_wait.count, 11)
+        self.assertEqual(collector_data.process_time.count, 11)
+
+    async def test_third_party_pipeline(self):
+        class CustomPipeline(BasePipeline):
+            def processors_with_metrics(self):
+                return []
+
+        self.assertEqual(CustomPipeline().processors_with_instrumentation(), [])
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram()
+        for _ in range(98):
+            histogram.record(100_000)  # 100us
+        histogram.record(50_000_000)  # 50ms
+        histogram.record(60_000_000)  # 60ms
+        self.assertEqual(histogram.count, 100)
+        self.assertLessEqual(histogram.percentile(50), 0.000128)
+        self.assertGreater(histogram.percentile(99), 0.03)
+        self.assertEqual(histogram.data().max, 0.06)
+
+
+class TestInterruptions(unittest.IsolatedAsyncioTestCase):
+    class BlockingProcessor(FrameProcessor):
+        """Blocks forever when it gets TextFrame("block")."""
+
+        def __init__(self):
+            super().__init__()
+            self.texts = []
+
+        async def process_frame(self, frame: Frame, direction: FrameDirection):
+            await super().process_frame(frame, direction)
+            if isinstance(frame, TextFrame):
+                self.texts.append(frame.text)
+                if frame.text == "block":
+                    await asyncio.Event().wait()
+            await self.push_frame(frame, direction)
+
+    async def test_interruption_keeps_tasks(self):
+        processor = self.BlockingProcessor()
+        collector = FrameCollector()
+        processor.link(collector)
+
+        input_task = processor._FrameProcessor__input_frame_task
+        push_task = processor._FrameProcessor__push_frame_task
+
+        await processor.queue_frame(TextFrame("block"))
+        await processor.queue_frame(TextFrame("discarded"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(processor.texts, ["block"])
+
+        await processor.queue_frame(StartInterruptionFrame())
+        await processor.queue_frame(TextFrame("new"))
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(processor.texts, ["block", "new"])
+        texts = [f.text for f in collector.frames if isinstance(f, TextFrame)]
+        self.assertEqual(texts, ["new"])
+        self.assertIs(processor._FrameProcessor__input_frame_task, input_task)
+        self.assertIs(processor._FrameProcessor__push_frame_task, push_task)
+        self.assertFalse(input_task.done())
+        self.assertFalse(push_task.done())
+
+        await processor.cleanup()
+        await collector.cleanup()
+        self.assertTrue(input_task.done())
+
+    async def test_output_transport_interruption_finishes_frames(self):
+        class BlockingOutputTransport(BaseOutputTransport):
+            async def send_message(self, frame: TransportMessageFrame):
+                await asyncio.Event().wait()
+
+        output = BlockingOutputTransport(TransportParams())
+        output.link(FrameCollector())
+        await output.queue_frame(StartFrame(clock=SystemClock(), allow_interruptions=True))
+        await output.queue_frame(TransportMessageFrame(message={}))
+        await asyncio.sleep(0.01)
+        self.assertEqual(output._sink_queue.qsize(), 0)
+
+        await output.queue_frame(StartInterruptionFrame())
+        # The interrupted message is finished, so nothing waits forever.
+        await asyncio.wait_for(output._sink_queue.join(), timeout=1)
+        await output.queue_frame(CancelFrame())
+
+
+if __name__ == "__main__":
+    unittest.main()
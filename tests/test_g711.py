@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import base64
+import json
+import unittest
+import warnings
+
+import numpy as np
+
+from pipecat.audio import g711
+from pipecat.audio.utils import pcm_to_ulaw
+from pipecat.frames.frames import OutputAudioRawFrame
+from pipecat.serializers.protobuf import ProtobufFrameSerializer
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+try:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import audioop
+except ModuleNotFoundError:
+    audioop = None
+
+ALL_SAMPLES = np.arange(1 << 16, dtype=np.uint16).view(np.int16).tobytes()
+ALL_CODES = bytes(range(256))
+
+
+class TestG711(unittest.TestCase):
+    def test_known_values(self):
+        silence = bytes(4)
+        self.assertEqual(g711.pcm_to_ulaw(silence), b"\xff\xff")
+        self.assertEqual(g711.pcm_to_alaw(silence), b"\xd5\xd5")
+        self.assertEqual(g711.ulaw_to_pcm(b"\xff"), bytes(2))
+        self.assertEqual(g711.ulaw_to_pcm(b"\x00"), np.int16(-32124).tobytes())
+
+    def test_round_trip(self):
+        # μ-law has a negative zero (0x7F), which is encoded back as zero.
+        ulaw_codes = ALL_CODES.replace(b"\x7f", b"")
+        for encode, decode, codes in [
+            (g711.pcm_to_ulaw, g711.ulaw_to_pcm, ulaw_codes),
+            (g711.pcm_to_alaw, g711.alaw_to_pcm, ALL_CODES),
+        ]:
+            # Decoding and encoding again gives the same codes.
+            self.assertEqual(encode(decode(codes)), codes)
+            # Quantization error is relative to the signal level.
+            samples = np.frombuffer(ALL_SAMPLES, dtype=np.int16).astype(np.int32)
+            decoded = np.frombuffer(decode(encode(ALL_SAMPLES)), dtype=np.int16)
+            error = np.abs(decoded - samples)
+            self.assertTrue(np.all(error <= np.maximum(np.abs(samples) // 16, 16)))
+
+    @unittest.skipIf(audioop is None, "audioop is not available")
+    def test_same_as_audioop(self):
+        self.assertEqual(g711.pcm_to_ulaw(ALL_SAMPLES), audioop.lin2ulaw(ALL_SAMPLES, 2))
+        self.assertEqual(g711.pcm_to_alaw(ALL_SAMPLES), audioop.lin2alaw(ALL_SAMPLES, 2))
+        self.assertEqual(g711.ulaw_to_pcm(ALL_CODES), audioop.ulaw2lin(ALL_CODES, 2))
+        self.assertEqual(g711.alaw_to_pcm(ALL_CODES), audioop.alaw2lin(ALL_CODES, 2))
+
+
+class TestTwilioFrameSerializer(unittest.TestCase):
+    def test_packets_are_continuous(self):
+        t = np.arange(16000) / 16000
+        audio = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16).tobytes()
+
+        serializer = TwilioFrameSerializer("sid")
+        payload = b""
+        for i in range(0, len(audio), 640):
+            frame = OutputAudioRawFrame(audio=audio[i : i + 640], sample_rate=16000, num_channels=1)
+            message = json.loads(serializer.serialize(frame))
+            payload += base64.b64decode(message["media"]["payload"])
+
+        # Same as converting the whole audio at once, so there's nothing
+        # different at packet boundaries.
+        whole = pcm_to_ulaw(audio, 16000, 8000)
+        self.assertEqual(payload, whole[: len(payload)])
+        self.assertGreaterEqual(len(payload), 8000 - 16)
+
+        # The rest of the audio is sent when the bot stops speaking.
+        message = json.loads(serializer.flush())
+        payload += base64.b64decode(message["media"]["payload"])
+        self.assertEqual(len(payload), 8000)
+        # And the next response doesn't start with it.
+        self.assertIsNone(serializer.flush())
+
+    def test_flush_default(self):
+        # Serializers that don't hold anything back have nothing to flush.
+        self.assertIsNone(ProtobufFrameSerializer().flush())
+
+    def test_deserialize(self):
+        serializer = TwilioFrameSerializer("sid")
+        packet = g711.pcm_to_ulaw(np.full(160, 1000, dtype=np.int16).tobytes())
+        message = {"event": "media", "media": {"payload": base64.b64encode(packet).decode()}}
+        audio = b""
+        for _ in range(10):
+            frame = serializer.deserialize(json.dumps(message))
+            self.assertEqual(frame.sample_rate, 16000)
+            audio += frame.audio
+        # A constant signal stays constant across packets (after the filter
+        # warms up).
+        samples = np.frombuffer(audio, dtype=np.int16)[320:]
+        self.assertTrue(np.all(np.abs(samples - samples.mean()) <= 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
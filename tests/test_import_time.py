@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Seconds it can take to import a pipeline in a fresh interpreter. It's well
+# above what it takes today, so it only fails if something heavy gets imported
+# by accident.
+IMPORT_TIME_BUDGET = 1.0
+
+# Modules that should only be loaded when they are actually used.
+HEAVY_MODULES = ["numpy", "resampy", "pyloudnorm", "PIL", "openai"]
+
+SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import pipecat.pipeline.pipeline
+import pipecat.pipeline.task
+import pipecat.services.ai_services
+import pipecat.transports.base_input
+import pipecat.transports.base_output
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def import_pipecat() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_modules_not_loaded(self):
+        result = import_pipecat()
+        self.assertEqual(result["loaded"], [])
+
+    def test_import_time_budget(self):
+        # The first run warms up the bytecode cache.
+        import_pipecat()
+        result = import_pipecat()
+        self.assertLess(result["elapsed"], IMPORT_TIME_BUDGET)
+
+    def test_lazy_names_are_importable(self):
+        from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+        from pipecat.services.ai_services import OpenAILLMContext as LazyOpenAILLMContext
+
+        self.assertIs(LazyOpenAILLMContext, OpenAILLMContext)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,9 @@ from pipecat.processors.text_transformer import StatelessTextTransformer
 from pipecat.processors.frame_processor import FrameProcessor
 from pipecat.frames.frames import EndFrame, TextFrame
 
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
 from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
 
 
 class TestDailyPipeline(unittest.IsolatedAsyncioTestCase):
@@ -60,6 +62,32 @@ class TestDailyPipeline(unittest.IsolatedAsyncioTestCase):
         self.assertIsInstance(await outgoing_queue.get(), EndFrame)
 
 
+class TestParallelPipeline(unittest.IsolatedAsyncioTestCase):
+    class PassthroughProcessor(FrameProcessor):
+        async def process_frame(self, frame, direction):
+            await super().process_frame(frame, direction)
+            await self.push_frame(frame, direction)
+
+    async def test_end_frame_goes_through(self):
+        texts = []
+
+        class Collector(FrameProcessor):
+            async def process_frame(self, frame, direction):
+                await super().process_frame(frame, direction)
+                if isinstance(frame, TextFrame):
+                    texts.append(frame.text)
+                await self.push_frame(frame, direction)
+
+        parallel = ParallelPipeline(
+            [self.PassthroughProcessor(), self.PassthroughProcessor()],
+            [self.PassthroughProcessor()],
+        )
+        task = PipelineTask(Pipeline([parallel, Collector()]))
+        await task.queue_frames([TextFrame("Hello"), TextFrame("world"), EndFrame()])
+        await asyncio.wait_for(task.run(), timeout=1.0)
+        self.assertEqual(texts, ["Hello", "world"])
+
+
 class TestLogFrame(unittest.TestCase):
     class MockProcessor(FrameProcessor):
         def __init__(self, name):
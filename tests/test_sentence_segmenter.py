@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import random
+import unittest
+
+from pipecat.utils.string import SentenceSegmenter, match_endofsentence
+
+PIECES = [
+    "Mr",
+    "Ms",
+    "Dr",
+    "Mrs",
+    "Prof",
+    "3",
+    " a",
+    "p",
+    "A",
+    "b",
+    "hello",
+    " world",
+    "你好",
+    ".",
+    "!",
+    "?",
+    ":",
+    ";",
+    ",",
+    "。",
+    "？",
+    "，",
+    " ",
+    "\n",
+    ". ",
+    "3:00 a.",
+    "U.S.A.",
+]
+
+
+class TestSentenceSegmenter(unittest.TestCase):
+    def test_sentences(self):
+        segmenter = SentenceSegmenter()
+        sentences = []
+        for token in ["Hello", ", Mr", ". Smith", ". It's 3", ":00 a", ".m", ". Bye", "!"]:
+            end = segmenter.append(token)
+            if end:
+                sentences.append(segmenter.pop(end))
+        self.assertEqual(sentences, ["Hello, Mr. Smith.", " It's 3:00 a.m.", " Bye!"])
+        self.assertEqual(segmenter.text, "")
+
+    def test_full_width_only_at_end(self):
+        segmenter = SentenceSegmenter()
+        self.assertEqual(segmenter.append("你好。世界"), 0)
+        self.assertEqual(segmenter.append("。 "), 6)
+
+    def test_same_as_match_endofsentence(self):
+        rng = random.Random(0)
+        for _ in range(1000):
+            segmenter = SentenceSegmenter()
+            text = ""
+            for _ in range(rng.randint(1, 30)):
+                token = "".join(rng.choice(PIECES) for _ in range(rng.randint(1, 4)))
+                text += token
+                end = match_endofsentence(text)
+                self.assertEqual(segmenter.append(token), end, text)
+                if end:
+                    text = text[end:]
+                    segmenter.pop(end)
+                elif rng.random() < 0.1:
+                    text = ""
+                    segmenter.clear()
+                self.assertEqual(segmenter.text, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.frames.frames import EndFrame, TextFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.session_runner import (
+    MultiSessionPipelineRunner,
+    SessionAdmissionParams,
+    SessionRejectedError,
+    SharedResources,
+)
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.filters.identity_filter import IdentityFilter
+
+
+def create_task() -> PipelineTask:
+    return PipelineTask(Pipeline([IdentityFilter()]))
+
+
+class TestMultiSessionPipelineRunner(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.runner = MultiSessionPipelineRunner(
+            handle_sigint=False,
+            params=SessionAdmissionParams(max_sessions=1, max_pending_sessions=1),
+        )
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_sessions_wait_for_admission(self):
+        task1 = create_task()
+        task2 = create_task()
+        run1 = asyncio.create_task(self.runner.run(task1))
+        run2 = asyncio.create_task(self.runner.run(task2))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.runner.stats.running_sessions, 1)
+        self.assertEqual(self.runner.stats.pending_sessions, 1)
+
+        await task1.queue_frames([TextFrame("hello"), EndFrame()])
+        await run1
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.runner.stats.running_sessions, 1)
+        self.assertEqual(self.runner.stats.pending_sessions, 0)
+
+        await task2.queue_frame(EndFrame())
+        await run2
+        stats = self.runner.stats
+        self.assertEqual(stats.admitted_sessions, 2)
+        self.assertEqual(stats.finished_sessions, 2)
+        self.assertEqual(stats.running_sessions, 0)
+
+    async def test_sessions_are_rejected_when_queue_is_full(self):
+        task1 = create_task()
+        run1 = asyncio.create_task(self.runner.run(task1))
+        run2 = asyncio.create_task(self.runner.run(create_task()))
+        await asyncio.sleep(0.05)
+        with self.assertRaises(SessionRejectedError):
+            await self.runner.run(create_task())
+        self.assertEqual(self.runner.stats.rejected_sessions, 1)
+
+        await task1.cancel()
+        await run1
+        run2.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await run2
+        self.assertEqual(self.runner.stats.running_sessions, 0)
+
+
+class TestSessionAdmissionDefaults(unittest.IsolatedAsyncioTestCase):
+    async def test_load_does_not_reject_sessions(self):
+        runner = MultiSessionPipelineRunner(handle_sigint=False)
+        # A busy process doesn't reject sessions unless asked to.
+        runner._stats.loop_lag = 1.0
+        runner._stats.cpu_usage = 4.0
+        task = create_task()
+        run = asyncio.create_task(runner.run(task))
+        await asyncio.sleep(0.05)
+        self.assertEqual(runner.stats.running_sessions, 1)
+        await task.queue_frame(EndFrame())
+        await run
+        self.assertEqual(runner.stats.rejected_sessions, 0)
+        await runner.cleanup()
+
+
+class TestSharedResources(unittest.IsolatedAsyncioTestCase):
+    async def test_get_or_create(self):
+        resources = SharedResources()
+        model = resources.get_or_create("model", object)
+        self.assertIs(resources.get_or_create("model", object), model)
+        self.assertIs(resources.executor, resources.executor)
+        self.assertIs(resources.vad_worker, resources.vad_worker)
+        await resources.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
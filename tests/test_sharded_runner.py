@@ -0,0 +1,212 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+import signal
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect
+
+from pipecat.frames.frames import EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.sharded_runner import (
+    ShardedPipelineRunner,
+    ShardedRunnerParams,
+    WorkerContext,
+)
+from pipecat.pipeline.task import PipelineTask
+from pipecat.transports.network.websocket_server import (
+    WebsocketServerParams,
+    WebsocketServerTransport,
+)
+
+TIMEOUT = 10
+
+
+async def worker(ctx: WorkerContext):
+    while await ctx.wait_for_turn():
+        connected = asyncio.Event()
+        transport = WebsocketServerTransport(params=WebsocketServerParams(), sock=ctx.sock)
+        task = PipelineTask(Pipeline([transport.input(), transport.output()]))
+
+        # Tell the client who is serving it.
+        @transport.event_handler("on_client_connected")
+        async def on_client_connected(transport, client, connected=connected):
+            await client.send(f"{ctx.worker_id} {os.getpid()}")
+            connected.set()
+
+        @transport.event_handler("on_client_disconnected")
+        async def on_client_disconnected(transport, client, task=task):
+            await task.queue_frame(EndFrame())
+
+        async with ctx.accepting():
+            ctx.start(task)
+            await connected.wait()
+
+
+def failing_worker(marker: str):
+    """The first worker to start fails, the rest (and its restart) work."""
+
+    async def handler(ctx: WorkerContext):
+        try:
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            await worker(ctx)
+        else:
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            raise RuntimeError("Worker failed")
+
+    return handler
+
+
+def wait_until(predicate, timeout: float = TIMEOUT):
+    start = time.monotonic()
+    while not predicate():
+        if time.monotonic() - start > timeout:
+            raise TimeoutError("Condition not met")
+        time.sleep(0.05)
+
+
+class Client:
+    def __init__(self, port: int):
+        self.websocket = connect(f"ws://localhost:{port}", open_timeout=TIMEOUT)
+        worker_id, pid = self.websocket.recv(timeout=TIMEOUT).split()
+        self.worker_id = int(worker_id)
+        self.pid = int(pid)
+
+    def is_open(self) -> bool:
+        try:
+            self.websocket.recv(timeout=0.1)
+        except TimeoutError:
+            return True
+        except ConnectionClosed:
+            return False
+        return True
+
+    def close(self):
+        self.websocket.close()
+
+
+class TestShardedPipelineRunner(unittest.TestCase):
+    def run_runner(self, test, worker=worker):
+        """Runs the runner with 2 workers (signal handlers need the main
+        thread) and `test(runner, port)` in a separate thread.
+
+        """
+        sock = socket.create_server(("localhost", 0))
+        port = sock.getsockname()[1]
+        params = ShardedRunnerParams(num_workers=2, health_interval=0.1)
+        runner = ShardedPipelineRunner(worker, sock=sock, params=params)
+        errors = []
+
+        def test_thread():
+            try:
+                wait_until(lambda: len(runner.health()) == 2)
+                test(runner, port)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                if runner._processes:
+                    os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=test_thread)
+        thread.start()
+        start = time.monotonic()
+        runner.run()
+        elapsed = time.monotonic() - start
+        thread.join()
+        if errors:
+            raise errors[0]
+        return runner, elapsed
+
+    def test_sessions_go_to_least_loaded_worker(self):
+        def test(runner, port):
+            clients = [Client(port) for _ in range(4)]
+            worker_ids = [client.worker_id for client in clients]
+            self.assertEqual(sorted(worker_ids), [0, 0, 1, 1])
+            # The second client goes to the worker without sessions.
+            self.assertNotEqual(worker_ids[0], worker_ids[1])
+            for client in clients:
+                client.close()
+
+        self.run_runner(test)
+
+    def test_sigterm_drains_workers(self):
+        def test(runner, port):
+            client = Client(port)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+            # The session keeps running while the worker drains.
+            wait_until(lambda: all(h.draining for h in runner.health()))
+            self.assertTrue(client.is_open())
+            self.assertTrue(runner._processes)
+
+            # Once the session finishes, the workers exit.
+            client.close()
+            wait_until(lambda: not runner._processes)
+
+        runner, elapsed = self.run_runner(test)
+        self.assertLess(elapsed, runner._params.drain_timeout)
+
+    def test_crashed_worker_is_restarted(self):
+        def test(runner, port):
+            client = Client(port)
+            os.kill(client.pid, signal.SIGKILL)
+
+            def restarted():
+                process = runner._processes.get(client.worker_id)
+                return process is not None and process.pid != client.pid
+
+            wait_until(restarted)
+            self.assertFalse(client.is_open())
+
+            # Both workers take sessions again.
+            clients = [Client(port) for _ in range(2)]
+            self.assertEqual(sorted(c.worker_id for c in clients), [0, 1])
+            for c in clients:
+                c.close()
+
+        self.run_runner(test)
+
+    def test_failed_worker_is_restarted(self):
+        def test(runner, port):
+            wait_until(lambda: os.path.getsize(marker) > 0)
+            with open(marker) as f:
+                failed_pid = int(f.read())
+
+            def restarted():
+                processes = list(runner._processes.values())
+                pids = {p.pid for p in processes}
+                return (
+                    len(processes) == 2
+                    and failed_pid not in pids
+                    and {h.pid for h in runner.health()} == pids
+                )
+
+            wait_until(restarted)
+
+            # Without a restart, both clients would go to the worker that
+            # didn't fail.
+            clients = [Client(port) for _ in range(2)]
+            self.assertEqual(sorted(c.worker_id for c in clients), [0, 1])
+            for c in clients:
+                c.close()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            marker = os.path.join(tmpdir, "failed")
+            self.run_runner(test, worker=failing_worker(marker))
+            self.assertTrue(os.path.exists(marker))
+
+
+if __name__ == "__main__":
+    unittest.main()
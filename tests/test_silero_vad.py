@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+
+from pipecat.audio.vad.silero import SileroVADAnalyzer, SileroVADEngine, SileroVADModel
+
+NUM_STREAMS = 8
+WINDOW = 512
+
+
+def stream_audio(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(16000) / 16000
+    voice = 4000 * np.sin(2 * np.pi * (150 + seed * 20) * t) * (t > 0.5)
+    return (voice + rng.normal(0, 200, len(t))).astype(np.int16)
+
+
+def confidences(analyzer: SileroVADAnalyzer, audio: np.ndarray):
+    result = []
+    for i in range(0, len(audio), 320):
+        result += analyzer.analyze_audio_windows(audio[i : i + 320].tobytes()).confidences
+    return result
+
+
+class TestSileroVADModel(unittest.TestCase):
+    def test_model_loaded_once(self):
+        SileroVADModel.shared()
+        with patch("onnxruntime.InferenceSession") as session:
+            analyzers = [SileroVADAnalyzer() for _ in range(10)]
+            session.assert_not_called()
+
+        # Analyzers only share the model, not the model state.
+        audio = stream_audio(0)
+        self.assertEqual(confidences(analyzers[0], audio), confidences(analyzers[1], audio))
+
+
+class TestSileroVADEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = SileroVADEngine(max_delay=0.01)
+
+    def tearDown(self):
+        self.engine.stop()
+
+    def test_batched_streams_match_individual_models(self):
+        audios = [stream_audio(seed) for seed in range(NUM_STREAMS)]
+
+        expected = [confidences(SileroVADAnalyzer(), audio) for audio in audios]
+
+        analyzers = [SileroVADAnalyzer(engine=self.engine) for _ in range(NUM_STREAMS)]
+        with ThreadPoolExecutor(max_workers=NUM_STREAMS) as executor:
+            results = list(executor.map(confidences, analyzers, audios))
+
+        for expected_confidences, result in zip(expected, results):
+            np.testing.assert_allclose(result, np.ravel(expected_confidences), atol=1e-5)
+
+    def test_sample_rate_mismatch(self):
+        with self.assertRaises(ValueError):
+            SileroVADAnalyzer(sample_rate=8000, engine=self.engine)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import numpy as np
+import soundfile as sf
+
+from pipecat.audio.mixers.soundfile_mixer import SoundfileMixer, default_cache_dir
+from pipecat.frames.frames import MixerUpdateSettingsFrame
+
+CHUNK = b"\x00" * 640
+
+
+class TestSoundfileMixer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.dir.name, "cache")
+        # 1000 samples, so chunks of 320 samples don't fit a whole number of
+        # times.
+        self.sound = (np.arange(1000) * 20 - 10000).astype(np.int16)
+        self.sound_file = os.path.join(self.dir.name, "sound.wav")
+        sf.write(self.sound_file, self.sound, 16000)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    async def mixer(self, **kwargs) -> SoundfileMixer:
+        mixer = SoundfileMixer(
+            {"sound": self.sound_file}, "sound", cache_dir=self.cache_dir, **kwargs
+        )
+        await mixer.start(16000)
+        return mixer
+
+    async def mix_silence(self, mixer: SoundfileMixer, chunks: int) -> np.ndarray:
+        mixed = [await mixer.mix(CHUNK) for _ in range(chunks)]
+        return np.frombuffer(b"".join(mixed), dtype=np.int16)
+
+    async def test_loop_keeps_tail(self):
+        mixer = await self.mixer(volume=1.0)
+        mixed = await self.mix_silence(mixer, 10)
+        np.testing.assert_array_equal(mixed, np.tile(self.sound, 4)[: len(mixed)])
+
+    async def test_no_loop_pads_with_silence(self):
+        mixer = await self.mixer(volume=1.0, loop=False)
+        mixed = await self.mix_silence(mixer, 5)
+        np.testing.assert_array_equal(mixed[:1000], self.sound)
+        self.assertFalse(np.any(mixed[1000:]))
+
+    async def test_volume(self):
+        mixer = await self.mixer(volume=0.5)
+        audio = np.full(320, 100, dtype=np.int16)
+        mixed = np.frombuffer(await mixer.mix(audio.tobytes()), dtype=np.int16)
+        np.testing.assert_array_equal(mixed, 100 + (self.sound[:320] >> 1))
+
+        await mixer.process_frame(MixerUpdateSettingsFrame(settings={"volume": 0.0}))
+        self.assertEqual(await mixer.mix(audio.tobytes()), audio.tobytes())
+
+    async def test_resampled_and_shared(self):
+        sf.write(self.sound_file, np.zeros((8000, 2), dtype=np.int16), 8000)
+        mixer1 = await self.mixer()
+        mixer2 = await self.mixer()
+        self.assertEqual(len(mixer1._sounds["sound"]), 16000)
+        self.assertIs(mixer1._sounds["sound"], mixer2._sounds["sound"])
+        self.assertIsInstance(mixer1._sounds["sound"].base, np.memmap)
+
+    async def test_cache_dir(self):
+        await self.mixer()
+        self.assertEqual(os.stat(self.cache_dir).st_mode & 0o777, 0o700)
+
+        # Sounds are not loaded from a directory other users can write to.
+        shared_dir = os.path.join(self.dir.name, "shared")
+        os.mkdir(shared_dir)
+        os.chmod(shared_dir, 0o777)
+        mixer = SoundfileMixer({"sound": self.sound_file}, "sound", cache_dir=shared_dir)
+        await mixer.start(16000)
+        self.assertNotIn("sound", mixer._sounds)
+        self.assertEqual(os.listdir(shared_dir), [])
+
+    def test_default_cache_dir_is_per_user(self):
+        with unittest.mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.dir.name}):
+            self.assertEqual(default_cache_dir(), os.path.join(self.dir.name, "pipecat", "mixer"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.audio.resamplers.stream_resampler import StreamResampler
+
+
+def sine(sample_rate: int, seconds: float, frequency: float = 440.0) -> np.ndarray:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return 8000 * np.sin(2 * np.pi * frequency * t)
+
+
+def resample_in_chunks(audio: bytes, in_rate: int, out_rate: int, chunk_size: int) -> bytes:
+    resampler = StreamResampler()
+    output = b"".join(
+        resampler.resample(audio[i : i + chunk_size], in_rate, out_rate)
+        for i in range(0, len(audio), chunk_size)
+    )
+    return output + resampler.flush()
+
+
+class TestStreamResampler(unittest.TestCase):
+    def test_chunks_do_not_change_output(self):
+        audio = sine(16000, 1.0).astype(np.int16).tobytes()
+        whole = resample_in_chunks(audio, 16000, 24000, len(audio))
+        # 20ms chunks, and chunks that don't fall on a whole number of output
+        # samples.
+        self.assertEqual(resample_in_chunks(audio, 16000, 24000, 640), whole)
+        self.assertEqual(resample_in_chunks(audio, 16000, 24000, 74), whole)
+
+    def test_output_matches_signal(self):
+        for in_rate, out_rate in [(16000, 24000), (48000, 16000), (44100, 16000), (8000, 16000)]:
+            audio = sine(in_rate, 1.0).astype(np.int16).tobytes()
+            output = np.frombuffer(
+                resample_in_chunks(audio, in_rate, out_rate, in_rate // 50 * 2), dtype=np.int16
+            )
+            self.assertEqual(len(output), out_rate)
+            # Skip the beginning and end of the stream, where the filter sees
+            # the silence around the signal.
+            expected = sine(out_rate, 1.0)
+            error = np.abs(output - expected)[100:-100].max()
+            self.assertLess(error, 8, f"{in_rate} -> {out_rate}")
+
+    def test_same_rate(self):
+        resampler = StreamResampler()
+        self.assertEqual(resampler.resample(b"\x01\x02", 16000, 16000), b"\x01\x02")
+        self.assertEqual(resampler.flush(), b"")
+
+    def test_rate_change_starts_new_stream(self):
+        audio = sine(16000, 0.1).astype(np.int16).tobytes()
+        resampler = StreamResampler()
+        resampler.resample(audio, 24000, 16000)
+        output = resampler.resample(audio, 16000, 24000) + resampler.flush()
+        self.assertEqual(output, resample_in_chunks(audio, 16000, 24000, len(audio)))
+
+
+if __name__ == "__main__":
+    unittest.main()
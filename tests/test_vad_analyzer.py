@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+SAMPLE_RATE = 16000
+WINDOW = 512
+
+
+class LoudnessVADAnalyzer(VADAnalyzer):
+    """Thinks there's voice in any window that is not silent."""
+
+    def __init__(self, **kwargs):
+        super().__init__(sample_rate=SAMPLE_RATE, num_channels=1, **kwargs)
+        self.windows = []
+
+    def num_frames_required(self) -> int:
+        return WINDOW
+
+    def voice_confidence(self, buffer) -> float:
+        samples = np.frombuffer(buffer, dtype=np.int16)
+        self.windows.append(samples.copy())
+        return 1.0 if np.any(samples) else 0.0
+
+
+def frames(samples: np.ndarray, frame_size: int):
+    for i in range(0, len(samples), frame_size):
+        yield samples[i : i + frame_size].tobytes()
+
+
+class TestVADAnalyzer(unittest.TestCase):
+    def test_all_windows_analyzed(self):
+        analyzer = LoudnessVADAnalyzer(params=VADParams(min_volume=0))
+        audio = np.arange(SAMPLE_RATE, dtype=np.int16)
+
+        # 20ms frames, which are smaller than a window.
+        confidences = []
+        for frame in frames(audio, 320):
+            confidences += analyzer.analyze_audio_windows(frame).confidences
+        self.assertEqual(len(confidences), SAMPLE_RATE // WINDOW)
+
+        # Windows see the audio in order, without gaps.
+        analyzed = np.concatenate(analyzer.windows)
+        np.testing.assert_array_equal(analyzed, audio[: len(analyzed)])
+
+    def test_frames_bigger_than_buffer(self):
+        analyzer = LoudnessVADAnalyzer(params=VADParams(min_volume=0))
+        audio = np.arange(WINDOW * 20 + 100, dtype=np.int16)
+        analysis = analyzer.analyze_audio_windows(audio.tobytes())
+        self.assertEqual(len(analysis.confidences), 20)
+        analysis = analyzer.analyze_audio_windows(np.ones(WINDOW - 100, dtype=np.int16).tobytes())
+        self.assertEqual(len(analysis.confidences), 1)
+        np.testing.assert_array_equal(analyzer.windows[-1][:100], audio[-100:])
+
+    def test_state_follows_audio(self):
+        params = VADParams(start_secs=0.2, stop_secs=0.2, min_volume=0)
+        analyzer = LoudnessVADAnalyzer(params=params)
+        rng = np.random.default_rng(0)
+        speech = rng.normal(0, 3000, SAMPLE_RATE).astype(np.int16)
+        silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+
+        state = VADState.QUIET
+        for frame in frames(speech, 320):
+            state = analyzer.analyze_audio(frame)
+        self.assertEqual(state, VADState.SPEAKING)
+
+        for frame in frames(silence, 320):
+            state = analyzer.analyze_audio(frame)
+        self.assertEqual(state, VADState.QUIET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import threading
+import unittest
+
+import numpy as np
+
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+from pipecat.audio.vad.vad_worker import VADWorker, VADWorkerStream
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    UserStartedSpeakingFrame,
+    UserStoppedSpeakingFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_transport import TransportParams
+
+SAMPLE_RATE = 16000
+PARAMS = VADParams(start_secs=0.1, stop_secs=0.1, min_volume=0)
+
+
+class NonSilenceVADAnalyzer(VADAnalyzer):
+    def __init__(self):
+        super().__init__(sample_rate=SAMPLE_RATE, num_channels=1, params=PARAMS)
+        self.threads = set()
+
+    def num_frames_required(self) -> int:
+        return 512
+
+    def voice_confidence(self, buffer) -> float:
+        self.threads.add(threading.current_thread())
+        return 1.0 if np.any(np.frombuffer(buffer, dtype=np.int16)) else 0.0
+
+
+def utterance() -> list[bytes]:
+    speech = np.full(SAMPLE_RATE // 2, 1000, dtype=np.int16).tobytes()
+    silence = bytes(SAMPLE_RATE)
+    audio = speech + silence
+    return [audio[i : i + 640] for i in range(0, len(audio), 640)]
+
+
+class FrameCollector(FrameProcessor):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+
+class InlineVADWorker(VADWorker):
+    """Analyzes audio as soon as it's queued and records how many audio chunks
+    had been analyzed when each state change was reported.
+
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.analyzed = 0
+        self.reports = []
+
+    def create_stream(self, analyzer, callback):
+        def report(state: VADState):
+            self.reports.append(self.analyzed)
+            callback(state)
+
+        return VADWorkerStream(analyzer, report, self)
+
+    def put(self, item):
+        stream, audio = item
+        self.analyzed += 1
+        stream._process(audio)
+
+
+class TestVADWorker(unittest.TestCase):
+    def test_state_changes_reported(self):
+        worker = VADWorker(num_threads=2)
+        analyzer = NonSilenceVADAnalyzer()
+        states = []
+        done = threading.Event()
+
+        def callback(state: VADState):
+            states.append(state)
+            if state == VADState.QUIET:
+                done.set()
+
+        stream = worker.create_stream(analyzer, callback)
+        for chunk in utterance():
+            stream.analyze_audio(chunk)
+        self.assertTrue(done.wait(5))
+        worker.stop()
+
+        self.assertEqual(states, [VADState.SPEAKING, VADState.QUIET])
+        self.assertNotIn(threading.current_thread(), analyzer.threads)
+
+
+class TestInputTransportVADWorker(unittest.IsolatedAsyncioTestCase):
+    async def test_user_speaking_frames(self):
+        worker = VADWorker()
+        params = TransportParams(
+            audio_in_enabled=True,
+            vad_enabled=True,
+            vad_analyzer=NonSilenceVADAnalyzer(),
+            vad_worker=worker,
+        )
+        transport = BaseInputTransport(params)
+        collector = FrameCollector()
+        task = PipelineTask(Pipeline([transport, collector]))
+
+        async def push_audio():
+            # Wait for the transport to start.
+            while not transport._vad_stream:
+                await asyncio.sleep(0.01)
+            for chunk in utterance():
+                frame = InputAudioRawFrame(audio=chunk, sample_rate=SAMPLE_RATE, num_channels=1)
+                await transport.push_audio_frame(frame)
+            while not any(isinstance(f, UserStoppedSpeakingFrame) for f in collector.frames):
+                await asyncio.sleep(0.01)
+            await task.queue_frame(EndFrame())
+
+        await asyncio.wait_for(asyncio.gather(task.run(), push_audio()), timeout=5)
+        worker.stop()
+
+        events = [
+            type(f)
+            for f in collector.frames
+            if isinstance(f, (UserStartedSpeakingFrame, UserStoppedSpeakingFrame))
+        ]
+        self.assertEqual(events, [UserStartedSpeakingFrame, UserStoppedSpeakingFrame])
+
+    async def test_user_speaking_frames_in_order_with_audio(self):
+        worker = InlineVADWorker()
+        params = TransportParams(
+            audio_in_enabled=True,
+            vad_enabled=True,
+            vad_audio_passthrough=True,
+            vad_analyzer=NonSilenceVADAnalyzer(),
+            vad_worker=worker,
+        )
+        transport = BaseInputTransport(params)
+        collector = FrameCollector()
+        task = PipelineTask(Pipeline([transport, collector]))
+
+        async def push_audio():
+            while not transport._vad_stream:
+                await asyncio.sleep(0.01)
+            for chunk in utterance():
+                frame = InputAudioRawFrame(audio=chunk, sample_rate=SAMPLE_RATE, num_channels=1)
+                await transport.push_audio_frame(frame)
+            await transport._audio_in_queue.join()
+            await task.queue_frame(EndFrame())
+
+        await asyncio.wait_for(asyncio.gather(task.run(), push_audio()), timeout=5)
+
+        frames = [
+            f
+            for f in collector.frames
+            if isinstance(
+                f, (InputAudioRawFrame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame)
+            )
+        ]
+        # Each state change is pushed before the audio frame that follows the
+        # one that caused it, even if audio frames are already queued.
+        positions = [i for i, f in enumerate(frames) if not isinstance(f, InputAudioRawFrame)]
+        self.assertEqual(len(positions), 2)
+        self.assertIsInstance(frames[positions[0]], UserStartedSpeakingFrame)
+        self.assertIsInstance(frames[positions[1]], UserStoppedSpeakingFrame)
+        self.assertEqual(positions, [worker.reports[0], worker.reports[1] + 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
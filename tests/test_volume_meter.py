@@ -0,0 +1,43 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.audio.utils import calculate_audio_volume
+from pipecat.audio.volume_meter import VolumeMeter
+
+
+def speech_like(sample_rate: int, seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    envelope = 1 + np.sin(2 * np.pi * 0.5 * t)
+    audio = 3000 * envelope * np.sin(2 * np.pi * 200 * t) + rng.normal(0, 300, len(t))
+    return audio.astype(np.int16)
+
+
+class TestVolumeMeter(unittest.TestCase):
+    def test_same_volume_as_calculate_audio_volume(self):
+        for sample_rate, window in [(16000, 512), (8000, 256), (24000, 480)]:
+            audio = speech_like(sample_rate, 2.0)
+            meter = VolumeMeter()
+            for i in range(0, len(audio) - window, window):
+                chunk = audio[i : i + window].tobytes()
+                self.assertAlmostEqual(
+                    meter.volume(chunk, sample_rate),
+                    calculate_audio_volume(chunk, sample_rate),
+                    delta=0.01,
+                )
+
+    def test_silence(self):
+        meter = VolumeMeter()
+        self.assertEqual(meter.volume(b"\x00" * 1024, 16000), 0)
+        self.assertEqual(meter.volume(b"", 16000), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import socket
+import unittest
+
+import websockets
+
+from pipecat.frames.frames import EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.transports.network.websocket_server import (
+    WebsocketServerParams,
+    WebsocketServerTransport,
+)
+
+
+async def connect(port: int):
+    return await websockets.connect(f"ws://localhost:{port}")
+
+
+class TestWebsocketServerSharedSocket(unittest.IsolatedAsyncioTestCase):
+    async def test_extra_clients_are_rejected(self):
+        sock = socket.create_server(("localhost", 0))
+        port = sock.getsockname()[1]
+
+        # Both clients connect before the session starts serving, so their
+        # connections are accepted together.
+        clients = [asyncio.create_task(connect(port)) for _ in range(2)]
+        await asyncio.sleep(0.1)
+
+        transport = WebsocketServerTransport(params=WebsocketServerParams(), sock=sock)
+        connected = asyncio.Event()
+
+        @transport.event_handler("on_client_connected")
+        async def on_client_connected(transport, client):
+            connected.set()
+
+        task = PipelineTask(Pipeline([transport.input(), transport.output()]))
+        run_task = asyncio.create_task(task.run())
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*clients, return_exceptions=True), timeout=5
+        )
+        await asyncio.wait_for(connected.wait(), timeout=5)
+
+        accepted = [r for r in results if not isinstance(r, Exception)]
+        rejected = [r for r in results if isinstance(r, Exception)]
+        self.assertEqual(len(accepted), 1)
+        self.assertEqual(len(rejected), 1)
+        self.assertIsInstance(rejected[0], websockets.exceptions.InvalidStatusCode)
+        self.assertEqual(rejected[0].status_code, 503)
+
+        # The session kept its first client.
+        await asyncio.sleep(0.1)
+        self.assertTrue(accepted[0].open)
+
+        await task.queue_frame(EndFrame())
+        await asyncio.wait_for(run_task, timeout=5)
+        await accepted[0].close()
+        sock.close()
+
+    async def test_only_first_handshake_is_accepted(self):
+        sock = socket.create_server(("localhost", 0))
+        transport = WebsocketServerTransport(params=WebsocketServerParams(), sock=sock)
+        input = transport.input()
+
+        # Connections accepted in the same batch can be handshaking at the
+        # same time, the second one is rejected even if we are still
+        # listening.
+        self.assertIsNone(await input._process_request("/", {}))
+        status, _, _ = await input._process_request("/", {})
+        self.assertEqual(status, 503)
+        sock.close()
+
+
+if __name__ == "__main__":
+    unittest.main()